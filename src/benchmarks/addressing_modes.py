@@ -0,0 +1,188 @@
+"""Times each opcode, and so each addressing mode's handler, in isolation
+
+Every opcode in OPCODES (see emulator/disassembler.py) is run on its own on a fresh CPU: the
+instruction is placed at ORIGIN with a fixed operand, and the timing loop sets the program counter
+back to ORIGIN and calls CPU.step, over and over. The same loop with a step that does nothing is
+timed alongside it and taken off, so what is left is the cost of one instruction: its dispatch, operand
+fetch, addressing and the operation itself. Dividing by the cycles it took shows which handlers are
+slow for the work they do.
+
+The setup is the same on every run: registers start at zero (so branches on a clear flag are
+taken, to the next instruction), zero page operands are $80, which points at $0400, absolute
+operands are $0300, which points at $0200, and the garbage collector is off while timing. Each
+opcode's iterations are split into ROUNDS and the fastest round is kept. As absolute times depend on
+the machine, the table also gives each opcode's time relative to NOP, which carries across
+machines and Python builds.
+
+Run from the repository root (no pytest needed) with:
+
+    python -m src.benchmarks.addressing_modes --engine fast --iterations 2000000
+
+At the default 2,000,000 iterations timing all 151 opcodes takes a while, pass --opcode (in hex,
+repeatable) to time just some of them.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from itertools import repeat
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from ..emulator.disassembler import OPCODES
+from ..emulator.fast import FastCPU
+from ..emulator.m6502 import CPU
+
+ENGINES: Dict[str, Callable[[], CPU]] = {"cpu": CPU, "fast": FastCPU}
+
+ORIGIN = 0x0200
+ZERO_PAGE_OPERAND = 0x80
+ABSOLUTE_OPERAND = 0x0300
+IMMEDIATE_OPERAND = 0x42
+ROUNDS = 5
+NOP = 0xEA
+
+
+class Timing(NamedTuple):
+    """How long one opcode took"""
+
+    opcode: int
+    mnemonic: str
+    mode: str
+    cycles: int
+    ns_per_instruction: float
+    ns_per_cycle: float
+
+
+def prepare(engine: str, opcode: int) -> CPU:
+    """A new CPU of the engine with the opcode at ORIGIN, its operand and the memory it points at set up"""
+    decoded = OPCODES[opcode]
+    if decoded is None:
+        raise ValueError(f"${opcode:02X} is not a documented opcode, only those can be timed")
+    cpu = ENGINES[engine]()
+    data = cpu.Memory.data
+    if decoded.length == 2:
+        operand = IMMEDIATE_OPERAND if decoded.mode == "IM" else 0 if decoded.mode == "REL" else ZERO_PAGE_OPERAND
+        data[ORIGIN : ORIGIN + 2] = bytes([opcode, operand])
+    else:
+        data[ORIGIN : ORIGIN + 3] = bytes([opcode, ABSOLUTE_OPERAND & 0xFF, ABSOLUTE_OPERAND >> 8])
+    data[ZERO_PAGE_OPERAND : ZERO_PAGE_OPERAND + 2] = (0x0400).to_bytes(2, "little")
+    data[ABSOLUTE_OPERAND : ABSOLUTE_OPERAND + 2] = ORIGIN.to_bytes(2, "little")
+    cpu.pc = ORIGIN
+    return cpu
+
+
+def _nothing() -> None:
+    pass
+
+
+def _time_loop(cpu: CPU, step: Callable[[], None], iterations: int) -> float:
+    """The seconds taken to set the program counter to ORIGIN and call step, iterations times"""
+    start = time.perf_counter()
+    for _ in repeat(None, iterations):
+        cpu.pc = ORIGIN
+        step()
+    return time.perf_counter() - start
+
+
+def time_opcode(engine: str, opcode: int, iterations: int = 2_000_000) -> Timing:
+    """Times the opcode on its own, see the module docstring"""
+    cpu = prepare(engine, opcode)
+    decoded = OPCODES[opcode]
+    cpu.cycles = 0
+    cpu.step()
+    cycles = -cpu.cycles
+
+    per_round = max(1, iterations // ROUNDS)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        best = min(_time_loop(cpu, cpu.step, per_round) - _time_loop(cpu, _nothing, per_round) for _ in range(ROUNDS))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    ns = max(best, 0.0) / per_round * 1e9
+    return Timing(opcode, decoded.mnemonic, decoded.mode or "imp", cycles, ns, ns / cycles)
+
+
+def time_opcodes(engine: str = "cpu", iterations: int = 2_000_000, opcodes: Optional[List[int]] = None) -> List[Timing]:
+    """Times every opcode (or the ones given), slowest first"""
+    if opcodes is None:
+        opcodes = [opcode for opcode in range(0x100) if OPCODES[opcode] is not None]
+    timings = [time_opcode(engine, opcode, iterations) for opcode in opcodes]
+    timings.sort(key=lambda timing: timing.ns_per_instruction, reverse=True)
+    return timings
+
+
+def format_timings(timings: List[Timing]) -> str:
+    """The timings as a table, and the mean per addressing mode, each relative to NOP when it was timed"""
+    nop = next((timing.ns_per_instruction for timing in timings if timing.opcode == NOP), None)
+
+    def relative(ns: float) -> str:
+        return f"{ns / nop:>8.2f}" if nop else f"{'':>8}"
+
+    lines = [f"{'opcode':<6} {'mnemonic':<8} {'mode':<5} {'cycles':>6} {'ns':>8} {'ns/cycle':>8} {'x NOP':>8}"]
+    for timing in timings:
+        lines.append(
+            f"${timing.opcode:02X}    {timing.mnemonic:<8} {timing.mode:<5} {timing.cycles:>6} "
+            f"{timing.ns_per_instruction:>8.1f} {timing.ns_per_cycle:>8.1f} {relative(timing.ns_per_instruction)}"
+        )
+
+    modes: Dict[str, List[Timing]] = {}
+    for timing in timings:
+        modes.setdefault(timing.mode, []).append(timing)
+    lines.append("")
+    lines.append(f"{'mode':<5} {'opcodes':>7} {'ns':>8} {'ns/cycle':>8} {'x NOP':>8}")
+    summary = [
+        (
+            mode,
+            len(group),
+            statistics.mean(timing.ns_per_instruction for timing in group),
+            statistics.mean(timing.ns_per_cycle for timing in group),
+        )
+        for mode, group in modes.items()
+    ]
+    for mode, count, ns, ns_per_cycle in sorted(summary, key=lambda row: row[3], reverse=True):
+        lines.append(f"{mode:<5} {count:>7} {ns:>8.1f} {ns_per_cycle:>8.1f} {relative(ns)}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="cpu")
+    parser.add_argument("--iterations", type=int, default=2_000_000, help="per opcode")
+    parser.add_argument(
+        "--opcode", action="append", type=lambda text: int(text, 16), help="only time this opcode (hex), repeatable"
+    )
+    parser.add_argument("--output", help="also save the timings to this JSON file")
+    args = parser.parse_args(argv)
+    for opcode in args.opcode or []:
+        if not 0 <= opcode <= 0xFF or OPCODES[opcode] is None:
+            parser.error(f"--opcode {opcode:02X} is not a documented opcode")
+
+    timings = time_opcodes(args.engine, args.iterations, args.opcode)
+    print(
+        f"{args.engine} on Python {platform.python_version()} ({platform.python_implementation()}), {platform.machine()}"
+    )
+    print(format_timings(timings))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "engine": args.engine,
+                    "iterations": args.iterations,
+                    "python": platform.python_version(),
+                    "implementation": platform.python_implementation(),
+                    "machine": platform.machine(),
+                    "timings": [timing._asdict() for timing in timings],
+                },
+                file,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
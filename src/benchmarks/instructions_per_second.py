@@ -0,0 +1,137 @@
+"""Measures how many instructions per second CPU.execute (one at a time) and CPU.run_instructions can get
+through, how many cycles per second the interpreter (bus accurate, and with the cycle table of
+emulator/fast.py) and the translator (see emulator/translator.py) manage when left to run, and how
+many instructions per second a batch of CPUs stepped together (see emulator/batch.py) gets through
+
+Run from the repository root with:
+
+    python -m src.benchmarks.instructions_per_second
+"""
+import time
+
+from ..emulator.c_types import Byte
+from ..emulator.fast import FastCPU
+from ..emulator.m6502 import CPU
+from ..emulator.translator import Translator
+
+# ; copy_loop
+# * = $0200
+#
+# start
+# ldx #$00
+# loop
+# lda $0300,x
+# eor #$5A
+# adc #$01
+# sta $0400,x
+# inx
+# cpx #$80
+# bne loop
+# jmp start
+# fmt: off
+copy_loop = [
+    0x00, 0x02,
+    0xA2, 0x00,
+    0xBD, 0x00, 0x03,
+    0x49, 0x5A,
+    0x69, 0x01,
+    0x9D, 0x00, 0x04,
+    0xE8,
+    0xE0, 0x80,
+    0xD0, 0xF1,
+    0x4C, 0x00, 0x02,
+]
+# fmt: on
+
+
+def instructions_per_second(num_instructions: int = 50_000, repeat: int = 5) -> float:
+    """Runs the copy loop one instruction at a time, returns the best instructions per second over the repeats"""
+    cpu = CPU()
+    program = [Byte(x) for x in copy_loop]
+    cpu.program_counter = cpu.load_program(program, len(program))
+    for _ in range(1000):
+        # Warm up, so one off costs like building lookup tables are not timed
+        cpu.execute(1)
+
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(num_instructions):
+            cpu.execute(1)
+        elapsed = time.perf_counter() - start
+        best = max(best, num_instructions / elapsed)
+    return best
+
+
+def run_instructions_per_second(fast: bool = False, num_instructions: int = 200_000, repeat: int = 5) -> float:
+    """Runs the copy loop with CPU.run_instructions, returns the best instructions per second over the repeats"""
+    cpu = FastCPU() if fast else CPU()
+    program = [Byte(x) for x in copy_loop]
+    cpu.program_counter = cpu.load_program(program, len(program))
+    cpu.run_instructions(1000)
+
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cpu.run_instructions(num_instructions)
+        elapsed = time.perf_counter() - start
+        best = max(best, num_instructions / elapsed)
+    return best
+
+
+def cycles_per_second(
+    translated: bool = False, fast: bool = False, num_cycles: int = 500_000, repeat: int = 5
+) -> float:
+    """Runs the copy loop in one execute call, returns the best emulated cycles per second over the repeats
+
+    fast runs a FastCPU (cycles charged from a table) rather than the bus accurate CPU.
+    """
+    cpu = FastCPU() if fast else CPU()
+    program = [Byte(x) for x in copy_loop]
+    cpu.program_counter = cpu.load_program(program, len(program))
+    execute = Translator(cpu).execute if translated else cpu.execute
+    # Warm up, so building lookup tables and translating the loop are not timed
+    execute(5000)
+
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cycles_used = execute(num_cycles)
+        elapsed = time.perf_counter() - start
+        best = max(best, cycles_used / elapsed)
+    return best
+
+
+def batch_instructions_per_second(count: int = 1000, steps: int = 200, repeat: int = 5) -> float:
+    """Steps count copies of the copy loop in lockstep, returns the best instructions per second over the repeats"""
+    import numpy as np
+
+    from ..emulator.batch import BatchCPU
+
+    cpu = CPU()
+    program = [Byte(x) for x in copy_loop]
+    cpu.program_counter = cpu.load_program(program, len(program))
+    batch = BatchCPU.from_cpus([cpu] * count)
+    # Different data per lane, so the lanes do not all take the same path
+    batch.memory[:, 0x0300:0x0400] = np.random.default_rng(0).integers(0, 0x100, (count, 0x100), dtype=np.uint8)
+    lanes = np.arange(count)
+    batch.execute(100)
+
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(steps):
+            batch.step(lanes)
+        elapsed = time.perf_counter() - start
+        best = max(best, count * steps / elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    print(f"{instructions_per_second():,.0f} instructions/second")
+    print(f"{run_instructions_per_second():,.0f} instructions/second with run_instructions")
+    print(f"{run_instructions_per_second(fast=True):,.0f} instructions/second with FastCPU.run_instructions")
+    print(f"{cycles_per_second():,.0f} cycles/second interpreted")
+    print(f"{cycles_per_second(fast=True):,.0f} cycles/second interpreted with the cycle table")
+    print(f"{cycles_per_second(translated=True):,.0f} cycles/second translated")
+    print(f"{batch_instructions_per_second():,.0f} instructions/second over 1000 CPUs in a batch")
@@ -0,0 +1,435 @@
+"""A benchmark suite to hold the core to: the functional test and a set of synthetic kernels
+
+Each benchmark is run on the bus accurate CPU and on FastCPU (see emulator/fast.py) with CPU.run,
+which runs the same instructions CPU.execute does, and reports instructions per second, cycles per
+second and emulated MHz (millions of cycles per second, so 1.0 keeps up with a 1 MHz 6502):
+
+    functional  Klaus Dormann's 6502 functional test (src/tests/6502_functional_test.bin), run from
+                $0400 until it traps. It passes if the trap is at KLAUS_SUCCESS
+    memcpy      copies 1 KiB a byte at a time through (zp),Y pointers
+    multiply    an 8 x 8 bit shift and add multiply subroutine over every pair of factors
+    branches    a loop of compares and taken / not taken branches, counting X modulo 4
+    stack       nested JSR / RTS with PHA, PLA, PHP and PLP around the calls
+
+The kernels loop forever and are timed over a number of cycles, the best of a few repeats. Run from
+the repository root with:
+
+    python -m src.benchmarks.suite --output results.json
+
+and, after changing the core, compare against the saved results. The exit status is 1 if any
+benchmark's cycles per second dropped by more than the tolerance:
+
+    python -m src.benchmarks.suite --baseline results.json --tolerance 0.1
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from ..emulator.c_types import Byte
+from ..emulator.const import StopReason
+from ..emulator.fast import FastCPU
+from ..emulator.loaders import load_binary
+from ..emulator.m6502 import CPU
+
+FUNCTIONAL_TEST = Path(__file__).parents[1] / "tests" / "6502_functional_test.bin"
+FUNCTIONAL_TEST_START = 0x0400
+# Where the functional test traps once every test has passed
+KLAUS_SUCCESS = 0x3469
+
+ENGINES: Dict[str, Callable[[], CPU]] = {"cpu": CPU, "fast": FastCPU}
+
+
+class Kernel(NamedTuple):
+    """A synthetic benchmark, a program (load address first) which loops forever from its load address"""
+
+    name: str
+    program: List[int]
+
+
+class Result(NamedTuple):
+    """The timing of one benchmark on one engine"""
+
+    benchmark: str
+    engine: str
+    instructions: int
+    cycles: int
+    seconds: float
+    instructions_per_second: float
+    cycles_per_second: float
+    mhz: float
+    passed: Optional[bool]  # Whether the functional test passed, None for the kernels
+
+
+# ; memcpy, copies 4 pages from $1000 to $2000
+# * = $0200
+#
+# start
+# lda #$00
+# sta $FB
+# sta $FD
+# lda #$10
+# sta $FC
+# lda #$20
+# sta $FE
+# ldx #$04
+# ldy #$00
+# loop
+# lda ($FB),y
+# sta ($FD),y
+# iny
+# bne loop
+# inc $FC
+# inc $FE
+# dex
+# bne loop
+# jmp start
+# fmt: off
+memcpy = [
+    0x00, 0x02,
+    0xA9, 0x00,
+    0x85, 0xFB,
+    0x85, 0xFD,
+    0xA9, 0x10,
+    0x85, 0xFC,
+    0xA9, 0x20,
+    0x85, 0xFE,
+    0xA2, 0x04,
+    0xA0, 0x00,
+    0xB1, 0xFB,
+    0x91, 0xFD,
+    0xC8,
+    0xD0, 0xF9,
+    0xE6, 0xFC,
+    0xE6, 0xFE,
+    0xCA,
+    0xD0, 0xF2,
+    0x4C, 0x00, 0x02,
+]
+# fmt: on
+
+# ; multiply, $F2 (high) $F3 (low) = $F0 * $F1 for every $F0 and $F1
+# * = $0200
+#
+# start
+# lda #$00
+# sta $F0
+# sta $F1
+# outer
+# jsr multiply
+# inc $F0
+# bne outer
+# inc $F1
+# jmp outer
+# multiply
+# lda #$00
+# sta $F3
+# ldx #$08
+# lda $F1
+# sta $F4
+# lda #$00
+# loop
+# lsr $F4
+# bcc skip
+# clc
+# adc $F0
+# skip
+# ror a
+# ror $F3
+# dex
+# bne loop
+# sta $F2
+# rts
+# fmt: off
+multiply = [
+    0x00, 0x02,
+    0xA9, 0x00,
+    0x85, 0xF0,
+    0x85, 0xF1,
+    0x20, 0x12, 0x02,
+    0xE6, 0xF0,
+    0xD0, 0xF9,
+    0xE6, 0xF1,
+    0x4C, 0x06, 0x02,
+    0xA9, 0x00,
+    0x85, 0xF3,
+    0xA2, 0x08,
+    0xA5, 0xF1,
+    0x85, 0xF4,
+    0xA9, 0x00,
+    0x46, 0xF4,
+    0x90, 0x03,
+    0x18,
+    0x65, 0xF0,
+    0x6A,
+    0x66, 0xF3,
+    0xCA,
+    0xD0, 0xF3,
+    0x85, 0xF2,
+    0x60,
+]
+# fmt: on
+
+# ; branches, counts X modulo 4 into $10-$13 for X = 0 to 255
+# * = $0200
+#
+# start
+# ldx #$00
+# loop
+# txa
+# and #$03
+# beq zero
+# cmp #$02
+# bcc one
+# beq two
+# bne three
+# zero
+# inc $10
+# jmp next
+# one
+# inc $11
+# jmp next
+# two
+# inc $12
+# jmp next
+# three
+# inc $13
+# next
+# inx
+# bne loop
+# jmp start
+# fmt: off
+branches = [
+    0x00, 0x02,
+    0xA2, 0x00,
+    0x8A,
+    0x29, 0x03,
+    0xF0, 0x08,
+    0xC9, 0x02,
+    0x90, 0x09,
+    0xF0, 0x0C,
+    0xD0, 0x0F,
+    0xE6, 0x10,
+    0x4C, 0x20, 0x02,
+    0xE6, 0x11,
+    0x4C, 0x20, 0x02,
+    0xE6, 0x12,
+    0x4C, 0x20, 0x02,
+    0xE6, 0x13,
+    0xE8,
+    0xD0, 0xDF,
+    0x4C, 0x00, 0x02,
+]
+# fmt: on
+
+# ; stack, each call saves A and X, and the inner call the status, counting calls in $20
+# * = $0200
+#
+# start
+# ldx #$00
+# loop
+# jsr outer
+# inx
+# bne loop
+# jmp start
+# outer
+# pha
+# txa
+# pha
+# jsr inner
+# pla
+# tax
+# pla
+# rts
+# inner
+# php
+# inc $20
+# plp
+# rts
+# fmt: off
+stack = [
+    0x00, 0x02,
+    0xA2, 0x00,
+    0x20, 0x0B, 0x02,
+    0xE8,
+    0xD0, 0xFA,
+    0x4C, 0x00, 0x02,
+    0x48,
+    0x8A,
+    0x48,
+    0x20, 0x15, 0x02,
+    0x68,
+    0xAA,
+    0x68,
+    0x60,
+    0x08,
+    0xE6, 0x20,
+    0x28,
+    0x60,
+]
+# fmt: on
+
+KERNELS = [
+    Kernel("memcpy", memcpy),
+    Kernel("multiply", multiply),
+    Kernel("branches", branches),
+    Kernel("stack", stack),
+]
+
+
+def load_kernel(engine: str, kernel: Kernel) -> CPU:
+    """A new CPU of the engine with the kernel loaded and the program counter at its start"""
+    cpu = ENGINES[engine]()
+    program = [Byte(x) for x in kernel.program]
+    cpu.program_counter = cpu.load_program(program, len(program))
+    return cpu
+
+
+def _result(
+    benchmark: str, engine: str, instructions: int, cycles: int, seconds: float, passed: Optional[bool] = None
+) -> Result:
+    return Result(
+        benchmark,
+        engine,
+        instructions,
+        cycles,
+        seconds,
+        instructions / seconds,
+        cycles / seconds,
+        cycles / seconds / 1e6,
+        passed,
+    )
+
+
+def run_kernel(engine: str, kernel: Kernel, num_cycles: int = 1_000_000, repeat: int = 3) -> Result:
+    """Runs the kernel for the cycles, returns the fastest of the repeats"""
+    cpu = load_kernel(engine, kernel)
+    # Warm up, so one off costs like building lookup tables are not timed
+    cpu.run_cycles(10_000)
+
+    best: Optional[Result] = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stop = cpu.run_cycles(num_cycles)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best.seconds:
+            best = _result(kernel.name, engine, stop.instructions, stop.cycles, elapsed)
+    return best
+
+
+def run_functional_test(engine: str, cycles: Optional[int] = None, path: Path = FUNCTIONAL_TEST) -> Result:
+    """Runs the functional test until it traps (or the cycles are used), once
+
+    passed is True if it trapped at KLAUS_SUCCESS, and False if it trapped anywhere else (the
+    failing test) or ran out of cycles first.
+    """
+    cpu = ENGINES[engine]()
+    load_binary(cpu.Memory, path)
+    cpu.pc = FUNCTIONAL_TEST_START
+    start = time.perf_counter()
+    stop = cpu.run_until_trap(cycles)
+    elapsed = time.perf_counter() - start
+    passed = stop.reason == StopReason.TRAP and cpu.pc == KLAUS_SUCCESS
+    return _result("functional", engine, stop.instructions, stop.cycles, elapsed, passed)
+
+
+def run_suite(
+    engines: Iterable[str] = tuple(ENGINES),
+    num_cycles: int = 1_000_000,
+    repeat: int = 3,
+    functional_cycles: Optional[int] = None,
+    functional: bool = True,
+) -> List[Result]:
+    """Runs every kernel, and the functional test unless functional is False, on each engine"""
+    results = []
+    for engine in engines:
+        if functional:
+            results.append(run_functional_test(engine, functional_cycles))
+        for kernel in KERNELS:
+            results.append(run_kernel(engine, kernel, num_cycles, repeat))
+    return results
+
+
+def save_results(results: List[Result], path: str) -> None:
+    """Writes the results to a JSON file, with the Python and machine they came from"""
+    document = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "results": [result._asdict() for result in results],
+    }
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2)
+
+
+def load_results(path: str) -> List[Result]:
+    """Reads results written by save_results"""
+    with open(path) as file:
+        return [Result(**result) for result in json.load(file)["results"]]
+
+
+def regressions(results: List[Result], baseline: List[Result], tolerance: float = 0.1) -> List[str]:
+    """Describes each benchmark whose cycles per second dropped by more than the tolerance (a fraction)"""
+    before = {(result.benchmark, result.engine): result for result in baseline}
+    found = []
+    for result in results:
+        old = before.get((result.benchmark, result.engine))
+        if old is None:
+            continue
+        change = result.cycles_per_second / old.cycles_per_second - 1
+        if change < -tolerance:
+            found.append(
+                f"{result.benchmark} on {result.engine}: {result.cycles_per_second:,.0f} cycles/second, "
+                f"{-change:.1%} slower than {old.cycles_per_second:,.0f}"
+            )
+        if old.passed and result.passed is False:
+            found.append(f"{result.benchmark} on {result.engine}: no longer passes")
+    return found
+
+
+def format_results(results: List[Result]) -> str:
+    """The results as a table"""
+    lines = [f"{'benchmark':<11} {'engine':<6} {'instructions/s':>15} {'cycles/s':>13} {'MHz':>6}  result"]
+    for result in results:
+        outcome = "" if result.passed is None else ("passed" if result.passed else "FAILED")
+        lines.append(
+            f"{result.benchmark:<11} {result.engine:<6} {result.instructions_per_second:>15,.0f} "
+            f"{result.cycles_per_second:>13,.0f} {result.mhz:>6.3f}  {outcome}".rstrip()
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", action="append", choices=sorted(ENGINES), help="default: all of them")
+    parser.add_argument("--cycles", type=int, default=1_000_000, help="cycles each kernel is timed over")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--functional-cycles", type=int, help="stop the functional test after this many cycles")
+    parser.add_argument("--no-functional", action="store_true", help="only run the kernels")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="slowdown allowed against the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        args.engine or tuple(ENGINES), args.cycles, args.repeat, args.functional_cycles, not args.no_functional
+    )
+    print(format_results(results))
+    if args.output:
+        save_results(results, args.output)
+    if args.baseline:
+        found = regressions(results, load_results(args.baseline), args.tolerance)
+        for regression in found:
+            print(regression)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Precomputed results for ADC and SBC
+
+ADC_TABLE and SBC_TABLE have an entry for every combination of decimal flag, carry flag, A and
+operand, found at table_index(a, operand, carry, decimal). Each entry holds the result in its low
+byte and the C, Z, V and N flags (in their processor status bit positions) in its high byte, so an
+instruction is a single lookup whether or not the CPU is in decimal mode.
+
+Decimal mode follows the NMOS 6502: the result and carry are BCD corrected, N and V come from the
+intermediate high nibble sum for ADC, and Z (and every flag for SBC) is the binary result's.
+
+The tables are built the first time they are used (with NumPy if it is installed), so importing
+the emulator does not pay for them.
+"""
+from array import array
+from typing import Callable, Tuple
+
+from .const import ProcessorStatus
+
+TABLE_SIZE = 0x40000
+
+# The flags ADC and SBC produce, every other status bit is left as it was
+ARITHMETIC_FLAGS = (
+    ProcessorStatus.CarryFlagBit
+    | ProcessorStatus.ZeroFlagBit
+    | ProcessorStatus.OverflowFlagBit
+    | ProcessorStatus.NegativeFlagBit
+)
+
+
+def table_index(a: int, operand: int, carry: int, decimal: int) -> int:
+    """Index into ADC_TABLE/SBC_TABLE, carry and decimal are 0 or 1"""
+    return decimal << 17 | carry << 16 | a << 8 | operand
+
+
+def _select(condition: object, if_true: object, if_false: object) -> object:
+    return if_true if condition else if_false
+
+
+def _sign_extend(value: object) -> object:
+    return (value ^ 0x80) - 0x80
+
+
+def _add_with_carry(a, operand, carry, decimal, where: Callable = _select) -> Tuple[object, object]:
+    """ADC result and flags, works on plain ints or (with where=numpy.where) on whole arrays at once"""
+    binary_sum = a + operand + carry
+    binary_result = binary_sum & 0xFF
+    binary_overflow = ~(a ^ operand) & (a ^ binary_result) & 0x80
+
+    low = (a & 0x0F) + (operand & 0x0F) + carry
+    low = where(low >= 0x0A, ((low + 0x06) & 0x0F) + 0x10, low)
+    high = (a & 0xF0) + (operand & 0xF0) + low
+    signed_high = _sign_extend(a & 0xF0) + _sign_extend(operand & 0xF0) + low
+    decimal_negative = high & 0x80
+    decimal_overflow = where((signed_high < -128) | (signed_high > 127), 0x80, 0)
+    high = where(high >= 0xA0, high + 0x60, high)
+
+    total = where(decimal, high, binary_sum)
+    negative = where(decimal, decimal_negative, binary_result & 0x80)
+    overflow = where(decimal, decimal_overflow, binary_overflow)
+    flags = (
+        where(total > 0xFF, ProcessorStatus.CarryFlagBit, 0)
+        | where(binary_result == 0, ProcessorStatus.ZeroFlagBit, 0)
+        | (overflow >> 1)
+        | negative
+    )
+    return total & 0xFF, flags
+
+
+def _subtract_with_carry(a, operand, carry, decimal, where: Callable = _select) -> Tuple[object, object]:
+    """SBC result and flags, works on plain ints or (with where=numpy.where) on whole arrays at once"""
+    binary_result, flags = _add_with_carry(a, operand ^ 0xFF, carry, 0, where)
+
+    low = (a & 0x0F) - (operand & 0x0F) + carry - 1
+    low = where(low < 0, ((low - 0x06) & 0x0F) - 0x10, low)
+    high = (a & 0xF0) - (operand & 0xF0) + low
+    high = where(high < 0, high - 0x60, high)
+
+    return where(decimal, high & 0xFF, binary_result), flags
+
+
+def add_with_carry(a: int, operand: int, carry: int, decimal: int) -> Tuple[int, int]:
+    """Returns the (result, flags) of ADC without using the table"""
+    return _add_with_carry(a, operand, carry, decimal)
+
+
+def subtract_with_carry(a: int, operand: int, carry: int, decimal: int) -> Tuple[int, int]:
+    """Returns the (result, flags) of SBC without using the table"""
+    return _subtract_with_carry(a, operand, carry, decimal)
+
+
+def build_table(operation: Callable) -> array:
+    """Runs the operation over every table index and packs each result | flags << 8 into an array"""
+    try:
+        import numpy as np
+    except ImportError:
+        return array(
+            "H",
+            (
+                result | flags << 8
+                for result, flags in (
+                    operation(index >> 8 & 0xFF, index & 0xFF, index >> 16 & 1, index >> 17)
+                    for index in range(TABLE_SIZE)
+                )
+            ),
+        )
+
+    index = np.arange(TABLE_SIZE, dtype=np.int32)
+    result, flags = operation(index >> 8 & 0xFF, index & 0xFF, index >> 16 & 1, index >> 17, np.where)
+    return array("H", (result | flags << 8).astype(np.uint16).tobytes())
+
+
+def __getattr__(name: str) -> array:
+    """Builds ADC_TABLE/SBC_TABLE on first use, after that they are plain module attributes"""
+    operations = {"ADC_TABLE": _add_with_carry, "SBC_TABLE": _subtract_with_carry}
+    if name not in operations:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    table = build_table(operations[name])
+    globals()[name] = table
+    return table
@@ -0,0 +1,594 @@
+"""Runs many independent 6502s in lockstep as one NumPy batch
+
+BatchCPU holds N CPUs structure of arrays style: a, x, y, sp and p are uint8 vectors, pc is a
+uint16 vector and memory is an N x 65536 uint8 array, so lane i is CPU i. Each step fetches the
+opcode for every lane, groups the lanes by opcode and runs each group through a vectorised
+version of the instruction, so the Python overhead is paid per distinct opcode rather than per CPU.
+
+The instructions, addressing modes and cycle counts follow CPU's one for one (the methods have
+the same names, taking the lanes to work on first). Lanes stop once their own cycles run out, just
+as CPU.execute does, so each lane ends up exactly where a CPU started from the same state would.
+
+Only the documented opcodes are vectorised: an undocumented one stops the batch with
+NotImplementedError, as for a CPU with the default Undocumented.TRAP policy, and a batch can not
+be made with (or from CPUs with) any other policy.
+
+Needs NumPy, which the rest of the emulator does not.
+"""
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from . import arithmetic
+from .arithmetic import ARITHMETIC_FLAGS
+from .c_types import Byte
+from .const import NOT_ZERO_AND_NEGATIVE_FLAGS, ZERO_AND_NEGATIVE_FLAGS, ProcessorStatus, Undocumented
+from .m6502 import ALWAYS_INDEXED_MNEMONICS, CPU, Memory, opcode_names
+
+# Indices of the lanes an instruction is run on
+Lanes = np.ndarray
+BatchInstruction = Callable[["BatchCPU", Lanes], None]
+
+ZERO_AND_NEGATIVE_FLAGS_ARRAY = np.array(ZERO_AND_NEGATIVE_FLAGS, dtype=np.uint8)
+KEEP_ALL_BUT_ZERO_AND_NEGATIVE_FLAGS = 0xFF & NOT_ZERO_AND_NEGATIVE_FLAGS
+KEEP_ALL_BUT_ARITHMETIC_FLAGS = 0xFF & ~ARITHMETIC_FLAGS
+STATUS_PUSHED = ProcessorStatus.BreakFlagBit | ProcessorStatus.UnusedFlagBit
+
+
+class BatchCPU(object):
+    """N 6502 CPUs, each with its own registers and 64 KiB of memory, stepped together
+
+    Usage:
+
+        batch = BatchCPU.from_cpus([cpu] * 1000)
+        batch.a[:] = np.arange(1000) & 0xFF
+        cycles_used = batch.execute(10_000)
+        cpu_7 = batch.lane(7)
+    """
+
+    # Opcode -> vectorised instruction handler, see build_batch_instruction_table
+    instructions: List[BatchInstruction]
+
+    def __init__(self, count: int, undocumented: int = Undocumented.TRAP):
+        if undocumented != Undocumented.TRAP:
+            raise ValueError("BatchCPU only runs documented opcodes, use CPU or FastCPU for other policies")
+        self.count = count
+        self.a = np.zeros(count, dtype=np.uint8)
+        self.x = np.zeros(count, dtype=np.uint8)
+        self.y = np.zeros(count, dtype=np.uint8)
+        self.sp = np.full(count, 0xFF, dtype=np.uint8)
+        self.p = np.zeros(count, dtype=np.uint8)
+        self.pc = np.full(count, 0xFFFC, dtype=np.uint16)
+        self.cycles = np.zeros(count, dtype=np.int64)
+        self.memory = np.zeros((count, 0x10000), dtype=np.uint8)
+
+    @classmethod
+    def from_cpus(cls, cpus: Sequence[CPU]) -> "BatchCPU":
+        """Makes a batch with a lane holding a copy of each CPU's registers and memory"""
+        for lane, cpu in enumerate(cpus):
+            if cpu.undocumented != Undocumented.TRAP:
+                policy = next(name for name, value in vars(Undocumented).items() if value == cpu.undocumented)
+                raise ValueError(f"BatchCPU only runs documented opcodes, CPU {lane} has Undocumented.{policy}")
+        batch = cls(len(cpus))
+        for lane, cpu in enumerate(cpus):
+            batch.a[lane], batch.x[lane], batch.y[lane] = cpu.a, cpu.x, cpu.y
+            batch.sp[lane], batch.p[lane], batch.pc[lane] = cpu.sp, cpu.p, cpu.pc
+            batch.memory[lane] = np.frombuffer(cpu.Memory.data, dtype=np.uint8)
+        return batch
+
+    def lane(self, lane: int) -> CPU:
+        """Returns a CPU holding a copy of the lane's registers and memory"""
+        cpu = CPU(Memory())
+        cpu.a, cpu.x, cpu.y = int(self.a[lane]), int(self.x[lane]), int(self.y[lane])
+        cpu.sp, cpu.p, cpu.pc = int(self.sp[lane]), int(self.p[lane]), int(self.pc[lane])
+        cpu.cycles = int(self.cycles[lane])
+        cpu.Memory.data[:] = self.memory[lane].tobytes()
+        return cpu
+
+    def step(self, lanes: Lanes) -> None:
+        """Runs one instruction on each of the lanes"""
+        opcodes = self.memory[lanes, self.pc[lanes]]
+        self.pc[lanes] += 1
+        self.cycles[lanes] -= 1
+        order = np.argsort(opcodes, kind="stable")
+        opcodes, lanes = opcodes[order], lanes[order]
+        group_opcodes, group_starts = np.unique(opcodes, return_index=True)
+        instructions = self.instructions
+        for opcode, group in zip(group_opcodes, np.split(lanes, group_starts[1:])):
+            instructions[opcode](self, group)
+
+    def execute(self, cycles: int) -> np.ndarray:
+        """Runs every lane until it has used the requested cycles, returns the cycles each lane used"""
+        self.cycles[:] = cycles
+        lanes = np.flatnonzero(self.cycles > 0)
+        while lanes.size:
+            self.step(lanes)
+            lanes = lanes[self.cycles[lanes] > 0]
+        return cycles - self.cycles
+
+    def fetch_byte(self, lanes: Lanes) -> np.ndarray:
+        data = self.memory[lanes, self.pc[lanes]].astype(np.int32)
+        self.pc[lanes] += 1
+        self.cycles[lanes] -= 1
+        return data
+
+    def fetch_sbyte(self, lanes: Lanes) -> np.ndarray:
+        data = self.fetch_byte(lanes)
+        return data - ((data & 0x80) << 1)
+
+    def fetch_word(self, lanes: Lanes) -> np.ndarray:
+        # 6502 is little endian
+        data = self.fetch_byte(lanes)
+        data |= self.fetch_byte(lanes) << 8
+        return data
+
+    def read_byte(self, lanes: Lanes, address: np.ndarray) -> np.ndarray:
+        data = self.memory[lanes, address].astype(np.int32)
+        self.cycles[lanes] -= 1
+        return data
+
+    def read_word(self, lanes: Lanes, address: np.ndarray) -> np.ndarray:
+        low_byte = self.read_byte(lanes, address)
+        high_byte = self.read_byte(lanes, (address + 1) & 0xFFFF)
+        return low_byte | (high_byte << 8)
+
+    def read_zero_page_word(self, lanes: Lanes, zero_page_address: np.ndarray) -> np.ndarray:
+        """Reads a pointer from the zero page, the high byte wraps around within the zero page"""
+        low_byte = self.read_byte(lanes, zero_page_address)
+        high_byte = self.read_byte(lanes, (zero_page_address + 1) & 0xFF)
+        return low_byte | (high_byte << 8)
+
+    def write_byte(self, lanes: Lanes, address: np.ndarray, value: np.ndarray) -> None:
+        self.memory[lanes, address] = value
+        self.cycles[lanes] -= 1
+
+    def push_byte_onto_stack(self, lanes: Lanes, value: np.ndarray) -> None:
+        self.write_byte(lanes, 0x100 | self.sp[lanes].astype(np.int32), value)
+        self.sp[lanes] -= 1
+        self.cycles[lanes] -= 1
+
+    def push_word_onto_stack(self, lanes: Lanes, value: np.ndarray) -> None:
+        self.write_byte(lanes, 0x100 | self.sp[lanes].astype(np.int32), value >> 8)
+        self.sp[lanes] -= 1
+        self.write_byte(lanes, 0x100 | self.sp[lanes].astype(np.int32), value & 0xFF)
+        self.sp[lanes] -= 1
+
+    def pop_byte_from_stack(self, lanes: Lanes) -> np.ndarray:
+        self.sp[lanes] += 1
+        self.cycles[lanes] -= 1
+        return self.read_byte(lanes, 0x100 | self.sp[lanes].astype(np.int32))
+
+    def pop_word_from_stack(self, lanes: Lanes) -> np.ndarray:
+        sp = self.sp[lanes].astype(np.int32)
+        low_byte = self.read_byte(lanes, 0x100 | ((sp + 1) & 0xFF))
+        high_byte = self.read_byte(lanes, 0x100 | ((sp + 2) & 0xFF))
+        self.sp[lanes] += 2
+        self.cycles[lanes] -= 1
+        return low_byte | (high_byte << 8)
+
+    def set_zero_and_negative_flags(self, lanes: Lanes, value: np.ndarray) -> None:
+        self.p[lanes] = (self.p[lanes] & KEEP_ALL_BUT_ZERO_AND_NEGATIVE_FLAGS) | ZERO_AND_NEGATIVE_FLAGS_ARRAY[value]
+
+    def address_immediate(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Immediate, the operand is the next byte of the program"""
+        address = self.pc[lanes].astype(np.int32)
+        self.pc[lanes] += 1
+        return address
+
+    def address_zero_page(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Zero page"""
+        return self.fetch_byte(lanes)
+
+    def address_zero_page_x_offset(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Zero page with X offset"""
+        zero_page_address = (self.fetch_byte(lanes) + self.x[lanes]) & 0xFF
+        self.cycles[lanes] -= 1
+        return zero_page_address
+
+    def address_zero_page_y_offset(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Zero page with Y offset"""
+        zero_page_address = (self.fetch_byte(lanes) + self.y[lanes]) & 0xFF
+        self.cycles[lanes] -= 1
+        return zero_page_address
+
+    def address_absolute(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Absolute"""
+        return self.fetch_word(lanes)
+
+    def __indexed(self, lanes: Lanes, address: np.ndarray, index: np.ndarray, always_crosses: bool) -> np.ndarray:
+        """Adds the index to the address, taking a cycle if the page changes (or always if always_crosses)"""
+        indexed_address = (address + index) & 0xFFFF
+        if always_crosses:
+            self.cycles[lanes] -= 1
+        else:
+            self.cycles[lanes] -= ((address & 0xFF) + index) >> 8
+        return indexed_address
+
+    def address_absolute_x_offset(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Absolute with X offset"""
+        return self.__indexed(lanes, self.fetch_word(lanes), self.x[lanes], False)
+
+    def address_absolute_x_offset_5(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Absolute with X offset, always takes the cycle for the index"""
+        return self.__indexed(lanes, self.fetch_word(lanes), self.x[lanes], True)
+
+    def address_absolute_y_offset(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Absolute with Y offset"""
+        return self.__indexed(lanes, self.fetch_word(lanes), self.y[lanes], False)
+
+    def address_absolute_y_offset_5(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Absolute with Y offset, always takes the cycle for the index"""
+        return self.__indexed(lanes, self.fetch_word(lanes), self.y[lanes], True)
+
+    def address_indirect_x_offset(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Indirect X | Indexed Indirect"""
+        zero_page_address = (self.fetch_byte(lanes) + self.x[lanes]) & 0xFF
+        self.cycles[lanes] -= 1
+        return self.read_zero_page_word(lanes, zero_page_address)
+
+    def address_indirect_y_offset(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Indirect Y | Indirect Indexed"""
+        effective_address = self.read_zero_page_word(lanes, self.fetch_byte(lanes))
+        return self.__indexed(lanes, effective_address, self.y[lanes], False)
+
+    def address_indirect_y_offset_6(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Indirect Y | Indirect Indexed, always takes the cycle for the index"""
+        effective_address = self.read_zero_page_word(lanes, self.fetch_byte(lanes))
+        return self.__indexed(lanes, effective_address, self.y[lanes], True)
+
+    def address_indirect(self, lanes: Lanes) -> np.ndarray:
+        """Addressing mode - Indirect (JMP only), see CPU.address_indirect"""
+        return self.read_word(lanes, self.fetch_word(lanes))
+
+    def __branch_if(self, lanes: Lanes, flag: int, expected: bool) -> None:
+        """Conditional branch"""
+        offset = self.fetch_sbyte(lanes)
+        taken = ((self.p[lanes] & flag) != 0) == expected
+        lanes, offset = lanes[taken], offset[taken]
+        program_counter_old = self.pc[lanes].astype(np.int32)
+        program_counter_new = (program_counter_old + offset) & 0xFFFF
+        self.pc[lanes] = program_counter_new
+        self.cycles[lanes] -= 1 + (((program_counter_old ^ program_counter_new) >> 8) != 0)
+
+    def __add_with_carry(self, lanes: Lanes, operand: np.ndarray, table: np.ndarray) -> None:
+        """ADC (or SBC given the SBC table), binary or decimal depending on each lane's D flag"""
+        p = self.p[lanes].astype(np.int32)
+        index = (p & ProcessorStatus.DecimalFlagBit) << 14 | (p & ProcessorStatus.CarryFlagBit) << 16
+        entry = table[index | self.a[lanes].astype(np.int32) << 8 | operand]
+        self.a[lanes] = entry & 0xFF
+        self.p[lanes] = (p & KEEP_ALL_BUT_ARITHMETIC_FLAGS) | (entry >> 8)
+
+    def __register_compare(self, lanes: Lanes, operand: np.ndarray, register_value: np.ndarray) -> None:
+        """Sets the processor status for a CMP/CPX/CPY instruction"""
+        register_value = register_value.astype(np.int32)
+        p = self.p[lanes].astype(np.int32) & ~(
+            ProcessorStatus.NegativeFlagBit | ProcessorStatus.ZeroFlagBit | ProcessorStatus.CarryFlagBit
+        )
+        p |= (register_value - operand) & ProcessorStatus.NegativeFlagBit
+        p |= (register_value == operand) * ProcessorStatus.ZeroFlagBit
+        p |= (register_value >= operand) * ProcessorStatus.CarryFlagBit
+        self.p[lanes] = p
+
+    def __arithmetic_shift_left(self, lanes: Lanes, operand: np.ndarray) -> np.ndarray:
+        """Arithmetic shift left"""
+        self.p[lanes] = (self.p[lanes] & 0xFE) | (operand >> 7)
+        result = (operand << 1) & 0xFF
+        self.set_zero_and_negative_flags(lanes, result)
+        self.cycles[lanes] -= 1
+        return result
+
+    def __logical_shift_right(self, lanes: Lanes, operand: np.ndarray) -> np.ndarray:
+        """Logical shift right"""
+        self.p[lanes] = (self.p[lanes] & 0xFE) | (operand & ProcessorStatus.CarryFlagBit)
+        result = operand >> 1
+        self.set_zero_and_negative_flags(lanes, result)
+        self.cycles[lanes] -= 1
+        return result
+
+    def __rotate_left(self, lanes: Lanes, operand: np.ndarray) -> np.ndarray:
+        """Rotate left"""
+        result = (operand << 1) | (self.p[lanes] & ProcessorStatus.CarryFlagBit)
+        self.p[lanes] = (self.p[lanes] & 0xFE) | (result >> 8)
+        result &= 0xFF
+        self.set_zero_and_negative_flags(lanes, result)
+        self.cycles[lanes] -= 1
+        return result
+
+    def __rotate_right(self, lanes: Lanes, operand: np.ndarray) -> np.ndarray:
+        """Rotate right"""
+        result = (operand >> 1) | ((self.p[lanes].astype(np.int32) & ProcessorStatus.CarryFlagBit) << 7)
+        self.p[lanes] = (self.p[lanes] & 0xFE) | (operand & ProcessorStatus.CarryFlagBit)
+        self.set_zero_and_negative_flags(lanes, result)
+        self.cycles[lanes] -= 1
+        return result
+
+    def __step_at(self, lanes: Lanes, address: np.ndarray, step: int) -> None:
+        """INC (step 1) or DEC (step -1) of the memory at the address"""
+        value = (self.read_byte(lanes, address) + step) & 0xFF
+        self.cycles[lanes] -= 1
+        self.write_byte(lanes, address, value)
+        self.set_zero_and_negative_flags(lanes, value)
+
+    def __transfer(self, lanes: Lanes, value: np.ndarray, register: np.ndarray) -> None:
+        """Copies the value into the register, setting the Z/N flags from it"""
+        register[lanes] = value
+        self.cycles[lanes] -= 1
+        self.set_zero_and_negative_flags(lanes, register[lanes])
+
+    # Instructions which take the effective address from their addressing mode
+
+    def ins_lda(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.a[lanes] = value = self.read_byte(lanes, address)
+        self.set_zero_and_negative_flags(lanes, value)
+
+    def ins_ldx(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.x[lanes] = value = self.read_byte(lanes, address)
+        self.set_zero_and_negative_flags(lanes, value)
+
+    def ins_ldy(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.y[lanes] = value = self.read_byte(lanes, address)
+        self.set_zero_and_negative_flags(lanes, value)
+
+    def ins_sta(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.write_byte(lanes, address, self.a[lanes])
+
+    def ins_stx(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.write_byte(lanes, address, self.x[lanes])
+
+    def ins_sty(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.write_byte(lanes, address, self.y[lanes])
+
+    def ins_and(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.a[lanes] = value = self.a[lanes] & self.read_byte(lanes, address)
+        self.set_zero_and_negative_flags(lanes, value)
+
+    def ins_ora(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.a[lanes] = value = self.a[lanes] | self.read_byte(lanes, address)
+        self.set_zero_and_negative_flags(lanes, value)
+
+    def ins_eor(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.a[lanes] = value = self.a[lanes] ^ self.read_byte(lanes, address)
+        self.set_zero_and_negative_flags(lanes, value)
+
+    def ins_bit(self, lanes: Lanes, address: np.ndarray) -> None:
+        value = self.read_byte(lanes, address)
+        p = self.p[lanes].astype(np.int32) & ~(
+            ProcessorStatus.ZeroFlagBit | ProcessorStatus.NegativeFlagBit | ProcessorStatus.OverflowFlagBit
+        )
+        p |= value & (ProcessorStatus.NegativeFlagBit | ProcessorStatus.OverflowFlagBit)
+        p |= ((self.a[lanes] & value) == 0) * ProcessorStatus.ZeroFlagBit
+        self.p[lanes] = p
+
+    def ins_adc(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.__add_with_carry(lanes, self.read_byte(lanes, address), ADC_TABLE)
+
+    def ins_sbc(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.__add_with_carry(lanes, self.read_byte(lanes, address), SBC_TABLE)
+
+    def ins_cmp(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.__register_compare(lanes, self.read_byte(lanes, address), self.a[lanes])
+
+    def ins_cpx(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.__register_compare(lanes, self.read_byte(lanes, address), self.x[lanes])
+
+    def ins_cpy(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.__register_compare(lanes, self.read_byte(lanes, address), self.y[lanes])
+
+    def ins_asl(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.write_byte(lanes, address, self.__arithmetic_shift_left(lanes, self.read_byte(lanes, address)))
+
+    def ins_lsr(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.write_byte(lanes, address, self.__logical_shift_right(lanes, self.read_byte(lanes, address)))
+
+    def ins_rol(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.write_byte(lanes, address, self.__rotate_left(lanes, self.read_byte(lanes, address)))
+
+    def ins_ror(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.write_byte(lanes, address, self.__rotate_right(lanes, self.read_byte(lanes, address)))
+
+    def ins_inc(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.__step_at(lanes, address, 1)
+
+    def ins_dec(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.__step_at(lanes, address, -1)
+
+    def ins_jmp(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.pc[lanes] = address
+
+    def ins_jsr(self, lanes: Lanes, address: np.ndarray) -> None:
+        self.push_word_onto_stack(lanes, (self.pc[lanes].astype(np.int32) - 1) & 0xFFFF)
+        self.pc[lanes] = address
+        self.cycles[lanes] -= 1
+
+    # Instructions which have no operand or fetch their own (branches)
+
+    def ins_asl_accumulator(self, lanes: Lanes) -> None:
+        self.a[lanes] = self.__arithmetic_shift_left(lanes, self.a[lanes].astype(np.int32))
+
+    def ins_lsr_accumulator(self, lanes: Lanes) -> None:
+        self.a[lanes] = self.__logical_shift_right(lanes, self.a[lanes].astype(np.int32))
+
+    def ins_rol_accumulator(self, lanes: Lanes) -> None:
+        self.a[lanes] = self.__rotate_left(lanes, self.a[lanes].astype(np.int32))
+
+    def ins_ror_accumulator(self, lanes: Lanes) -> None:
+        self.a[lanes] = self.__rotate_right(lanes, self.a[lanes].astype(np.int32))
+
+    def ins_rts(self, lanes: Lanes) -> None:
+        self.pc[lanes] = (self.pop_word_from_stack(lanes) + 1) & 0xFFFF
+        self.cycles[lanes] -= 2
+
+    def ins_tsx(self, lanes: Lanes) -> None:
+        self.__transfer(lanes, self.sp[lanes], self.x)
+
+    def ins_txs(self, lanes: Lanes) -> None:
+        self.sp[lanes] = self.x[lanes]
+        self.cycles[lanes] -= 1
+
+    def ins_pha(self, lanes: Lanes) -> None:
+        self.push_byte_onto_stack(lanes, self.a[lanes])
+
+    def ins_pla(self, lanes: Lanes) -> None:
+        self.a[lanes] = value = self.pop_byte_from_stack(lanes)
+        self.set_zero_and_negative_flags(lanes, value)
+        self.cycles[lanes] -= 1
+
+    def ins_php(self, lanes: Lanes) -> None:
+        self.push_byte_onto_stack(lanes, self.p[lanes] | STATUS_PUSHED)
+
+    def ins_plp(self, lanes: Lanes) -> None:
+        self.p[lanes] = self.pop_byte_from_stack(lanes) & (0xFF & ~STATUS_PUSHED)
+        self.cycles[lanes] -= 1
+
+    def ins_tax(self, lanes: Lanes) -> None:
+        self.__transfer(lanes, self.a[lanes], self.x)
+
+    def ins_tay(self, lanes: Lanes) -> None:
+        self.__transfer(lanes, self.a[lanes], self.y)
+
+    def ins_txa(self, lanes: Lanes) -> None:
+        self.__transfer(lanes, self.x[lanes], self.a)
+
+    def ins_tya(self, lanes: Lanes) -> None:
+        self.__transfer(lanes, self.y[lanes], self.a)
+
+    def ins_inx(self, lanes: Lanes) -> None:
+        self.__transfer(lanes, self.x[lanes] + np.uint8(1), self.x)
+
+    def ins_iny(self, lanes: Lanes) -> None:
+        self.__transfer(lanes, self.y[lanes] + np.uint8(1), self.y)
+
+    def ins_dex(self, lanes: Lanes) -> None:
+        self.__transfer(lanes, self.x[lanes] - np.uint8(1), self.x)
+
+    def ins_dey(self, lanes: Lanes) -> None:
+        self.__transfer(lanes, self.y[lanes] - np.uint8(1), self.y)
+
+    def ins_beq(self, lanes: Lanes) -> None:
+        self.__branch_if(lanes, ProcessorStatus.ZeroFlagBit, True)
+
+    def ins_bne(self, lanes: Lanes) -> None:
+        self.__branch_if(lanes, ProcessorStatus.ZeroFlagBit, False)
+
+    def ins_bcs(self, lanes: Lanes) -> None:
+        self.__branch_if(lanes, ProcessorStatus.CarryFlagBit, True)
+
+    def ins_bcc(self, lanes: Lanes) -> None:
+        self.__branch_if(lanes, ProcessorStatus.CarryFlagBit, False)
+
+    def ins_bmi(self, lanes: Lanes) -> None:
+        self.__branch_if(lanes, ProcessorStatus.NegativeFlagBit, True)
+
+    def ins_bpl(self, lanes: Lanes) -> None:
+        self.__branch_if(lanes, ProcessorStatus.NegativeFlagBit, False)
+
+    def ins_bvc(self, lanes: Lanes) -> None:
+        self.__branch_if(lanes, ProcessorStatus.OverflowFlagBit, False)
+
+    def ins_bvs(self, lanes: Lanes) -> None:
+        self.__branch_if(lanes, ProcessorStatus.OverflowFlagBit, True)
+
+    def __set_flag(self, lanes: Lanes, bit: int, value: bool) -> None:
+        if value:
+            self.p[lanes] |= bit
+        else:
+            self.p[lanes] &= 0xFF & ~bit
+        self.cycles[lanes] -= 1
+
+    def ins_clc(self, lanes: Lanes) -> None:
+        self.__set_flag(lanes, ProcessorStatus.CarryFlagBit, False)
+
+    def ins_sec(self, lanes: Lanes) -> None:
+        self.__set_flag(lanes, ProcessorStatus.CarryFlagBit, True)
+
+    def ins_cld(self, lanes: Lanes) -> None:
+        self.__set_flag(lanes, ProcessorStatus.DecimalFlagBit, False)
+
+    def ins_sed(self, lanes: Lanes) -> None:
+        self.__set_flag(lanes, ProcessorStatus.DecimalFlagBit, True)
+
+    def ins_cli(self, lanes: Lanes) -> None:
+        self.__set_flag(lanes, ProcessorStatus.InterruptDisableFlagBit, False)
+
+    def ins_sei(self, lanes: Lanes) -> None:
+        self.__set_flag(lanes, ProcessorStatus.InterruptDisableFlagBit, True)
+
+    def ins_clv(self, lanes: Lanes) -> None:
+        self.__set_flag(lanes, ProcessorStatus.OverflowFlagBit, False)
+
+    def ins_nop(self, lanes: Lanes) -> None:
+        self.cycles[lanes] -= 1
+
+    def ins_brk(self, lanes: Lanes) -> None:
+        self.push_word_onto_stack(lanes, (self.pc[lanes].astype(np.int32) + 1) & 0xFFFF)
+        self.push_byte_onto_stack(lanes, self.p[lanes] | STATUS_PUSHED)
+        interrupt_vector = 0xFFFE
+        self.pc[lanes] = self.read_word(lanes, interrupt_vector)
+        self.p[lanes] |= ProcessorStatus.BreakFlagBit | ProcessorStatus.InterruptDisableFlagBit
+
+    def ins_rti(self, lanes: Lanes) -> None:
+        self.p[lanes] = self.pop_byte_from_stack(lanes) & (0xFF & ~STATUS_PUSHED)
+        self.pc[lanes] = self.pop_word_from_stack(lanes)
+
+
+ADC_TABLE = np.frombuffer(arithmetic.ADC_TABLE, dtype=np.uint16)
+SBC_TABLE = np.frombuffer(arithmetic.SBC_TABLE, dtype=np.uint16)
+
+BATCH_ADDRESSING_MODES = {
+    "IM": BatchCPU.address_immediate,
+    "ZP": BatchCPU.address_zero_page,
+    "ZPX": BatchCPU.address_zero_page_x_offset,
+    "ZPY": BatchCPU.address_zero_page_y_offset,
+    "ABS": BatchCPU.address_absolute,
+    "ABSX": BatchCPU.address_absolute_x_offset,
+    "ABSY": BatchCPU.address_absolute_y_offset,
+    "IND": BatchCPU.address_indirect,
+    "INDX": BatchCPU.address_indirect_x_offset,
+    "INDY": BatchCPU.address_indirect_y_offset,
+}
+
+BATCH_ALWAYS_INDEXED_ADDRESSING_MODES = {
+    **BATCH_ADDRESSING_MODES,
+    "ABSX": BatchCPU.address_absolute_x_offset_5,
+    "ABSY": BatchCPU.address_absolute_y_offset_5,
+    "INDY": BatchCPU.address_indirect_y_offset_6,
+}
+
+
+def _with_addressing_mode(operation: Callable, addressing_mode: Callable) -> BatchInstruction:
+    """Binds an operation to the addressing mode that works out its effective addresses"""
+
+    def instruction(batch: BatchCPU, lanes: Lanes) -> None:
+        operation(batch, lanes, addressing_mode(batch, lanes))
+
+    return instruction
+
+
+def _not_implemented(opcode: Byte) -> BatchInstruction:
+    def instruction(batch: BatchCPU, lanes: Lanes) -> None:
+        raise NotImplementedError(f"Instruction {opcode} not handled")
+
+    return instruction
+
+
+def build_batch_instruction_table() -> List[BatchInstruction]:
+    """Builds the 256 entry dispatch table of vectorised instructions, the same way as build_instruction_table"""
+    instructions = [_not_implemented(Byte(opcode)) for opcode in range(0x100)]
+    for opcode, mnemonic, mode in opcode_names():
+        if mode == "A":
+            instruction = getattr(BatchCPU, f"ins_{mnemonic.lower()}_accumulator")
+        elif mode is not None:
+            addressing_modes = (
+                BATCH_ALWAYS_INDEXED_ADDRESSING_MODES
+                if mnemonic in ALWAYS_INDEXED_MNEMONICS
+                else BATCH_ADDRESSING_MODES
+            )
+            operation = getattr(BatchCPU, f"ins_{mnemonic.lower()}")
+            instruction = _with_addressing_mode(operation, addressing_modes[mode])
+        else:
+            instruction = getattr(BatchCPU, f"ins_{mnemonic.lower()}")
+        instructions[opcode] = instruction
+    return instructions
+
+
+BatchCPU.instructions = build_batch_instruction_table()
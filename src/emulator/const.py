@@ -1,29 +1,79 @@
-from dataclasses import dataclass
-
 from .c_types import Byte
 
 
-@dataclass
-class StatusFlags(object):
-    C: Byte = Byte(1)  # 0: Carry Flag
-    Z: Byte = Byte(1)  # 1: Zero Flag
-    I: Byte = Byte(1)  # 2: Interrupt disable
-    D: Byte = Byte(1)  # 3: Decimal mode
-    B: Byte = Byte(1)  # 4: Break
-    U: Byte = Byte(1)  # 5: Unused
-    V: Byte = Byte(1)  # 6: Overflow
-    N: Byte = Byte(1)  # 7: Negative
-
-
 class ProcessorStatus(object):
     NegativeFlagBit: bin = 0b10000000
     OverflowFlagBit: bin = 0b01000000
     BreakFlagBit: bin = 0b000010000
     UnusedFlagBit: bin = 0b000100000
+    DecimalFlagBit: bin = 0b00001000
     InterruptDisableFlagBit: bin = 0b000000100
+    ZeroFlagBit: bin = 0b00000010
+    CarryFlagBit: bin = 0b00000001
     ZeroBit: bin = 0b00000001
 
 
+# The Zero and Negative flag bits for every byte value, so setting them is one lookup and merge
+ZERO_AND_NEGATIVE_FLAGS = [
+    (ProcessorStatus.ZeroFlagBit if value == 0 else 0) | (value & ProcessorStatus.NegativeFlagBit)
+    for value in range(0x100)
+]
+NOT_ZERO_AND_NEGATIVE_FLAGS = ~(ProcessorStatus.ZeroFlagBit | ProcessorStatus.NegativeFlagBit)
+
+
+class StopReason(object):
+    """Why CPU.run stopped, see Stop"""
+
+    CYCLES: int = 0  # The cycles asked for were used
+    INSTRUCTIONS: int = 1  # The number of instructions asked for were run
+    PC: int = 2  # The program counter reached the address asked for
+    TRAP: int = 3  # An instruction jumped or branched to itself (JMP *, BNE *), as test ROMs do to stop
+    BREAKPOINT: int = 4  # The program counter reached one of CPU.breakpoints
+    WATCHPOINT: int = 5  # An instruction read or wrote a watched address, see Memory.watch_hits
+
+
+class Undocumented(object):
+    """What the CPU does with the NMOS 6502's undocumented opcodes (UndocumentedOpCodes)"""
+
+    TRAP: int = 0  # Raise NotImplementedError, as for an opcode the CPU does not know
+    IMPLEMENT: int = 1  # Run them as an NMOS 6502 does
+    NOP: int = 2  # Skip them, taking the cycles they take but changing nothing
+
+
+class FlagBit(object):
+    """One bit of the packed processor status register, reads as 0/1 and can be set from any truthy value"""
+
+    def __init__(self, bit: int):
+        self.bit = bit
+
+    def __get__(self, flags: "StatusFlags", owner: type = None) -> int:
+        if flags is None:
+            return self
+        return int(bool(flags.cpu.p & self.bit))
+
+    def __set__(self, flags: "StatusFlags", value: object) -> None:
+        if value:
+            flags.cpu.p |= self.bit
+        else:
+            flags.cpu.p &= ~self.bit
+
+
+class StatusFlags(object):
+    """Named access to the flags in a CPU's processor status register (cpu.p)"""
+
+    C = FlagBit(ProcessorStatus.CarryFlagBit)  # 0: Carry Flag
+    Z = FlagBit(ProcessorStatus.ZeroFlagBit)  # 1: Zero Flag
+    I = FlagBit(ProcessorStatus.InterruptDisableFlagBit)  # 2: Interrupt disable
+    D = FlagBit(ProcessorStatus.DecimalFlagBit)  # 3: Decimal mode
+    B = FlagBit(ProcessorStatus.BreakFlagBit)  # 4: Break
+    U = FlagBit(ProcessorStatus.UnusedFlagBit)  # 5: Unused
+    V = FlagBit(ProcessorStatus.OverflowFlagBit)  # 6: Overflow
+    N = FlagBit(ProcessorStatus.NegativeFlagBit)  # 7: Negative
+
+    def __init__(self, cpu: object):
+        self.cpu = cpu
+
+
 class OpCodes(object):
     # LDA
     INS_LDA_IM = Byte(0xA9)
@@ -215,3 +265,130 @@ class OpCodes(object):
     INS_NOP = Byte(0xEA)
     INS_BRK = Byte(0x00)
     INS_RTI = Byte(0x40)
+
+
+class UndocumentedOpCodes(object):
+    """The NMOS 6502's undocumented opcodes, named like OpCodes
+
+    Where one mnemonic and addressing mode has several opcodes each name ends with its own opcode
+    in hex, which opcode_names ignores. NOP, DOP (a NOP with a one byte operand) and TOP (with two)
+    read their operand and do nothing else, JAM stops the CPU.
+    """
+
+    # SLO, ASL then ORA
+    INS_SLO_ZP = Byte(0x07)
+    INS_SLO_ZPX = Byte(0x17)
+    INS_SLO_ABS = Byte(0x0F)
+    INS_SLO_ABSX = Byte(0x1F)
+    INS_SLO_ABSY = Byte(0x1B)
+    INS_SLO_INDX = Byte(0x03)
+    INS_SLO_INDY = Byte(0x13)
+    # RLA, ROL then AND
+    INS_RLA_ZP = Byte(0x27)
+    INS_RLA_ZPX = Byte(0x37)
+    INS_RLA_ABS = Byte(0x2F)
+    INS_RLA_ABSX = Byte(0x3F)
+    INS_RLA_ABSY = Byte(0x3B)
+    INS_RLA_INDX = Byte(0x23)
+    INS_RLA_INDY = Byte(0x33)
+    # SRE, LSR then EOR
+    INS_SRE_ZP = Byte(0x47)
+    INS_SRE_ZPX = Byte(0x57)
+    INS_SRE_ABS = Byte(0x4F)
+    INS_SRE_ABSX = Byte(0x5F)
+    INS_SRE_ABSY = Byte(0x5B)
+    INS_SRE_INDX = Byte(0x43)
+    INS_SRE_INDY = Byte(0x53)
+    # RRA, ROR then ADC
+    INS_RRA_ZP = Byte(0x67)
+    INS_RRA_ZPX = Byte(0x77)
+    INS_RRA_ABS = Byte(0x6F)
+    INS_RRA_ABSX = Byte(0x7F)
+    INS_RRA_ABSY = Byte(0x7B)
+    INS_RRA_INDX = Byte(0x63)
+    INS_RRA_INDY = Byte(0x73)
+    # DCP, DEC then CMP
+    INS_DCP_ZP = Byte(0xC7)
+    INS_DCP_ZPX = Byte(0xD7)
+    INS_DCP_ABS = Byte(0xCF)
+    INS_DCP_ABSX = Byte(0xDF)
+    INS_DCP_ABSY = Byte(0xDB)
+    INS_DCP_INDX = Byte(0xC3)
+    INS_DCP_INDY = Byte(0xD3)
+    # ISC, INC then SBC
+    INS_ISC_ZP = Byte(0xE7)
+    INS_ISC_ZPX = Byte(0xF7)
+    INS_ISC_ABS = Byte(0xEF)
+    INS_ISC_ABSX = Byte(0xFF)
+    INS_ISC_ABSY = Byte(0xFB)
+    INS_ISC_INDX = Byte(0xE3)
+    INS_ISC_INDY = Byte(0xF3)
+    # SAX, stores A & X
+    INS_SAX_ZP = Byte(0x87)
+    INS_SAX_ZPY = Byte(0x97)
+    INS_SAX_ABS = Byte(0x8F)
+    INS_SAX_INDX = Byte(0x83)
+    # LAX, LDA and LDX at once
+    INS_LAX_ZP = Byte(0xA7)
+    INS_LAX_ZPY = Byte(0xB7)
+    INS_LAX_ABS = Byte(0xAF)
+    INS_LAX_ABSY = Byte(0xBF)
+    INS_LAX_INDX = Byte(0xA3)
+    INS_LAX_INDY = Byte(0xB3)
+    # Immediate: AND then copy N to C, AND then LSR A, AND then ROR A, X = (A & X) - operand, SBC
+    INS_ANC_IM_0B = Byte(0x0B)
+    INS_ANC_IM_2B = Byte(0x2B)
+    INS_ALR_IM = Byte(0x4B)
+    INS_ARR_IM = Byte(0x6B)
+    INS_SBX_IM = Byte(0xCB)
+    INS_SBC_EB = Byte(0xEB)
+    # Unstable on real chips, see CPU.ins_ane
+    INS_ANE_IM = Byte(0x8B)
+    INS_LXA_IM = Byte(0xAB)
+    INS_LAS_ABSY = Byte(0xBB)
+    INS_TAS_ABSY = Byte(0x9B)
+    INS_SHA_ABSY = Byte(0x9F)
+    INS_SHA_INDY = Byte(0x93)
+    INS_SHX_ABSY = Byte(0x9E)
+    INS_SHY_ABSX = Byte(0x9C)
+    # NOPs
+    INS_NOP_1A = Byte(0x1A)
+    INS_NOP_3A = Byte(0x3A)
+    INS_NOP_5A = Byte(0x5A)
+    INS_NOP_7A = Byte(0x7A)
+    INS_NOP_DA = Byte(0xDA)
+    INS_NOP_FA = Byte(0xFA)
+    INS_DOP_IM_80 = Byte(0x80)
+    INS_DOP_IM_82 = Byte(0x82)
+    INS_DOP_IM_89 = Byte(0x89)
+    INS_DOP_IM_C2 = Byte(0xC2)
+    INS_DOP_IM_E2 = Byte(0xE2)
+    INS_DOP_ZP_04 = Byte(0x04)
+    INS_DOP_ZP_44 = Byte(0x44)
+    INS_DOP_ZP_64 = Byte(0x64)
+    INS_DOP_ZPX_14 = Byte(0x14)
+    INS_DOP_ZPX_34 = Byte(0x34)
+    INS_DOP_ZPX_54 = Byte(0x54)
+    INS_DOP_ZPX_74 = Byte(0x74)
+    INS_DOP_ZPX_D4 = Byte(0xD4)
+    INS_DOP_ZPX_F4 = Byte(0xF4)
+    INS_TOP_ABS = Byte(0x0C)
+    INS_TOP_ABSX_1C = Byte(0x1C)
+    INS_TOP_ABSX_3C = Byte(0x3C)
+    INS_TOP_ABSX_5C = Byte(0x5C)
+    INS_TOP_ABSX_7C = Byte(0x7C)
+    INS_TOP_ABSX_DC = Byte(0xDC)
+    INS_TOP_ABSX_FC = Byte(0xFC)
+    # JAM
+    INS_JAM_02 = Byte(0x02)
+    INS_JAM_12 = Byte(0x12)
+    INS_JAM_22 = Byte(0x22)
+    INS_JAM_32 = Byte(0x32)
+    INS_JAM_42 = Byte(0x42)
+    INS_JAM_52 = Byte(0x52)
+    INS_JAM_62 = Byte(0x62)
+    INS_JAM_72 = Byte(0x72)
+    INS_JAM_92 = Byte(0x92)
+    INS_JAM_B2 = Byte(0xB2)
+    INS_JAM_D2 = Byte(0xD2)
+    INS_JAM_F2 = Byte(0xF2)
@@ -0,0 +1,131 @@
+"""Turns machine code back into 6502 assembly
+
+OPCODES is a 256 entry table, indexed by opcode, of what each opcode is: mnemonic, addressing mode,
+length in bytes (with the opcode) and the cycles it always takes, or None for opcodes the CPU does
+not implement. It is worked out once, here, from the same decoding the translator uses, and is
+what FastCPU takes its cycle table from and what the profiler and traces name opcodes with.
+
+OPCODE_TABLES gives the table for each Undocumented policy. Under TRAP it is OPCODES, under
+IMPLEMENT and NOP the undocumented opcodes (UndocumentedOpCodes) are filled in too. The translator
+does not know those, so their cycles are taken by running each once on a scratch CPU.
+
+disassemble is a generator, so a range of memory or a whole ROM image is decoded an instruction at
+a time as it is consumed rather than built up into a list:
+
+    for instruction in disassemble(cpu.Memory.data, 0x0400, 0x0500):
+        print(instruction)
+
+Pass the CPU's policy (disassemble(..., undocumented=cpu.undocumented)) to name undocumented opcodes.
+"""
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from .const import Undocumented, UndocumentedOpCodes
+from .m6502 import CPU, opcode_names
+from .translator import DECODE, OPERAND_LENGTHS, translate_instruction
+
+
+class Opcode(NamedTuple):
+    """What an opcode is, see OPCODES"""
+
+    mnemonic: str
+    mode: Optional[str]  # An ADDRESSING_MODES key, "A", "REL" for branches or None for implied
+    length: int  # In bytes, the opcode and its operand
+    cycles: int  # Before page crossing and taken branch penalties
+
+
+def _opcode(opcode: int) -> Optional[Opcode]:
+    if opcode not in DECODE:
+        return None
+    mnemonic, mode = DECODE[opcode]
+    _, cycles, _ = translate_instruction(None, mnemonic, mode, None)
+    return Opcode(mnemonic, mode, 1 + OPERAND_LENGTHS[mode], cycles)
+
+
+OPCODES: List[Optional[Opcode]] = [_opcode(opcode) for opcode in range(0x100)]
+
+
+def _undocumented_opcodes() -> List[Optional[Opcode]]:
+    """OPCODES with the undocumented opcodes filled in"""
+    opcodes = list(OPCODES)
+    for opcode, mnemonic, mode in opcode_names(UndocumentedOpCodes):
+        # Registers and pointers all zero, so no page is crossed
+        cpu = CPU(undocumented=Undocumented.IMPLEMENT)
+        cpu.Memory.data[0:3] = bytes([opcode, 0x10, 0x00])
+        cpu.pc = 0
+        opcodes[opcode] = Opcode(mnemonic, mode, 1 + OPERAND_LENGTHS[mode], cpu.execute(1))
+    return opcodes
+
+
+# Undocumented policy -> the opcode table for a CPU with it
+_WITH_UNDOCUMENTED = _undocumented_opcodes()
+OPCODE_TABLES: Dict[int, List[Optional[Opcode]]] = {
+    Undocumented.TRAP: OPCODES,
+    Undocumented.IMPLEMENT: _WITH_UNDOCUMENTED,
+    Undocumented.NOP: _WITH_UNDOCUMENTED,
+}
+
+# How each addressing mode's operand is written, {0} being the operand or branch target
+OPERAND_FORMATS = {
+    None: "",
+    "A": "A",
+    "IM": "#${0:02X}",
+    "ZP": "${0:02X}",
+    "ZPX": "${0:02X},X",
+    "ZPY": "${0:02X},Y",
+    "ABS": "${0:04X}",
+    "ABSX": "${0:04X},X",
+    "ABSY": "${0:04X},Y",
+    "IND": "(${0:04X})",
+    "INDX": "(${0:02X},X)",
+    "INDY": "(${0:02X}),Y",
+    "REL": "${0:04X}",
+}
+
+
+class Instruction(NamedTuple):
+    """One disassembled instruction, or a .byte for an opcode with no instruction"""
+
+    address: int
+    data: bytes
+    mnemonic: str
+    operand: str
+
+    def __str__(self) -> str:
+        text = f"{self.mnemonic} {self.operand}".rstrip()
+        return f"${self.address:04X}  {self.data.hex(' ').upper():<8}  {text}"
+
+
+def format_operand(opcode: Opcode, address: int, operand: int) -> str:
+    """Writes the operand of the opcode at the address the way an assembler would take it"""
+    if opcode.mode == "REL":
+        offset = operand - 0x100 if operand & 0x80 else operand
+        operand = (address + opcode.length + offset) & 0xFFFF
+    return OPERAND_FORMATS[opcode.mode].format(operand)
+
+
+def disassemble(
+    data: bytes, start: int = 0, end: Optional[int] = None, origin: int = 0, undocumented: int = Undocumented.TRAP,
+) -> Iterator[Instruction]:
+    """Yields the instructions from start up to end (offsets into data), addressed as if data were at origin
+
+    Use origin for a ROM image loaded somewhere other than address 0. A byte which is not an opcode
+    (under the undocumented policy), or an instruction cut short by end, is given as a .byte.
+    """
+    end = len(data) if end is None else min(end, len(data))
+    opcodes = OPCODE_TABLES[undocumented]
+    offset = start
+    while offset < end:
+        address = (origin + offset) & 0xFFFF
+        opcode = opcodes[data[offset]]
+        if opcode is None or offset + opcode.length > end:
+            yield Instruction(address, bytes(data[offset : offset + 1]), ".byte", f"${data[offset]:02X}")
+            offset += 1
+            continue
+        operand = int.from_bytes(data[offset + 1 : offset + opcode.length], "little")
+        yield Instruction(
+            address,
+            bytes(data[offset : offset + opcode.length]),
+            opcode.mnemonic,
+            format_operand(opcode, address, operand),
+        )
+        offset += opcode.length
@@ -0,0 +1,155 @@
+"""Runs many jobs against the same ROM across a pool of processes
+
+run_jobs lays the ROM out in a 64 KiB memory image, puts the image in a
+multiprocessing.shared_memory block and hands the jobs out to a ProcessPoolExecutor. Each worker
+attaches to the image once, and for every job copies it into a fresh CPU's memory, writes the
+job's inputs over it, sets the registers and runs for the job's cycles. Results are yielded as the
+jobs finish, so they do not come back in the order the jobs were given (JobResult.index says which
+job a result is for).
+
+Only a bounded number of jobs are handed to the pool at a time, so jobs can be a generator of any
+length.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .const import Undocumented
+from .m6502 import CPU, Memory
+from .translator import Translator
+
+MEMORY_SIZE = 0x10000
+
+# How many jobs to keep queued per worker process
+JOBS_IN_FLIGHT_PER_WORKER = 4
+
+REGISTERS = ("a", "x", "y", "sp", "p", "pc")
+
+
+class Job(NamedTuple):
+    """One run of the ROM
+
+    inputs are (address, bytes) written over the ROM image before running, registers the CPU registers
+    (a, x, y, sp, p, pc) to start with, and read the (address, length) memory ranges to send back.
+    """
+
+    inputs: Sequence[Tuple[int, bytes]] = ()
+    registers: Optional[Dict[str, int]] = None
+    cycles: int = 100_000
+    read: Sequence[Tuple[int, int]] = ()
+
+
+class JobResult(NamedTuple):
+    """What a job finished with, error is the exception's message if the job raised one"""
+
+    index: int
+    registers: Dict[str, int]
+    cycles: int
+    memory: Tuple[bytes, ...]
+    error: Optional[str] = None
+
+
+def memory_image(rom: bytes, load_address: int) -> bytearray:
+    """Returns 64 KiB of memory with the ROM at the load address"""
+    if not 0 <= load_address <= load_address + len(rom) <= MEMORY_SIZE:
+        raise ValueError(f"A {len(rom):#x} byte ROM at {load_address:#06x} does not fit in memory")
+    image = bytearray(MEMORY_SIZE)
+    image[load_address : load_address + len(rom)] = rom
+    return image
+
+
+def run_job(
+    image: memoryview,
+    index: int,
+    job: Job,
+    start_address: int,
+    translate: bool = True,
+    undocumented: int = Undocumented.TRAP,
+) -> JobResult:
+    """Runs the job on a CPU whose memory starts as a copy of the image, see Undocumented for the policy
+
+    A job which can not be set up (bad inputs or registers) or raises while running comes back with
+    the exception on JobResult.error, so it does not stop the other jobs.
+    """
+    cpu = CPU(Memory(checked=False), undocumented)
+    cpu.Memory.data[:] = image
+    cpu.pc = start_address
+    # So a job failing before it runs reports no cycles used
+    cpu.cycles = job.cycles
+
+    error = None
+    try:
+        for address, data in job.inputs:
+            if not 0 <= address <= address + len(data) <= MEMORY_SIZE:
+                raise ValueError(f"{len(data):#x} bytes at {address:#06x} do not fit in memory")
+            cpu.Memory.data[address : address + len(data)] = data
+        for register, value in (job.registers or {}).items():
+            if register not in REGISTERS:
+                raise ValueError(f"Unknown register {register}")
+            setattr(cpu, register, value & (0xFFFF if register == "pc" else 0xFF))
+        cycles = Translator(cpu).execute(job.cycles) if translate else cpu.execute(job.cycles)
+    except Exception as exception:
+        cycles = job.cycles - cpu.cycles
+        error = f"{type(exception).__name__}: {exception}"
+    return JobResult(
+        index,
+        {register: getattr(cpu, register) for register in REGISTERS},
+        cycles,
+        tuple(bytes(cpu.Memory.data[address : address + length]) for address, length in job.read),
+        error,
+    )
+
+
+# The ROM image in each worker process, see _attach_image
+_image: Optional[shared_memory.SharedMemory] = None
+
+
+def _attach_image(name: str) -> None:
+    global _image
+    # The pool's workers share run_jobs' resource tracker, which already has the block registered,
+    # so attaching here does not leave it to be cleaned up twice
+    _image = shared_memory.SharedMemory(name=name)
+
+
+def _run_job_in_worker(index: int, job: Job, start_address: int, translate: bool, undocumented: int) -> JobResult:
+    return run_job(_image.buf[:MEMORY_SIZE], index, job, start_address, translate, undocumented)
+
+
+def run_jobs(
+    rom: bytes,
+    jobs: Iterable[Job],
+    load_address: int = 0,
+    start_address: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    translate: bool = True,
+    undocumented: int = Undocumented.TRAP,
+) -> Iterator[JobResult]:
+    """Runs each job on its own CPU over a process pool, yielding the results as they finish
+
+    The ROM is loaded at load_address, and every job starts running at start_address (the load
+    address if not given) unless its registers set pc. max_workers defaults to the number of CPUs.
+    undocumented is the CPUs' Undocumented policy, pass Undocumented.IMPLEMENT or NOP so jobs
+    hitting undocumented opcodes carry on rather than stopping with an error.
+    """
+    start_address = load_address if start_address is None else start_address
+    image = memory_image(rom, load_address)
+    shared = shared_memory.SharedMemory(create=True, size=MEMORY_SIZE)
+    try:
+        shared.buf[:MEMORY_SIZE] = image
+        with ProcessPoolExecutor(max_workers, initializer=_attach_image, initargs=(shared.name,)) as pool:
+            jobs_in_flight = JOBS_IN_FLIGHT_PER_WORKER * (max_workers or os.cpu_count() or 1)
+            pending: Set[Future] = set()
+            for index, job in enumerate(jobs):
+                pending.add(pool.submit(_run_job_in_worker, index, job, start_address, translate, undocumented))
+                if len(pending) >= jobs_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        shared.close()
+        shared.unlink()
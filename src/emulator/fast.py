@@ -0,0 +1,145 @@
+"""A faster way to interpret, charging each instruction's cycles from a table
+
+CPU counts cycles as it goes, with fetch_byte, read_byte, write_byte and the instructions each
+taking their own from self.cycles, so the count is right whichever access an instruction stops at
+("bus accurate"). FastCPU runs the same instructions but charges the cycles an opcode always takes
+(BASE_CYCLES) in one go, and adds the page crossing and taken branch penalties explicitly, keeping
+the count in a local rather than on the CPU.
+
+Its dispatch table is generated from the translator's instruction templates (see
+emulator/translator.py), one flat function per opcode which fetches its own operand and holds the
+registers it uses in locals, and the cycles come from the decode table in
+emulator/disassembler.py. Opcodes the translator does not know are run by the CPU's own
+instructions. Between calls to execute a FastCPU is in the same state a CPU would be.
+"""
+import re
+from typing import Callable, List, Optional
+
+from .c_types import s32
+from .const import StopReason
+from .disassembler import OPCODES
+from .m6502 import CPU, UNLIMITED_CYCLES, Stop, run_instrumented
+from .translator import BLOCK_GLOBALS, translate_instruction
+
+FastInstruction = Callable[[CPU, Callable, Callable, int], int]
+
+REGISTERS = ("a", "x", "y", "p", "sp")
+
+
+# Opcode -> cycles it always takes, before page crossing and taken branch penalties
+BASE_CYCLES: List[Optional[int]] = [None if opcode is None else opcode.cycles for opcode in OPCODES]
+
+
+def _fetch_operand(length: int) -> List[str]:
+    if length == 1:
+        return ["operand = read(pc)", "pc = (pc + 1) & 0xFFFF"]
+    if length == 2:
+        return ["operand = read(pc) | read((pc + 1) & 0xFFFF) << 8", "pc = (pc + 2) & 0xFFFF"]
+    return []
+
+
+def _names(registers: List[str], prefix: str = "") -> str:
+    return ", ".join(prefix + register for register in registers)
+
+
+def fast_instruction_source(opcode: int) -> str:
+    """The source of the opcode's function, which takes (cpu, read, write, cycles) and returns the cycles left"""
+    mnemonic, mode, length, cycles = OPCODES[opcode]
+    statements, _, _ = translate_instruction(None, mnemonic, mode, None)
+    body = _fetch_operand(length - 1) + statements
+    source = "\n".join(statements)
+    used = [register for register in REGISTERS if re.search(rf"\b{register}\b", source)]
+    assigned = [register for register in used if re.search(rf"^\s*{register} (?:[&|^]|>>)?= ", source, re.MULTILINE)]
+    return "\n".join(
+        [
+            f"def op_{opcode:02X}(cpu, read, write, cycles):",
+            f"    # {mnemonic} {mode or ''}".rstrip(),
+            "    pc = (cpu.pc + 1) & 0xFFFF",
+            f"    cycles -= {cycles}",
+            *([f"    {_names(used)} = {_names(used, 'cpu.')}"] if used else []),
+            *(f"    {statement}" for statement in body),
+            *([f"    {_names(assigned, 'cpu.')} = {_names(assigned)}"] if assigned else []),
+            "    cpu.pc = pc",
+            "    return cycles",
+        ]
+    )
+
+
+def _interpreted(cpu: CPU, read: Callable, write: Callable, cycles: int) -> int:
+    """Runs an opcode FastCPU has no function for with the CPU's own instructions"""
+    cpu.cycles = cycles
+    cpu.instructions[cpu.fetch_byte()](cpu)
+    return cpu.cycles
+
+
+def build_fast_instruction_table() -> List[FastInstruction]:
+    """Builds the 256 entry dispatch table for FastCPU, indexed by opcode"""
+    instructions: List[FastInstruction] = [_interpreted] * 0x100
+    for opcode in (opcode for opcode in range(0x100) if OPCODES[opcode] is not None):
+        namespace = dict(BLOCK_GLOBALS)
+        exec(compile(fast_instruction_source(opcode), f"<6502 opcode ${opcode:02X}>", "exec"), namespace)
+        instructions[opcode] = namespace[f"op_{opcode:02X}"]
+    return instructions
+
+
+class FastCPU(CPU):
+    """A CPU whose execute charges cycles from BASE_CYCLES a whole instruction at a time
+
+    execute uses the same cycles as CPU.execute, only the order the cycles are counted in within an
+    instruction differs. Use CPU where something needs to see cycles part way through an instruction.
+    """
+
+    fast_instructions = build_fast_instruction_table()
+
+    def execute(self, cycles: s32) -> s32:
+        """Runs instructions until the requested cycles are used, returns the number of cycles that were used"""
+        memory = self.Memory
+        read, write = memory.read, memory.write
+        instructions = self.fast_instructions
+        remaining = cycles
+        while remaining > 0:
+            remaining = instructions[read(self.pc)](self, read, write, remaining)
+        self.cycles = remaining
+        return cycles - remaining
+
+    def step(self) -> None:
+        """Runs one instruction"""
+        read = self.Memory.read
+        self.cycles = self.fast_instructions[read(self.pc)](self, read, self.Memory.write, self.cycles)
+
+    def run(
+        self,
+        cycles: Optional[int] = None,
+        instructions: Optional[int] = None,
+        until_pc: Optional[int] = None,
+        trap: bool = False,
+    ) -> Stop:
+        """Runs instructions until the first of the limits given is reached, see CPU.run"""
+        budget = UNLIMITED_CYCLES if cycles is None else cycles
+        limit = -1 if instructions is None else instructions
+        stop_pc = -1 if until_pc is None else until_pc
+        memory = self.Memory
+        if self.breakpoints or memory.watchpoints:
+            return run_instrumented(self, budget, limit, stop_pc, trap)
+        read, write = memory.read, memory.write
+        table = self.fast_instructions
+        remaining = budget
+        count = 0
+        while True:
+            if count == limit:
+                reason = StopReason.INSTRUCTIONS
+                break
+            if remaining <= 0:
+                reason = StopReason.CYCLES
+                break
+            pc = self.pc
+            remaining = table[read(pc)](self, read, write, remaining)
+            count += 1
+            if self.pc == stop_pc:
+                reason = StopReason.PC
+                break
+            if trap and self.pc == pc:
+                reason = StopReason.TRAP
+                break
+        self.cycles = remaining
+        return Stop(reason, count, budget - remaining)
@@ -0,0 +1,89 @@
+"""Loads programs from files straight into Memory
+
+load_binary reads a raw image from disk into memory in one go (readinto a slice of Memory.view),
+load_prg does the same for a PRG file, whose first two bytes are the little endian load address as
+with CPU.load_program, and load_intel_hex copies each data record of an Intel HEX file with a
+single slice assignment. None of them go byte by byte through Memory.write, so they also fill ROM
+pages (see Memory.map_rom). Pages of translated code they cover are reported as written.
+"""
+import os
+from typing import Iterator, Optional, Tuple, Union
+
+from .m6502 import Memory
+
+Path = Union[str, "os.PathLike[str]"]
+
+# Intel HEX record types
+DATA = 0x00
+END_OF_FILE = 0x01
+EXTENDED_SEGMENT_ADDRESS = 0x02
+START_SEGMENT_ADDRESS = 0x03
+EXTENDED_LINEAR_ADDRESS = 0x04
+START_LINEAR_ADDRESS = 0x05
+
+
+def _read_into(memory: Memory, address: int, file, length: int) -> None:
+    """Reads length bytes from the file into memory at the address"""
+    if not 0 <= address <= address + length <= memory.max_memory:
+        raise ValueError(f"{length:#x} bytes at {address:#06x} do not fit in memory")
+    if file.readinto(memory.view[address : address + length]) != length:
+        raise ValueError(f"{file.name} is shorter than {length:#x} bytes")
+    memory.report_writes(address, length)
+
+
+def load_binary(memory: Memory, path: Path, address: int = 0) -> int:
+    """Loads a raw binary file into memory at the address, returns the number of bytes loaded"""
+    with open(path, "rb") as file:
+        length = os.fstat(file.fileno()).st_size
+        _read_into(memory, address, file, length)
+    return length
+
+
+def load_prg(memory: Memory, path: Path) -> int:
+    """Loads a PRG file (a two byte little endian load address then the program), returns the load address"""
+    with open(path, "rb") as file:
+        header = file.read(2)
+        if len(header) != 2:
+            raise ValueError(f"{path} is too short to be a PRG file")
+        address = header[0] | header[1] << 8
+        _read_into(memory, address, file, os.fstat(file.fileno()).st_size - 2)
+    return address
+
+
+def intel_hex_records(path: Path) -> Iterator[Tuple[int, int, bytes]]:
+    """Yields the (record type, address, data) of each record of an Intel HEX file, checking the checksums"""
+    with open(path) as file:
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith(":"):
+                raise ValueError(f"{path}:{number}: records start with ':'")
+            record = bytes.fromhex(line[1:])
+            if len(record) < 5 or len(record) != record[0] + 5:
+                raise ValueError(f"{path}:{number}: record length does not match its byte count")
+            if sum(record) & 0xFF:
+                raise ValueError(f"{path}:{number}: bad checksum")
+            yield record[3], record[1] << 8 | record[2], record[4:-1]
+
+
+def load_intel_hex(memory: Memory, path: Path) -> Optional[int]:
+    """Loads the data records of an Intel HEX file, returns the start address record's address if there is one"""
+    base = 0
+    start = None
+    for record_type, address, data in intel_hex_records(path):
+        if record_type == DATA:
+            memory.load(base + address, data)
+        elif record_type == END_OF_FILE:
+            break
+        elif record_type == EXTENDED_SEGMENT_ADDRESS:
+            base = int.from_bytes(data, "big") << 4
+        elif record_type == EXTENDED_LINEAR_ADDRESS:
+            base = int.from_bytes(data, "big") << 16
+        elif record_type == START_SEGMENT_ADDRESS:
+            start = ((data[0] << 8 | data[1]) << 4) + (data[2] << 8 | data[3])
+        elif record_type == START_LINEAR_ADDRESS:
+            start = int.from_bytes(data, "big")
+        else:
+            raise ValueError(f"{path}: unknown record type {record_type:#04x}")
+    return start
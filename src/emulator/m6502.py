@@ -1,1068 +1,1447 @@
-from typing import List
+import weakref
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
-from .c_types import Byte, SByte, Word, s32, u32
-from .const import OpCodes, ProcessorStatus, StatusFlags
-from .utils import switch
+from . import arithmetic
+from .arithmetic import ARITHMETIC_FLAGS
+from .c_types import Byte, Word, s32, u32
+from .const import (
+    NOT_ZERO_AND_NEGATIVE_FLAGS,
+    ZERO_AND_NEGATIVE_FLAGS,
+    OpCodes,
+    ProcessorStatus,
+    StatusFlags,
+    StopReason,
+    Undocumented,
+    UndocumentedOpCodes,
+)
+
+Instruction = Callable[["CPU"], None]
+
+
+class Device(object):
+    """Something on the bus, such as a video chip or a serial port, see Memory.map_device
+
+    read and write get the full 16 bit address, so one device can cover several pages and work out
+    which of its registers is meant.
+    """
+
+    def read(self, address: int) -> int:
+        """Returns the byte (0-255) the device puts on the bus for a read of the address"""
+        raise NotImplementedError
+
+    def write(self, address: int, value: int) -> None:
+        """Handles a write of the byte (0-255) to the address"""
+        raise NotImplementedError
+
+
+WATCH_READ = 1
+WATCH_WRITE = 2
+
+
+class WatchHit(NamedTuple):
+    """A read or write of a watched address, see Memory.add_watchpoint"""
+
+    address: int
+    value: int
+    write: bool
 
 
 class Memory(object):
-    def __init__(self):
+    """64 KiB of memory held in a single bytearray
+
+    read/write work with plain ints and are what the CPU uses. Indexing (memory[address]) is kept
+    for compatibility and returns a Byte. When checked is False, read/write are the bytearray's own
+    methods so there are no bounds asserts or Python calls on the hot path.
+
+    Writes can be watched a page at a time, which is how caches of decoded code (see
+    emulator/translator.py) and CPU.restore find out what changed. watched_pages holds a byte per
+    256 byte page, non zero if a write to the page should be reported. A write to a watched page
+    clears its mark, adds it to dirty_pages (if tracking) and calls each of the write_watchers with
+    (address, length). Watchers which want to hear about later writes mark the page again with
+    watch_pages. Writes to other pages only pay for the one watched_pages lookup. Writing to data
+    directly bypasses all of this.
+
+    Memory is also the bus. read_handlers and write_handlers are a page table with an entry per
+    page, None for plain RAM (the page's slice of data) or the function to call instead. They are
+    filled in by map_device, map_rom and map_mirror, whole pages at a time. Until something is
+    mapped read/write do not look at them at all; once it is, plain RAM pages pay for one list
+    lookup and only the mapped pages for a call. Mappings are remembered in regions so reset and
+    fork can rebuild them on a new Memory (map_like). Devices are shared rather than copied, and
+    their state is not part of a CPU.snapshot.
+
+    Watchpoints use the same page table: add_watchpoint wraps the entries of just the pages the
+    watched addresses are on, so accesses to other pages cost no more than before. Each read or
+    write of a watched address is added to watch_hits, which CPU.run stops for.
+    """
+
+    def __init__(self, checked: bool = True):
         self.max_memory = 1024 * 64
-        self.data = [Byte(0)] * self.max_memory
+        self.data = bytearray(self.max_memory)
+        self.view = memoryview(self.data)
+        self.checked = checked
+        self.watched_pages = bytearray(self.max_memory >> 8)
+        self.write_watchers: List[Callable[[int, int], None]] = []
+        # Pages written to since track_dirty_pages, None if not tracking
+        self.dirty_pages: Optional[Set[int]] = None
+        self.watching = False
+        self.read_handlers: List[Optional[Callable[[int], int]]] = [None] * (self.max_memory >> 8)
+        self.write_handlers: List[Optional[Callable[[int, int], None]]] = [None] * (self.max_memory >> 8)
+        # (address, length, kind, what) for each map_* call, kind being "device", "rom" or "mirror"
+        self.regions: List[Tuple[int, int, str, Any]] = []
+        # Address -> WATCH_READ and/or WATCH_WRITE
+        self.watchpoints: Dict[int, int] = {}
+        self.watch_hits: List[WatchHit] = []
+        # Page -> its (read handler, write handler) from before it had watchpoints
+        self.unwatched_handlers: Dict[int, Tuple[Optional[Callable], Optional[Callable]]] = {}
+        if not checked:
+            self.read = self.data.__getitem__
+            self.write = self.data.__setitem__
+
+    def read(self, address: int) -> int:
+        """Reads the byte at the address as a plain int"""
+        assert 0 <= address < self.max_memory
+        return self.data[address]
+
+    def write(self, address: int, value: int) -> None:
+        """Writes a plain int (0-255) to the address"""
+        assert 0 <= address < self.max_memory
+        assert 0 <= value <= 0xFF
+        self.data[address] = value
+        if self.watched_pages[address >> 8]:
+            self.page_written(address)
+
+    def __update_access(self) -> None:
+        """Picks read and write for whether anything is watched or mapped
+
+        The functions only hold a weak reference to the memory, so the memory is not part of a
+        reference cycle and is freed as soon as it is dropped (which matters when forking).
+        """
+        data = self.data
+        watched_pages = self.watched_pages
+        read_handlers = self.read_handlers
+        write_handlers = self.write_handlers
+        memory = weakref.ref(self)
+
+        if not self.regions and not self.watchpoints:
+            if self.checked:
+                # The class's read and write already look at watched_pages
+                self.__dict__.pop("read", None)
+                self.__dict__.pop("write", None)
+                return
+            self.read = data.__getitem__
+            if not self.watching:
+                self.write = data.__setitem__
+                return
+
+            def write(address: int, value: int) -> None:
+                data[address] = value
+                if watched_pages[address >> 8]:
+                    memory().page_written(address)
+
+            self.write = write
+            return
+
+        def read(address: int) -> int:
+            handler = read_handlers[address >> 8]
+            if handler is None:
+                return data[address]
+            return handler(address)
+
+        def write(address: int, value: int) -> None:
+            handler = write_handlers[address >> 8]
+            if handler is not None:
+                handler(address, value)
+                return
+            data[address] = value
+            if watched_pages[address >> 8]:
+                memory().page_written(address)
+
+        if not self.checked:
+            self.read = read
+            self.write = write
+            return
+
+        def checked_read(address: int) -> int:
+            assert 0 <= address < len(data)
+            return read(address)
+
+        def checked_write(address: int, value: int) -> None:
+            assert 0 <= address < len(data)
+            assert 0 <= value <= 0xFF
+            write(address, value)
+
+        self.read = checked_read
+        self.write = checked_write
+
+    def watch_writes(self, watcher: Callable[[int, int], None]) -> None:
+        """Calls watcher(address, length) whenever a page marked with watch_pages is written to"""
+        self.write_watchers.append(watcher)
+        self.watching = True
+        self.__update_access()
+
+    def watch_pages(self, address: int, length: int) -> None:
+        """Marks the pages the length bytes from the address are on as watched"""
+        for offset in range(0, length + (address & 0xFF), 0x100):
+            self.watched_pages[((address + offset) & 0xFFFF) >> 8] = 1
+
+    def track_dirty_pages(self) -> None:
+        """Starts recording the pages written to in dirty_pages, from none"""
+        self.dirty_pages = set()
+        self.watched_pages[:] = b"\x01" * len(self.watched_pages)
+        self.watching = True
+        self.__update_access()
+
+    def page_written(self, address: int, length: int = 1) -> None:
+        """Reports a write of length bytes from the address to a watched page"""
+        self.watched_pages[address >> 8] = 0
+        if self.dirty_pages is not None:
+            self.dirty_pages.add(address >> 8)
+        for watcher in self.write_watchers:
+            watcher(address, length)
+
+    def copy_pages(self, image: bytes, pages: Iterable[int]) -> None:
+        """Copies the pages from a 64 KiB memory image, reporting any that are watched"""
+        for page in pages:
+            address = page << 8
+            self.data[address : address + 0x100] = image[address : address + 0x100]
+            if self.watched_pages[page]:
+                self.page_written(address, 0x100)
+
+    def add_watchpoint(self, address: int, length: int = 1, read: bool = False, write: bool = True) -> None:
+        """Records reads and/or writes of the length bytes from the address in watch_hits"""
+        mode = (WATCH_READ if read else 0) | (WATCH_WRITE if write else 0)
+        for watched in range(address, address + length):
+            self.watchpoints[watched & 0xFFFF] = self.watchpoints.get(watched & 0xFFFF, 0) | mode
+            self.__watch_page(watched >> 8 & 0xFF)
+        self.__update_access()
+
+    def remove_watchpoint(self, address: int, length: int = 1) -> None:
+        """Stops watching the length bytes from the address"""
+        for watched in range(address, address + length):
+            self.watchpoints.pop(watched & 0xFFFF, None)
+        for page, (read, write) in list(self.unwatched_handlers.items()):
+            if not any(watched >> 8 == page for watched in self.watchpoints):
+                self.read_handlers[page], self.write_handlers[page] = read, write
+                del self.unwatched_handlers[page]
+        self.__update_access()
+
+    def __watch_page(self, page: int) -> None:
+        """Wraps the page's page table entries with ones which check for watchpoints"""
+        if page in self.unwatched_handlers:
+            return
+        unwatched_read, unwatched_write = self.read_handlers[page], self.write_handlers[page]
+        self.unwatched_handlers[page] = (unwatched_read, unwatched_write)
+        data = self.data
+        watched_pages = self.watched_pages
+        watchpoints = self.watchpoints
+        watch_hits = self.watch_hits
+        memory = weakref.ref(self)
+
+        def read(address: int) -> int:
+            value = data[address] if unwatched_read is None else unwatched_read(address)
+            if watchpoints.get(address, 0) & WATCH_READ:
+                watch_hits.append(WatchHit(address, value, False))
+            return value
+
+        def write(address: int, value: int) -> None:
+            if watchpoints.get(address, 0) & WATCH_WRITE:
+                watch_hits.append(WatchHit(address, value, True))
+            if unwatched_write is not None:
+                unwatched_write(address, value)
+                return
+            data[address] = value
+            if watched_pages[address >> 8]:
+                memory().page_written(address)
+
+        self.read_handlers[page] = read
+        self.write_handlers[page] = write
+
+    def load(self, address: int, image: bytes) -> None:
+        """Copies the image to the address in one slice assignment, reporting any watched pages it covers"""
+        end = address + len(image)
+        if not 0 <= address <= end <= self.max_memory:
+            raise ValueError(f"{len(image):#x} bytes at {address:#06x} do not fit in memory")
+        self.data[address:end] = image
+        self.report_writes(address, len(image))
+
+    def report_writes(self, address: int, length: int) -> None:
+        """Reports the length bytes from the address being written to data directly, for any that are watched"""
+        for page in range(address >> 8, min((address + length + 0xFF) >> 8, len(self.watched_pages))):
+            if self.watched_pages[page]:
+                self.page_written(page << 8, 0x100)
+
+    def __map(
+        self,
+        address: int,
+        length: int,
+        read: Optional[Callable[[int], int]],
+        write: Optional[Callable[[int, int], None]],
+    ) -> range:
+        """Points the page table entries for the pages from the address at read and write"""
+        if address & 0xFF or length & 0xFF or not 0 <= address < address + length <= self.max_memory:
+            raise ValueError(f"Can only map whole pages, not {length:#x} bytes at {address:#06x}")
+        pages = range(address >> 8, (address + length) >> 8)
+        for page in pages:
+            self.read_handlers[page] = read
+            self.write_handlers[page] = write
+            if self.unwatched_handlers.pop(page, None) is not None:
+                self.__watch_page(page)
+        return pages
+
+    def map_device(self, address: int, length: int, device: Device) -> None:
+        """Sends reads and writes of the pages from the address to the device"""
+        self.__map(address, length, device.read, device.write)
+        self.regions.append((address, length, "device", device))
+        self.__update_access()
+
+    def map_rom(self, address: int, image: bytes) -> None:
+        """Copies the image to the address and ignores writes to its pages, reads stay plain RAM reads"""
+        self.__map(address, len(image), None, _ignore_write)
+        self.data[address : address + len(image)] = image
+        self.regions.append((address, len(image), "rom", bytes(image)))
+        self.__update_access()
+
+    def map_mirror(self, address: int, length: int, target: int) -> None:
+        """Makes the pages from the address another view of the same length from the target"""
+        if not 0 <= target <= target + length <= len(self.data):
+            raise ValueError(f"Can not mirror {length:#x} bytes from {target:#06x}, they do not fit in memory")
+        memory = weakref.ref(self)
+        offset = target - address
+        self.__map(
+            address,
+            length,
+            lambda address: memory().read(address + offset),
+            lambda address, value: memory().write(address + offset, value),
+        )
+        self.regions.append((address, length, "mirror", target))
+        self.__update_access()
+
+    def unmap(self, address: int, length: int) -> None:
+        """Makes every mapped region overlapping the length bytes from the address plain RAM again"""
+        end = address + length
+        for region in [region for region in self.regions if region[0] < end and address < region[0] + region[1]]:
+            self.__map(region[0], region[1], None, None)
+            self.regions.remove(region)
+        self.__update_access()
+
+    def map_like(self, memory: "Memory") -> None:
+        """Maps the same devices, ROMs and mirrors as the other memory"""
+        for address, length, kind, what in memory.regions:
+            if kind == "device":
+                self.map_device(address, length, what)
+            elif kind == "rom":
+                self.map_rom(address, what)
+            else:
+                self.map_mirror(address, length, what)
 
     def __getitem__(self, address: u32) -> Byte:
-        assert 0 <= int(address) <= self.max_memory
-        return Byte(self.data[int(address)])
+        return Byte(self.read(int(address)))
+
+    def __setitem__(self, address: u32, value: Byte) -> None:
+        self.write(int(address), int(value) & 0xFF)
+
+
+def _ignore_write(address: int, value: int) -> None:
+    """The write handler for ROM pages"""
+
+
+class Snapshot(NamedTuple):
+    """A CPU's registers and memory at some point, see CPU.snapshot"""
+
+    registers: Tuple[int, int, int, int, int, int, int]  # a, x, y, sp, p, pc, cycles
+    memory: bytes
 
-    def __setitem__(self, address: u32, value: Byte) -> Byte:
-        assert 0 <= int(address) <= self.max_memory
-        self.data[int(address)] = Byte(value)
-        return self.data[address]
+
+class Stop(NamedTuple):
+    """What CPU.run stopped for (a StopReason), after how many instructions and cycles"""
+
+    reason: int
+    instructions: int
+    cycles: int
+
+
+# The cycle limit CPU.run uses when not given one, more than any run will use
+UNLIMITED_CYCLES = 1 << 62
+
+NMI_VECTOR = 0xFFFA
+IRQ_VECTOR = 0xFFFE  # Shared with BRK
+INTERRUPT_CYCLES = 7
 
 
 class CPU(object):
-    def __init__(self):
-        self.program_counter: Word = Word(0xFFFC)
-        self.stack_pointer: Byte = Byte(0xFF)
-        self.processor_status: Byte = Byte(0xFF)
+    """6502 CPU
+
+    Registers are held as plain ints (a, x, y, pc, sp) and masked with & 0xFF / & 0xFFFF so the
+    instructions never build c_types objects. A, X, Y, program_counter and stack_pointer are the
+    public view of the same registers as Byte/Word.
+
+    The flags live packed in the single processor status register p, processor_status and Flag
+    (Flag.C, Flag.Z, ...) are views onto it.
+
+    snapshot/restore/fork save and branch the whole state. Restoring the CPU's latest snapshot only
+    copies back the pages of memory written since (Memory.dirty_pages), so going back to a common
+    starting point costs the pages touched rather than 64 KiB.
+
+    undocumented (an Undocumented policy) picks what the NMOS undocumented opcodes do: raise
+    NotImplementedError (the default), run as on a real NMOS 6502, or act as NOPs. Each policy has its
+    own prebuilt dispatch table, so the choice costs nothing per instruction.
+    """
+
+    # Opcode -> instruction handler, see build_instruction_table
+    instructions: List[Instruction]
+
+    def __init__(self, memory: Optional[Memory] = None, undocumented: int = Undocumented.TRAP):
+        self.undocumented = undocumented
+        self.instructions = INSTRUCTION_TABLES[undocumented]
+        self.pc: int = 0xFFFC
+        self.sp: int = 0xFF
+        self.p: int = 0
         self.cycles: s32 = 0
 
-        self.A: Byte = Byte(0)
-        self.X: Byte = Byte(0)
-        self.Y: Byte = Byte(0)
+        self.a: int = 0
+        self.x: int = 0
+        self.y: int = 0
 
-        self.Flag: StatusFlags = StatusFlags(Byte(0), Byte(0), Byte(0), Byte(0), Byte(0), Byte(0), Byte(0), Byte(0))
-        self.Memory: Memory = Memory()
+        self.Memory: Memory = memory if memory is not None else Memory()
+        # Addresses run stops at before running the instruction there, see run
+        self.breakpoints: Set[int] = set()
+        # The snapshot Memory.dirty_pages are counted from
+        self.restore_point: Optional[Snapshot] = None
 
     def __repr__(self) -> str:
         """Makes string representation of CPU:  the registers, program counter etc"""
-        return f"A: {self.A} X: {self.X} Y: {self.Y}\nPC: {self.program_counter} SP: {self.stack_pointer}\nPS: {self.processor_status}\n"
+        return f"A: {self.a} X: {self.x} Y: {self.y}\nPC: {self.pc} SP: {self.sp}\nPS: {self.p}\n"
+
+    @property
+    def A(self) -> Byte:
+        return Byte(self.a)
+
+    @A.setter
+    def A(self, value: Byte) -> None:
+        self.a = int(value) & 0xFF
+
+    @property
+    def X(self) -> Byte:
+        return Byte(self.x)
+
+    @X.setter
+    def X(self, value: Byte) -> None:
+        self.x = int(value) & 0xFF
+
+    @property
+    def Y(self) -> Byte:
+        return Byte(self.y)
+
+    @Y.setter
+    def Y(self, value: Byte) -> None:
+        self.y = int(value) & 0xFF
+
+    @property
+    def program_counter(self) -> Word:
+        return Word(self.pc)
+
+    @program_counter.setter
+    def program_counter(self, value: Word) -> None:
+        self.pc = int(value) & 0xFFFF
+
+    @property
+    def stack_pointer(self) -> Byte:
+        return Byte(self.sp)
+
+    @stack_pointer.setter
+    def stack_pointer(self, value: Byte) -> None:
+        self.sp = int(value) & 0xFF
+
+    @property
+    def processor_status(self) -> Byte:
+        return Byte(self.p)
+
+    @processor_status.setter
+    def processor_status(self, value: Byte) -> None:
+        self.p = int(value) & 0xFF
+
+    @property
+    def Flag(self) -> StatusFlags:
+        return StatusFlags(self)
 
     def reset(self) -> None:
-        self.__init__()
+        memory = Memory(self.Memory.checked)
+        memory.map_like(self.Memory)
+        self.__init__(memory, self.undocumented)
 
     def reset_to(self, reset_vector: Word) -> None:
         self.reset()
         self.program_counter = reset_vector
 
+    def snapshot(self) -> Snapshot:
+        """Saves the registers and memory, and starts tracking the pages written so restore only copies those"""
+        snapshot = Snapshot((self.a, self.x, self.y, self.sp, self.p, self.pc, self.cycles), bytes(self.Memory.data))
+        self.Memory.track_dirty_pages()
+        self.restore_point = snapshot
+        return snapshot
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Puts the registers and memory back to the snapshot, which becomes the point dirty pages are counted from"""
+        self.a, self.x, self.y, self.sp, self.p, self.pc, self.cycles = snapshot.registers
+        memory = self.Memory
+        if snapshot is self.restore_point and memory.dirty_pages is not None:
+            pages = set(memory.dirty_pages)
+        else:
+            pages = range(len(memory.watched_pages))
+        memory.copy_pages(snapshot.memory, pages)
+        memory.track_dirty_pages()
+        self.restore_point = snapshot
+
+    def fork(self) -> "CPU":
+        """Returns a new CPU with a copy of the registers and memory, which can also restore this CPU's snapshot"""
+        memory = Memory(self.Memory.checked)
+        memory.map_like(self.Memory)
+        memory.data[:] = self.Memory.data
+        cpu = type(self)(memory, self.undocumented)
+        cpu.a, cpu.x, cpu.y = self.a, self.x, self.y
+        cpu.sp, cpu.p, cpu.pc, cpu.cycles = self.sp, self.p, self.pc, self.cycles
+        if self.Memory.dirty_pages is not None:
+            memory.track_dirty_pages()
+            memory.dirty_pages |= self.Memory.dirty_pages
+            cpu.restore_point = self.restore_point
+        return cpu
+
     @property
     def sp_to_address(self) -> Word:
-        return Word(0x100 | self.stack_pointer)
-
-    def __get_register(self, register: str) -> Byte:
-        assert register in ["A", "X", "Y"]
-        return getattr(self, register)
-
-    def __set_register(self, register: str, value: Word) -> Byte:
-        assert register in ["A", "X", "Y"]
-        return setattr(self, register, value)
+        return Word(0x100 | self.sp)
 
-    def fetch_byte(self) -> Byte:
-        data = self.Memory[self.program_counter]
-        self.program_counter += 1
+    def fetch_byte(self) -> int:
+        data = self.Memory.read(self.pc)
+        self.pc = (self.pc + 1) & 0xFFFF
         self.cycles -= 1
-        return Byte(data)
+        return data
 
-    def fetch_sbyte(self) -> SByte:
-        return SByte(self.fetch_byte())
+    def fetch_sbyte(self) -> int:
+        data = self.fetch_byte()
+        return data - 0x100 if data & 0x80 else data
 
-    def fetch_word(self) -> Word:
+    def fetch_word(self) -> int:
         # 6502 is little endian
-        data = self.Memory[self.program_counter]
-        self.program_counter += 1
+        data = self.Memory.read(self.pc)
+        self.pc = (self.pc + 1) & 0xFFFF
 
-        data |= self.Memory[self.program_counter] << 8
-        self.program_counter += 1
+        data |= self.Memory.read(self.pc) << 8
+        self.pc = (self.pc + 1) & 0xFFFF
         self.cycles -= 2
-        return Word(data)
+        return data
 
-    def read_byte(self, address: Word) -> Byte:
-        data = self.Memory[address]
+    def read_byte(self, address: int) -> int:
+        data = self.Memory.read(address)
         self.cycles -= 1
-        return Byte(data)
+        return data
 
-    def read_word(self, address: Word) -> Byte:
+    def read_word(self, address: int) -> int:
         low_byte = self.read_byte(address)
-        high_byte = self.read_byte(address + 1)
-        return Word(low_byte | (high_byte << 8))
+        high_byte = self.read_byte((address + 1) & 0xFFFF)
+        return low_byte | (high_byte << 8)
 
-    def write_byte(self, address: Word, value: Byte) -> None:
-        self.Memory[address] = value
+    def read_zero_page_word(self, zero_page_address: int) -> int:
+        """Reads a pointer from the zero page, the high byte wraps around within the zero page"""
+        low_byte = self.read_byte(zero_page_address)
+        high_byte = self.read_byte((zero_page_address + 1) & 0xFF)
+        return low_byte | (high_byte << 8)
+
+    def write_byte(self, address: int, value: int) -> None:
+        self.Memory.write(address, value)
         self.cycles -= 1
 
-    def write_word(self, address: Word, value: Word) -> None:
-        self.Memory[address] = value & 0xFF
-        self.Memory[address + 1] = value >> 8
+    def write_word(self, address: int, value: int) -> None:
+        self.Memory.write(address, value & 0xFF)
+        self.Memory.write((address + 1) & 0xFFFF, value >> 8)
         self.cycles -= 2
 
-    def push_byte_onto_stack(self, value: Byte) -> None:
-        self.Memory[self.sp_to_address] = value
+    def push_byte_onto_stack(self, value: int) -> None:
+        self.Memory.write(0x100 | self.sp, value)
         self.cycles -= 1
-        self.stack_pointer -= 1
+        self.sp = (self.sp - 1) & 0xFF
         self.cycles -= 1
 
-    def push_word_onto_stack(self, value: Word) -> None:
-        self.write_byte(address=self.sp_to_address, value=value >> 8)
-        self.stack_pointer -= 1
-        self.write_byte(address=self.sp_to_address, value=value & 0xFF)
-        self.stack_pointer -= 1
+    def push_word_onto_stack(self, value: int) -> None:
+        self.write_byte(0x100 | self.sp, value >> 8)
+        self.sp = (self.sp - 1) & 0xFF
+        self.write_byte(0x100 | self.sp, value & 0xFF)
+        self.sp = (self.sp - 1) & 0xFF
 
     def push_pc_onto_stack(self) -> None:
-        self.push_word_onto_stack(self.program_counter)
+        self.push_word_onto_stack(self.pc)
 
     def push_pc_minus_1_onto_stack(self) -> None:
-        self.push_word_onto_stack(self.program_counter - 1)
+        self.push_word_onto_stack((self.pc - 1) & 0xFFFF)
 
     def push_pc_plus_1_onto_stack(self) -> None:
-        self.push_word_onto_stack(self.program_counter + 1)
+        self.push_word_onto_stack((self.pc + 1) & 0xFFFF)
 
-    def pop_byte_from_stack(self) -> Byte:
-        self.stack_pointer += 1
+    def pop_byte_from_stack(self) -> int:
+        self.sp = (self.sp + 1) & 0xFF
         self.cycles -= 1
-        value = self.Memory[self.sp_to_address]
+        value = self.Memory.read(0x100 | self.sp)
         self.cycles -= 1
         return value
 
-    def pop_word_from_stack(self) -> Word:
-        value = self.read_word(self.sp_to_address + 1)
-        self.stack_pointer += 2
+    def pop_word_from_stack(self) -> int:
+        low_byte = self.read_byte(0x100 | ((self.sp + 1) & 0xFF))
+        high_byte = self.read_byte(0x100 | ((self.sp + 2) & 0xFF))
+        self.sp = (self.sp + 2) & 0xFF
         self.cycles -= 1
-        return Word(value)
+        return low_byte | (high_byte << 8)
+
+    def set_zero_and_negative_flags(self, value: int) -> None:
+        self.p = (self.p & NOT_ZERO_AND_NEGATIVE_FLAGS) | ZERO_AND_NEGATIVE_FLAGS[value]
 
-    def set_zero_and_negative_flags(self, register: str) -> None:
-        _register = self.__get_register(register)
-        self.Flag.Z = int(_register == 0)
-        self.Flag.N = int((_register & ProcessorStatus.NegativeFlagBit) > 0)
+    def address_immediate(self) -> int:
+        """Addressing mode - Immediate, the operand is the next byte of the program"""
+        address = self.pc
+        self.pc = (self.pc + 1) & 0xFFFF
+        return address
 
-    def address_zero_page(self) -> Word:
+    def address_zero_page(self) -> int:
         """Addressing mode - Zero page"""
         zero_page_address = self.fetch_byte()
         return zero_page_address
 
-    def address_zero_page_x_offset(self) -> Word:
+    def address_zero_page_x_offset(self) -> int:
         """Addressing mode - Zero page with X offset"""
         zero_page_address = self.fetch_byte()
-        # TODO: Need to fix zero_page_address and X, Y, A etc to 256 bit...
-        zero_page_address = zero_page_address + self.X
+        zero_page_address = (zero_page_address + self.x) & 0xFF
         self.cycles -= 1
         return zero_page_address
 
-    def address_zero_page_y_offset(self) -> Word:
+    def address_zero_page_y_offset(self) -> int:
         """Addressing mode - Zero page with Y offset"""
         zero_page_address = self.fetch_byte()
-        zero_page_address += self.Y
+        zero_page_address = (zero_page_address + self.y) & 0xFF
         self.cycles -= 1
         return zero_page_address
 
-    def address_absolute(self) -> Word:
+    def address_absolute(self) -> int:
         """Addressing mode - Absolute"""
         absolute_address = self.fetch_word()
         return absolute_address
 
-    def address_absolute_x_offset(self) -> Word:
+    def address_absolute_x_offset(self) -> int:
         """Addressing mode - Absolute with X offset"""
         absolute_address = self.fetch_word()
-        absolute_address_x = absolute_address + self.X
+        absolute_address_x = (absolute_address + self.x) & 0xFFFF
         crossed_page_boundary: bool = (absolute_address ^ absolute_address_x) >> 8
         if crossed_page_boundary:
             self.cycles -= 1
         return absolute_address_x
 
-    def address_absolute_x_offset_5(self) -> Word:
+    def address_absolute_x_offset_5(self) -> int:
         """Addressing mode - Absolute with X offset
             - Always takes a cycle for the X page boundary)
             - See "STA Absolute,X"
         """
         absolute_address = self.fetch_word()
-        absolute_address_x = absolute_address + self.X
+        absolute_address_x = (absolute_address + self.x) & 0xFFFF
         self.cycles -= 1
         return absolute_address_x
 
-    def address_absolute_y_offset(self) -> Word:
+    def address_absolute_y_offset(self) -> int:
         """Addressing mode - Absolute with Y offset"""
         absolute_address = self.fetch_word()
-        absolute_address_y = absolute_address + self.Y
+        absolute_address_y = (absolute_address + self.y) & 0xFFFF
         crossed_page_boundary: bool = (absolute_address ^ absolute_address_y) >> 8
         if crossed_page_boundary:
             self.cycles -= 1
         return absolute_address_y
 
-    def address_absolute_y_offset_5(self) -> Word:
+    def address_absolute_y_offset_5(self) -> int:
         """Addressing mode - Absolute with Y offset
             - Always takes a cycle for the Y page boundary)
             - See "STA Absolute,Y"
         """
         absolute_address = self.fetch_word()
-        absolute_address_y = absolute_address + self.Y
+        absolute_address_y = (absolute_address + self.y) & 0xFFFF
         self.cycles -= 1
         return absolute_address_y
 
-    def address_indirect_x_offset(self) -> Word:
+    def address_indirect_x_offset(self) -> int:
         """Addressing mode - Indirect X | Indexed Indirect"""
         zp_address = self.fetch_byte()
-        zp_address += self.X
+        zp_address = (zp_address + self.x) & 0xFF
         self.cycles -= 1
-        effective_address = self.read_word(zp_address)
+        effective_address = self.read_zero_page_word(zp_address)
         return effective_address
 
-    def address_indirect_y_offset(self) -> Word:
+    def address_indirect_y_offset(self) -> int:
         """Addressing mode - Indirect Y | Indirect Indexed"""
         zp_address = self.fetch_byte()
-        effective_address = self.read_word(zp_address)
-        effective_address_y = effective_address + self.Y
+        effective_address = self.read_zero_page_word(zp_address)
+        effective_address_y = (effective_address + self.y) & 0xFFFF
         crossed_page_boundary: bool = (effective_address ^ effective_address_y) >> 8
         if crossed_page_boundary:
             self.cycles -= 1
         return effective_address_y
 
-    def address_indirect_x_offset_6(self) -> Word:
+    def address_indirect_x_offset_6(self) -> int:
         """Addressing mode - Indirect Y | Indirect Indexed
             - Always takes a cycle for the Y page boundary)
             -See "STA (Indirect,Y)"
         """
         zp_address = self.fetch_byte()
-        effective_address = self.read_word(zp_address)
-        effective_address_y = effective_address + self.Y
+        effective_address = self.read_zero_page_word(zp_address)
+        effective_address_y = (effective_address + self.y) & 0xFFFF
         self.cycles -= 1
         return effective_address_y
 
+    def address_indirect(self) -> int:
+        """Addressing mode - Indirect (JMP only)
+
+        TODO:
+        An original 6502 has does not correctly fetch the target
+        address if the indirect vector falls on a page boundary
+        ( e.g.$xxFF where xx is any value from $00 to $FF ).
+        In this case fetches the LSB from $xxFF as expected but
+        takes the MSB from $xx00.This is fixed in some later chips
+        like the 65SC02 so for compatibility always ensure the
+        indirect vector is not at the end of the page.
+        """
+        absolute_address = self.fetch_word()
+        return self.read_word(absolute_address)
+
     def load_program(self, program: List[Byte], num_bytes: u32) -> Word:
         """Returns the address that the program was loading into, or 0 if no program"""
-        load_address: Word = 0
+        load_address: int = 0
         if program and num_bytes:
-            at: u32 = 0
-            low = program[at]
-            at += 1
-            high = program[at] << 8
-            at += 1
-            load_address = low | high
-            for i in range(load_address, load_address + num_bytes - 2):
-                self.Memory[i] = program[at]
-                at += 1
-        return load_address
-
-    def __load_register(self, address: Word, register: str) -> None:
-        """Load a Register with the value from the memory address"""
-
-        _register_value = self.read_byte(address)
-        self.__set_register(register, _register_value)
-        self.set_zero_and_negative_flags(register)
-
-    def __anda(self, address: Word) -> None:
-        """And the A Register with the value from the memory address"""
-        self.A &= self.read_byte(address)
-        self.set_zero_and_negative_flags("A")
-
-    def __ora(self, address: Word) -> None:
-        """Or the A Register with the value from the memory address"""
-        self.A |= self.read_byte(address)
-        self.set_zero_and_negative_flags("A")
-
-    def __eora(self, address: Word) -> None:
-        """Eor the A Register with the value from the memory address"""
-        self.A ^= self.read_byte(address)
-        self.set_zero_and_negative_flags("A")
+            load_address = int(program[0]) | int(program[1]) << 8
+            self.Memory.load(load_address, bytes(int(x) & 0xFF for x in program[2:num_bytes]))
+        return Word(load_address)
 
     def __branch_if(self, test: bool, expected: bool) -> None:
         """Conditional branch"""
         offset = self.fetch_sbyte()
-        if test == expected:
-            program_counter_old = self.program_counter
-            self.program_counter += offset
+        if bool(test) == expected:
+            program_counter_old = self.pc
+            self.pc = (self.pc + offset) & 0xFFFF
             self.cycles -= 1
 
-            page_changed: bool = (self.program_counter >> 8) != (program_counter_old >> 8)
+            page_changed: bool = (self.pc >> 8) != (program_counter_old >> 8)
             if page_changed:
                 self.cycles -= 1
 
-    def __add_with_carry(self, operand: Byte) -> None:
-        """Do add with carry given the the operand"""
-        assert not self.Flag.D, "Haven't handled decimal mode!"
-        are_sign_bits_the_same: bool = not ((self.A ^ operand) & ProcessorStatus.NegativeFlagBit)
-        _sum = self.A
-        _sum += operand
-        _sum += self.Flag.C
-        self.A = _sum & 0xFF
-        self.set_zero_and_negative_flags("A")
-        self.Flag.C = _sum > 0xFF
-        self.Flag.V = are_sign_bits_the_same and ((self.A ^ operand) & ProcessorStatus.NegativeFlagBit)
-
-    def __subtract_with_carry(self, operand: Byte) -> None:
-        """Do subtract with carry given the the operand"""
-        self.__add_with_carry(~operand)
-
-    def __register_compare(self, operand: Byte, register_value: Byte) -> None:
+    def __add_with_carry(self, operand: int) -> None:
+        """Do add with carry given the the operand, binary or decimal depending on the D flag"""
+        p = self.p
+        entry = arithmetic.ADC_TABLE[
+            (p & ProcessorStatus.DecimalFlagBit) << 14
+            | (p & ProcessorStatus.CarryFlagBit) << 16
+            | self.a << 8
+            | operand
+        ]
+        self.a = entry & 0xFF
+        self.p = (p & ~ARITHMETIC_FLAGS) | (entry >> 8)
+
+    def __subtract_with_carry(self, operand: int) -> None:
+        """Do subtract with carry given the the operand, binary or decimal depending on the D flag"""
+        p = self.p
+        entry = arithmetic.SBC_TABLE[
+            (p & ProcessorStatus.DecimalFlagBit) << 14
+            | (p & ProcessorStatus.CarryFlagBit) << 16
+            | self.a << 8
+            | operand
+        ]
+        self.a = entry & 0xFF
+        self.p = (p & ~ARITHMETIC_FLAGS) | (entry >> 8)
+
+    def __register_compare(self, operand: int, register_value: int) -> None:
         """Sets the processor status for a CMP/CPX/CPY instruction"""
-        temp = register_value - operand
-        self.Flag.N = (temp & ProcessorStatus.NegativeFlagBit) > 0
-        self.Flag.Z = register_value == operand
-        self.Flag.C = register_value >= operand
-
-    def __arithmetic_shift_left(self, operand: Byte) -> Byte:
+        temp = (register_value - operand) & 0xFF
+        p = self.p & ~(ProcessorStatus.NegativeFlagBit | ProcessorStatus.ZeroFlagBit | ProcessorStatus.CarryFlagBit)
+        p |= temp & ProcessorStatus.NegativeFlagBit
+        if register_value == operand:
+            p |= ProcessorStatus.ZeroFlagBit
+        if register_value >= operand:
+            p |= ProcessorStatus.CarryFlagBit
+        self.p = p
+
+    def __arithmetic_shift_left(self, operand: int) -> int:
         """Arithmetic shift left"""
-        self.Flag.C = (operand & ProcessorStatus.NegativeFlagBit) > 0
-        result = operand << 1
-        # TODO: unsure how this would work?
+        self.p = (self.p & ~ProcessorStatus.CarryFlagBit) | (operand >> 7)
+        result = (operand << 1) & 0xFF
         self.set_zero_and_negative_flags(result)
         self.cycles -= 1
         return result
 
-    def __logical_shift_right(self, operand: Byte) -> Byte:
+    def __logical_shift_right(self, operand: int) -> int:
         """Logical shift right"""
-        self.Flag.C = (operand & ProcessorStatus.ZeroBit) > 0
+        self.p = (self.p & ~ProcessorStatus.CarryFlagBit) | (operand & ProcessorStatus.ZeroBit)
         result = operand >> 1
-        # TODO: unsure how this would work?
         self.set_zero_and_negative_flags(result)
         self.cycles -= 1
         return result
 
-    def __rotate_left(self, operand: Byte) -> Byte:
+    def __rotate_left(self, operand: int) -> int:
         """Rotate left"""
-        new_bit_0 = ProcessorStatus.ZeroBit if self.Flag.C else 0
-        self.Flag.C = int((operand & ProcessorStatus.NegativeFlagBit) > 0)
-        operand = operand << 1
-        operand |= new_bit_0
+        new_bit_0 = self.p & ProcessorStatus.CarryFlagBit
+        self.p = (self.p & ~ProcessorStatus.CarryFlagBit) | (operand >> 7)
+        operand = ((operand << 1) | new_bit_0) & 0xFF
         self.cycles -= 1
+        self.set_zero_and_negative_flags(operand)
         return operand
 
-    def __rotate_right(self, operand: Byte) -> Byte:
-        """Rotate left"""
-        old_bit_0 = int((operand & ProcessorStatus.ZeroBit) > 0)
+    def __rotate_right(self, operand: int) -> int:
+        """Rotate right"""
+        old_bit_0 = operand & ProcessorStatus.ZeroBit
         operand = operand >> 1
-        if self.Flag.C:
+        if self.p & ProcessorStatus.CarryFlagBit:
             operand |= ProcessorStatus.NegativeFlagBit
         self.cycles -= 1
-        self.Flag.C = old_bit_0
-        # TODO: unsure how this would work?
+        self.p = (self.p & ~ProcessorStatus.CarryFlagBit) | old_bit_0
         self.set_zero_and_negative_flags(operand)
         return operand
 
-    def __increment_at(self, address: Word) -> None:
+    def __increment_at(self, address: int) -> None:
         value = self.read_byte(address)
-        value += 1
+        value = (value + 1) & 0xFF
         self.cycles -= 1
         self.write_byte(address, value)
-        # TODO: unsure how this would work?
         self.set_zero_and_negative_flags(value)
 
-    def __decrement_at(self, address: Word) -> None:
+    def __decrement_at(self, address: int) -> None:
         value = self.read_byte(address)
-        value -= 1
+        value = (value - 1) & 0xFF
         self.cycles -= 1
         self.write_byte(address, value)
-        # TODO: unsure how this would work?
         self.set_zero_and_negative_flags(value)
 
     def __push_processor_status_onto_stack(self) -> None:
         """Push Processor status onto the stack - Setting bits 4 & 5 on the stack"""
-        ps_stack = self.processor_status | ProcessorStatus.BreakFlagBit | ProcessorStatus.UnusedFlagBit
+        ps_stack = self.p | ProcessorStatus.BreakFlagBit | ProcessorStatus.UnusedFlagBit
         self.push_byte_onto_stack(ps_stack)
 
     def __pop_processor_status_from_stack(self) -> None:
         """Pop Processor status from the stack - Clearing bits 4 & 5 (Break & Unused)"""
-        self.pop_byte_from_stack()
-        self.Flag.B = int(False)
-        self.Flag.U = int(False)
+        ps_stack = self.pop_byte_from_stack()
+        self.p = ps_stack & ~(ProcessorStatus.BreakFlagBit | ProcessorStatus.UnusedFlagBit)
 
-    def execute(self, cycles: bytes) -> s32:
-        """TODO: Return the number of cycles that were used"""
+    def execute(self, cycles: s32) -> s32:
+        """Runs instructions until the requested cycles are used, returns the number of cycles that were used"""
         num_cycles_requested = cycles
         self.cycles = cycles
+        instructions = self.instructions
         while self.cycles > 0:
-            instruction = self.fetch_byte()
-            for case in switch(instruction):
-                if case(OpCodes.INS_AND_IM):
-                    self.A &= self.fetch_byte()
-                    self.set_zero_and_negative_flags("A")
-                    break
-                if case(OpCodes.INS_ORA_IM):
-                    self.A |= self.fetch_byte()
-                    self.set_zero_and_negative_flags("A")
-                    break
-                if case(OpCodes.INS_EOR_IM):
-                    self.A ^= self.fetch_byte()
-                    self.set_zero_and_negative_flags("A")
-                    break
-                if case(OpCodes.INS_AND_ZP):
-                    address = self.address_zero_page()
-                    self.__anda(address)
-                    break
-                if case(OpCodes.INS_ORA_ZP):
-                    address = self.address_zero_page()
-                    self.__ora(address)
-                    break
-                if case(OpCodes.INS_EOR_ZP):
-                    address = self.address_zero_page()
-                    self.__eora(address)
-                    break
-                if case(OpCodes.INS_AND_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    self.__anda(address)
-                    break
-                if case(OpCodes.INS_ORA_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    self.ora(address)
-                    break
-                if case(OpCodes.INS_EOR_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    self.__eora(address)
-                    break
-
-                if case(OpCodes.INS_AND_ABS):
-                    address = self.address_absolute()
-                    self.__anda(address)
-                    break
-                if case(OpCodes.INS_ORA_ABS):
-                    address = self.address_absolute()
-                    self.__ora(address)
-                    break
-                if case(OpCodes.INS_EOR_ABS):
-                    address = self.address_absolute()
-                    self.__eora(address)
-                    break
-
-                if case(OpCodes.INS_AND_ABSX):
-                    address = self.address_absolute_x_offset()
-                    self.__anda(address)
-                    break
-                if case(OpCodes.INS_ORA_ABSX):
-                    address = self.address_absolute_x_offset()
-                    self.__ora(address)
-                    break
-                if case(OpCodes.INS_EOR_ABSX):
-                    address = self.address_absolute_x_offset()
-                    self.__eora(address)
-                    break
-
-                if case(OpCodes.INS_AND_ABSY):
-                    address = self.address_absolute_y_offset()
-                    self.__anda(address)
-                    break
-                if case(OpCodes.INS_ORA_ABSY):
-                    address = self.address_absolute_y_offset()
-                    self.__ora(address)
-                    break
-                if case(OpCodes.INS_EOR_ABSY):
-                    address = self.address_absolute_y_offset()
-                    self.__eora(address)
-                    break
-
-                if case(OpCodes.INS_AND_INDX):
-                    address = self.address_indirect_x_offset()
-                    self.__anda(address)
-                    break
-                if case(OpCodes.INS_ORA_INDX):
-                    address = self.address_indirect_x_offset()
-                    self.__ora(address)
-                    break
-                if case(OpCodes.INS_EOR_INDX):
-                    address = self.address_indirect_x_offset()
-                    self.__eora(address)
-                    break
-
-                if case(OpCodes.INS_AND_INDY):
-                    address = self.address_indirect_y_offset()
-                    self.__anda(address)
-                    break
-                if case(OpCodes.INS_ORA_INDY):
-                    address = self.address_indirect_y_offset()
-                    self.__ora(address)
-                    break
-                if case(OpCodes.INS_EOR_INDY):
-                    address = self.address_indirect_y_offset()
-                    self.__eora(address)
-                    break
-
-                if case(OpCodes.INS_BIT_ZP):
-                    address = self.address_zero_page()
-                    value = self.read_byte(address)
-                    self.Flag.Z = not (self.A & value)
-                    self.Flag.N = (value & ProcessorStatus.NegativeFlagBit) != 0
-                    self.Flag.V = (value & ProcessorStatus.OverflowFlagBit) != 0
-                    break
-                if case(OpCodes.INS_BIT_ABS):
-                    address = self.address_absolute()
-                    value = self.read_byte(address)
-                    self.Flag.Z = not (self.A & value)
-                    self.Flag.N = (value & ProcessorStatus.NegativeFlagBit) != 0
-                    self.Flag.V = (value & ProcessorStatus.OverflowFlagBit) != 0
-                    break
-
-                if case(OpCodes.INS_LDA_IM):
-                    self.__set_register("A", self.fetch_byte())
-                    self.set_zero_and_negative_flags("A")
-                    break
-                if case(OpCodes.INS_LDX_IM):
-                    self.__set_register("X", self.fetch_byte())
-                    self.set_zero_and_negative_flags("X")
-                    break
-                if case(OpCodes.INS_LDY_IM):
-                    self.__set_register("Y", self.fetch_byte())
-                    self.set_zero_and_negative_flags("Y")
-                    break
-
-                if case(OpCodes.INS_LDA_ZP):
-                    address = self.address_zero_page()
-                    self.__load_register(address, "A")
-                    break
-                if case(OpCodes.INS_LDX_ZP):
-                    address = self.address_zero_page()
-                    self.__load_register(address, "X")
-                    break
-                if case(OpCodes.INS_LDY_ZP):
-                    address = self.address_zero_page()
-                    self.__load_register(address, "Y")
-                    break
-
-                if case(OpCodes.INS_LDX_ZPY):
-                    address = self.address_zero_page_y_offset()
-                    self.__load_register(address, "X")
-                    break
-
-                if case(OpCodes.INS_LDA_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    self.__load_register(address, "A")
-                    break
-                if case(OpCodes.INS_LDY_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    self.__load_register(address, "Y")
-                    break
-
-                if case(OpCodes.INS_LDA_ABS):
-                    address = self.address_absolute()
-                    self.__load_register(address, "A")
-                    break
-                if case(OpCodes.INS_LDX_ABS):
-                    address = self.address_absolute()
-                    self.__load_register(address, "X")
-                    break
-                if case(OpCodes.INS_LDY_ABS):
-                    address = self.address_absolute()
-                    self.__load_register(address, "Y")
-                    break
-
-                if case(OpCodes.INS_LDA_ABSX):
-                    address = self.address_absolute_x_offset()
-                    self.__load_register(address, "A")
-                    break
-                if case(OpCodes.INS_LDY_ABSX):
-                    address = self.address_absolute_x_offset()
-                    self.__load_register(address, "Y")
-                    break
-
-                if case(OpCodes.INS_LDA_ABSY):
-                    address = self.address_absolute_y_offset()
-                    self.__load_register(address, "A")
-                    break
-                if case(OpCodes.INS_LDX_ABSY):
-                    address = self.address_absolute_y_offset()
-                    self.__load_register(address, "X")
-                    break
-
-                if case(OpCodes.INS_LDA_INDX):
-                    address = self.address_indirect_x_offset()
-                    self.__load_register(address, "A")
-                    break
-                if case(OpCodes.INS_STA_INDX):
-                    address = self.address_indirect_x_offset()
-                    self.write_byte(address, self.A)
-                    break
-                if case(OpCodes.INS_LDA_INDY):
-                    address = self.address_indirect_y_offset()
-                    self.__load_register(address, "A")
-                    break
-                if case(OpCodes.INS_STA_INDY):
-                    address = self.address_indirect_y_offset()
-                    self.write_byte(address, self.A)
-                    break
-                if case(OpCodes.INS_STA_ZP):
-                    address = self.address_zero_page()
-                    self.write_byte(address, self.A)
-                    break
-                if case(OpCodes.INS_STX_ZP):
-                    address = self.address_zero_page()
-                    self.write_byte(address, self.X)
-                    break
-                if case(OpCodes.INS_STX_ZPY):
-                    address = self.address_zero_page_y_offset()
-                    self.write_byte(address, self.X)
-                    break
-                if case(OpCodes.INS_STY_ZP):
-                    address = self.address_zero_page()
-                    self.write_byte(address, self.Y)
-                    break
-                if case(OpCodes.INS_STA_ABS):
-                    address = self.address_absolute()
-                    self.write_byte(address, self.A)
-                    break
-                if case(OpCodes.INS_STX_ABS):
-                    address = self.address_absolute()
-                    self.write_byte(address, self.X)
-                    break
-                if case(OpCodes.INS_STY_ABS):
-                    address = self.address_absolute()
-                    self.write_byte(address, self.Y)
-                    break
-                if case(OpCodes.INS_STA_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    self.write_byte(address, self.A)
-                    break
-                if case(OpCodes.INS_STY_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    self.write_byte(address, self.Y)
-                    break
-                if case(OpCodes.INS_STA_ABSX):
-                    address = self.address_absolute_x_offset_5()
-                    self.write_byte(address, self.A)
-                    break
-                if case(OpCodes.INS_STA_ABSY):
-                    address = self.address_absolute_y_offset_5()
-                    self.write_byte(address, self.A)
-                    break
-                if case(OpCodes.INS_JSR):
-                    sub_address = self.fetch_word()
-                    self.push_pc_minus_1_onto_stack()
-                    self.program_counter = sub_address
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_RTS):
-                    return_address = self.pop_word_from_stack()
-                    self.program_counter = return_address + 1
-                    self.cycles -= 2
-                    break
-                """TODO:
-                An original 6502 has does not correctly fetch the target
-                address if the indirect vector falls on a page boundary
-                ( e.g.$xxFF where xx is any value from $00 to $FF ).
-                In this case fetches the LSB from $xxFF as expected but
-                takes the MSB from $xx00.This is fixed in some later chips
-                like the 65SC02 so for compatibility always ensure the
-                indirect vector is not at the end of the page."""
-                if case(OpCodes.INS_JMP_ABS):
-                    address = self.address_absolute()
-                    self.program_counter = address
-                    break
-                if case(OpCodes.INS_JMP_IND):
-                    address = self.address_absolute()
-                    address = self.read_word(address)
-                    self.program_counter = address
-                    break
-                if case(OpCodes.INS_TSX):
-                    self.X = self.stack_pointer
-                    self.cycles -= 1
-                    self.set_zero_and_negative_flags("X")
-                    break
-                if case(OpCodes.INS_TXS):
-                    self.stack_pointer = self.X
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_PHA):
-                    self.push_byte_onto_stack(self.A)
-                    break
-                if case(OpCodes.INS_PLA):
-                    self.A = self.pop_byte_from_stack()
-                    self.set_zero_and_negative_flags("A")
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_PHP):
-                    self.__push_processor_status_onto_stack()
-                    break
-                if case(OpCodes.INS_PLP):
-                    self.__pop_processor_status_from_stack()
-                    break
-                if case(OpCodes.INS_TAX):
-                    self.X = self.A
-                    self.cycles -= 1
-                    self.set_zero_and_negative_flags("X")
-                    break
-                if case(OpCodes.INS_TAY):
-                    self.Y = self.A
-                    self.cycles -= 1
-                    self.set_zero_and_negative_flags("Y")
-                    break
-                if case(OpCodes.INS_TXA):
-                    self.A = self.X
-                    self.cycles -= 1
-                    self.set_zero_and_negative_flags("A")
-                    break
-                if case(OpCodes.INS_TYA):
-                    self.A = self.Y
-                    self.cycles -= 1
-                    self.set_zero_and_negative_flags("A")
-                    break
-                if case(OpCodes.INS_INX):
-                    self.X += 1
-                    self.cycles -= 1
-                    self.set_zero_and_negative_flags("X")
-                    break
-                if case(OpCodes.INS_INY):
-                    self.Y += 1
-                    self.cycles -= 1
-                    self.set_zero_and_negative_flags("Y")
-                    break
-                if case(OpCodes.INS_DEX):
-                    self.X -= 1
-                    self.cycles -= 1
-                    self.set_zero_and_negative_flags("X")
-                    break
-                if case(OpCodes.INS_DEY):
-                    self.Y -= 1
-                    self.cycles -= 1
-                    self.set_zero_and_negative_flags("Y")
-                    break
-                if case(OpCodes.INS_DEC_ZP):
-                    address = self.address_zero_page()
-                    self.__decrement_at(address)
-                    break
-                if case(OpCodes.INS_DEC_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    self.__decrement_at(address)
-                    break
-                if case(OpCodes.INS_DEC_ABS):
-                    address = self.address_absolute()
-                    self.__decrement_at(address)
-                    break
-                if case(OpCodes.INS_DEC_ABSX):
-                    address = self.address_absolute_x_offset_5()
-                    self.__decrement_at(address)
-                    break
-                if case(OpCodes.INS_INC_ZP):
-                    address = self.address_zero_page()
-                    self.__increment_at(address)
-                    break
-                if case(OpCodes.INS_INC_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    self.__increment_at(address)
-                    break
-                if case(OpCodes.INS_INC_ABS):
-                    address = self.address_absolute()
-                    self.__increment_at(address)
-                    break
-                if case(OpCodes.INS_INC_ABSX):
-                    address = self.address_absolute_x_offset_5()
-                    self.__increment_at(address)
-                    break
-                if case(OpCodes.INS_BEQ):
-                    self.__branch_if(self.Flag.Z, True)
-                    break
-                if case(OpCodes.INS_BNE):
-                    self.__branch_if(self.Flag.Z, False)
-                    break
-                if case(OpCodes.INS_BCS):
-                    self.__branch_if(self.Flag.C, True)
-                    break
-                if case(OpCodes.INS_BCC):
-                    self.__branch_if(self.Flag.C, False)
-                    break
-                if case(OpCodes.INS_BMI):
-                    self.__branch_if(self.Flag.N, True)
-                    break
-                if case(OpCodes.INS_BPL):
-                    self.__branch_if(self.Flag.N, False)
-                    break
-                if case(OpCodes.INS_BVC):
-                    self.__branch_if(self.Flag.V, False)
-                    break
-                if case(OpCodes.INS_BVS):
-                    self.__branch_if(self.Flag.V, True)
-                    break
-                if case(OpCodes.INS_CLC):
-                    self.Flag.C = int(False)
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_SEC):
-                    self.Flag.C = int(True)
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_CLD):
-                    self.Flag.D = int(False)
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_SED):
-                    self.Flag.D = int(True)
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_CLI):
-                    self.Flag.I = int(False)
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_SEI):
-                    self.Flag.I = int(True)
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_CLV):
-                    self.Flag.V = int(False)
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_NOP):
-                    self.cycles -= 1
-                    break
-                if case(OpCodes.INS_ADC_ABS):
-                    address = self.address_absolute()
-                    operand = self.read_byte(address)
-                    self.__add_with_carry(operand)
-                    break
-                if case(OpCodes.INS_ADC_ABSX):
-                    address = self.address_absolute_x_offset()
-                    operand = self.read_byte(address)
-                    self.__add_with_carry(operand)
-                    break
-                if case(OpCodes.INS_ADC_ABSY):
-                    address = self.address_absolute_y_offset()
-                    operand = self.read_byte(address)
-                    self.__add_with_carry(operand)
-                    break
-                if case(OpCodes.INS_ADC_ZP):
-                    address = self.address_zero_page()
-                    operand = self.read_byte(address)
-                    self.__add_with_carry(operand)
-                    break
-                if case(OpCodes.INS_ADC_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    operand = self.read_byte(address)
-                    self.__add_with_carry(operand)
-                    break
-                if case(OpCodes.INS_ADC_INDX):
-                    address = self.address_indirect_x_offset()
-                    operand = self.read_byte(address)
-                    self.__add_with_carry(operand)
-                    break
-                if case(OpCodes.INS_ADC_INDY):
-                    address = self.address_indirect_y_offset()
-                    operand = self.read_byte(address)
-                    self.__add_with_carry(operand)
-                    break
-                if case(OpCodes.INS_ADC):
-                    operand = self.fetch_byte()
-                    self.__add_with_carry(operand)
-                    break
-                if case(OpCodes.INS_SBC):
-                    operand = self.fetch_byte()
-                    self.__subtract_with_carry(operand)
-                    break
-                if case(OpCodes.INS_SBC_ABS):
-                    address = self.address_absolute()
-                    operand = self.read_byte(address)
-                    self.__subtract_with_carry(operand)
-                    break
-                if case(OpCodes.INS_SBC_ZP):
-                    address = self.address_zero_page()
-                    operand = self.read_byte(address)
-                    self.__subtract_with_carry(operand)
-                    break
-                if case(OpCodes.INS_SBC_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    operand = self.read_byte(address)
-                    self.__subtract_with_carry(operand)
-                    break
-                if case(OpCodes.INS_SBC_ABSX):
-                    address = self.address_absolute_x_offset()
-                    operand = self.read_byte(address)
-                    self.__subtract_with_carry(operand)
-                    break
-                if case(OpCodes.INS_SBC_ABSY):
-                    address = self.address_absolute_y_offset()
-                    operand = self.read_byte(address)
-                    self.__subtract_with_carry(operand)
-                    break
-                if case(OpCodes.INS_SBC_INDX):
-                    address = self.address_indirect_x_offset()
-                    operand = self.read_byte(address)
-                    self.__subtract_with_carry(operand)
-                    break
-                if case(OpCodes.INS_SBC_INDY):
-                    address = self.address_indirect_y_offset()
-                    operand = self.read_byte(address)
-                    self.__subtract_with_carry(operand)
-                    break
-                if case(OpCodes.INS_CPX):
-                    operand = self.fetch_byte()
-                    self.__register_compare(operand, self.X)
-                    break
-                if case(OpCodes.INS_CPY):
-                    operand = self.fetch_byte()
-                    self.__register_compare(operand, self.Y)
-                    break
-                if case(OpCodes.INS_CPX_ZP):
-                    address = self.address_zero_page()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.X)
-                    break
-                if case(OpCodes.INS_CPY_ZP):
-                    address = self.address_zero_page()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.Y)
-                    break
-                if case(OpCodes.INS_CPX_ABS):
-                    address = self.address_absolute()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.X)
-                    break
-                if case(OpCodes.INS_CPY_ABS):
-                    address = self.address_absolute()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.Y)
-                    break
-                if case(OpCodes.INS_CMP):
-                    operand = self.fetch_byte()
-                    self.__register_compare(operand, self.A)
-                    break
-                if case(OpCodes.INS_CMP_ZP):
-                    address = self.address_zero_page()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.A)
-                    break
-                if case(OpCodes.INS_CMP_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.A)
-                    break
-                if case(OpCodes.INS_CMP_ABS):
-                    address = self.address_absolute()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.A)
-                    break
-                if case(OpCodes.INS_CMP_ABSX):
-                    address = self.address_absolute_x_offset()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.A)
-                    break
-                if case(OpCodes.INS_CMP_ABSY):
-                    address = self.address_absolute_y_offset()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.A)
-                    break
-                if case(OpCodes.INS_CMP_INDX):
-                    address = self.address_indirect_x_offset()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.A)
-                    break
-                if case(OpCodes.INS_CMP_INDY):
-                    address = self.address_indirect_y_offset()
-                    operand = self.read_byte(address)
-                    self.__register_compare(operand, self.A)
-                    break
-                if case(OpCodes.INS_ASL):
-                    self.A = self.__arithmetic_shift_left(self.A)
-                    break
-                if case(OpCodes.INS_ASL_ZP):
-                    address = self.address_zero_page()
-                    operand = self.read_byte(address)
-                    result = self.__arithmetic_shift_left(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ASL_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    operand = self.read_byte(address)
-                    result = self.__arithmetic_shift_left(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ASL_ABS):
-                    address = self.address_absolute()
-                    operand = self.read_byte(address)
-                    result = self.__arithmetic_shift_left(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ASL_ABSX):
-                    address = self.address_absolute_x_offset()
-                    operand = self.read_byte(address)
-                    result = self.__arithmetic_shift_left(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_LSR):
-                    self.A = self.__logical_shift_right(self.A)
-                    break
-                if case(OpCodes.INS_LSR_ZP):
-                    address = self.address_zero_page()
-                    operand = self.read_byte(address)
-                    result = self.__logical_shift_right(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_LSR_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    operand = self.read_byte(address)
-                    result = self.__logical_shift_right(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_LSR_ABS):
-                    address = self.address_absolute()
-                    operand = self.read_byte(address)
-                    result = self.__logical_shift_right(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_LSR_ABSX):
-                    address = self.address_absolute_x_offset_5()
-                    operand = self.read_byte(address)
-                    result = self.__logical_shift_right(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ROL):
-                    self.A = self.__rotate_left(self.A)
-                    break
-                if case(OpCodes.INS_ROL_ZP):
-                    address = self.address_zero_page()
-                    operand = self.read_byte(address)
-                    result = self.__rotate_left(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ROL_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    operand = self.read_byte(address)
-                    result = self.__rotate_left(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ROL_ABS):
-                    address = self.address_absolute()
-                    operand = self.read_byte(address)
-                    result = self.__rotate_left(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ROL_ABSX):
-                    address = self.address_absolute_x_offset_5()
-                    operand = self.read_byte(address)
-                    result = self.__rotate_left(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ROR):
-                    self.A = self.__rotate_right(self.A)
-                    break
-                if case(OpCodes.INS_ROR_ZP):
-                    address = self.address_zero_page()
-                    operand = self.read_byte(address)
-                    result = self.__rotate_right(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ROR_ZPX):
-                    address = self.address_zero_page_x_offset()
-                    operand = self.read_byte(address)
-                    result = self.__rotate_right(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ROR_ABS):
-                    address = self.address_absolute()
-                    operand = self.read_byte(address)
-                    result = self.__rotate_right(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_ROR_ABSX):
-                    address = self.address_absolute_x_offset_5()
-                    operand = self.read_byte(address)
-                    result = self.__rotate_right(operand)
-                    self.write_byte(address, result)
-                    break
-                if case(OpCodes.INS_BRK):
-                    self.push_pc_plus_1_onto_stack()
-                    self.__push_processor_status_onto_stack()
-                    interrupt_vector = 0xFFFE
-                    self.program_counter = self.read_word(interrupt_vector)
-                    self.Flag.B = int(True)
-                    self.Flag.I = int(True)
-                    break
-                if case(OpCodes.INS_RTI):
-                    self.__pop_processor_status_from_stack()
-                    self.processor_status = Byte(self.pop_word_from_stack())
-                    break
-                # default
-                raise NotImplementedError(f"Instruction {instruction} not handled")
+            instructions[self.fetch_byte()](self)
         num_cycles_used = num_cycles_requested - self.cycles
         return num_cycles_used
+
+    def run(
+        self,
+        cycles: Optional[int] = None,
+        instructions: Optional[int] = None,
+        until_pc: Optional[int] = None,
+        trap: bool = False,
+    ) -> Stop:
+        """Runs instructions until the first of the limits given is reached
+
+        Stops once the cycles are used or the number of instructions have run, after an instruction
+        which leaves the program counter at until_pc, or if trap, after one which leaves it where it
+        was. The limit checks are a few comparisons per instruction in the one loop, so this is the
+        way to run a lot of instructions rather than calling execute in a loop.
+
+        If there are any breakpoints or watchpoints (Memory.add_watchpoint) the instructions are run
+        by a slower loop which also stops before the instruction at a breakpoint (other than the
+        first), and after an instruction which reads or writes a watched address. Without any, the
+        loop is the same as if they did not exist.
+        """
+        budget = UNLIMITED_CYCLES if cycles is None else cycles
+        limit = -1 if instructions is None else instructions
+        stop_pc = -1 if until_pc is None else until_pc
+        if self.breakpoints or self.Memory.watchpoints:
+            return run_instrumented(self, budget, limit, stop_pc, trap)
+        table = self.instructions
+        fetch_byte = self.fetch_byte
+        self.cycles = budget
+        count = 0
+        while True:
+            if count == limit:
+                reason = StopReason.INSTRUCTIONS
+                break
+            if self.cycles <= 0:
+                reason = StopReason.CYCLES
+                break
+            pc = self.pc
+            table[fetch_byte()](self)
+            count += 1
+            if self.pc == stop_pc:
+                reason = StopReason.PC
+                break
+            if trap and self.pc == pc:
+                reason = StopReason.TRAP
+                break
+        return Stop(reason, count, budget - self.cycles)
+
+    def step(self) -> None:
+        """Runs one instruction"""
+        self.instructions[self.fetch_byte()](self)
+
+    def run_cycles(self, cycles: int) -> Stop:
+        """Runs until the cycles are used, like execute but returning a Stop"""
+        return self.run(cycles=cycles)
+
+    def run_instructions(self, instructions: int, cycles: Optional[int] = None) -> Stop:
+        """Runs the number of instructions, or until the cycles are used if given first"""
+        return self.run(cycles, instructions)
+
+    def run_until_pc(self, address: int, cycles: Optional[int] = None) -> Stop:
+        """Runs until an instruction leaves the program counter at the address, or the cycles are used"""
+        return self.run(cycles, until_pc=address)
+
+    def run_until_trap(self, cycles: Optional[int] = None) -> Stop:
+        """Runs until an instruction jumps or branches to itself, or the cycles are used"""
+        return self.run(cycles, trap=True)
+
+    def interrupt(self, vector: int) -> int:
+        """Pushes the program counter and status and jumps through the vector, returns the cycles taken
+
+        This is what the CPU does between instructions for an IRQ or NMI. The status is pushed with the
+        break flag clear, which is how an interrupt handler tells them apart from BRK. It is not
+        counted in self.cycles, the caller keeps time (see emulator/scheduler.py).
+        """
+        memory = self.Memory
+        memory.write(0x100 | self.sp, self.pc >> 8)
+        memory.write(0x100 | ((self.sp - 1) & 0xFF), self.pc & 0xFF)
+        status = (self.p | ProcessorStatus.UnusedFlagBit) & ~ProcessorStatus.BreakFlagBit
+        memory.write(0x100 | ((self.sp - 2) & 0xFF), status)
+        self.sp = (self.sp - 3) & 0xFF
+        self.p |= ProcessorStatus.InterruptDisableFlagBit
+        self.pc = memory.read(vector) | memory.read((vector + 1) & 0xFFFF) << 8
+        return INTERRUPT_CYCLES
+
+    def irq(self) -> int:
+        """Takes an IRQ unless the I flag masks it, returns the cycles taken (0 if masked)"""
+        if self.p & ProcessorStatus.InterruptDisableFlagBit:
+            return 0
+        return self.interrupt(IRQ_VECTOR)
+
+    def nmi(self) -> int:
+        """Takes a non maskable interrupt, returns the cycles taken"""
+        return self.interrupt(NMI_VECTOR)
+
+    # Instructions which take the effective address from their addressing mode
+
+    def ins_lda(self, address: int) -> None:
+        self.a = self.read_byte(address)
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_ldx(self, address: int) -> None:
+        self.x = self.read_byte(address)
+        self.set_zero_and_negative_flags(self.x)
+
+    def ins_ldy(self, address: int) -> None:
+        self.y = self.read_byte(address)
+        self.set_zero_and_negative_flags(self.y)
+
+    def ins_sta(self, address: int) -> None:
+        self.write_byte(address, self.a)
+
+    def ins_stx(self, address: int) -> None:
+        self.write_byte(address, self.x)
+
+    def ins_sty(self, address: int) -> None:
+        self.write_byte(address, self.y)
+
+    def ins_and(self, address: int) -> None:
+        """And the A Register with the value from the memory address"""
+        self.a &= self.read_byte(address)
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_ora(self, address: int) -> None:
+        """Or the A Register with the value from the memory address"""
+        self.a |= self.read_byte(address)
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_eor(self, address: int) -> None:
+        """Eor the A Register with the value from the memory address"""
+        self.a ^= self.read_byte(address)
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_bit(self, address: int) -> None:
+        value = self.read_byte(address)
+        p = self.p & ~(ProcessorStatus.ZeroFlagBit | ProcessorStatus.NegativeFlagBit | ProcessorStatus.OverflowFlagBit)
+        p |= value & (ProcessorStatus.NegativeFlagBit | ProcessorStatus.OverflowFlagBit)
+        if not self.a & value:
+            p |= ProcessorStatus.ZeroFlagBit
+        self.p = p
+
+    def ins_adc(self, address: int) -> None:
+        self.__add_with_carry(self.read_byte(address))
+
+    def ins_sbc(self, address: int) -> None:
+        self.__subtract_with_carry(self.read_byte(address))
+
+    def ins_cmp(self, address: int) -> None:
+        self.__register_compare(self.read_byte(address), self.a)
+
+    def ins_cpx(self, address: int) -> None:
+        self.__register_compare(self.read_byte(address), self.x)
+
+    def ins_cpy(self, address: int) -> None:
+        self.__register_compare(self.read_byte(address), self.y)
+
+    def ins_asl(self, address: int) -> None:
+        result = self.__arithmetic_shift_left(self.read_byte(address))
+        self.write_byte(address, result)
+
+    def ins_lsr(self, address: int) -> None:
+        result = self.__logical_shift_right(self.read_byte(address))
+        self.write_byte(address, result)
+
+    def ins_rol(self, address: int) -> None:
+        result = self.__rotate_left(self.read_byte(address))
+        self.write_byte(address, result)
+
+    def ins_ror(self, address: int) -> None:
+        result = self.__rotate_right(self.read_byte(address))
+        self.write_byte(address, result)
+
+    def ins_inc(self, address: int) -> None:
+        self.__increment_at(address)
+
+    def ins_dec(self, address: int) -> None:
+        self.__decrement_at(address)
+
+    def ins_jmp(self, address: int) -> None:
+        self.pc = address
+
+    def ins_jsr(self, address: int) -> None:
+        self.push_pc_minus_1_onto_stack()
+        self.pc = address
+        self.cycles -= 1
+
+    # Instructions which have no operand or fetch their own (branches)
+
+    def ins_asl_accumulator(self) -> None:
+        self.a = self.__arithmetic_shift_left(self.a)
+
+    def ins_lsr_accumulator(self) -> None:
+        self.a = self.__logical_shift_right(self.a)
+
+    def ins_rol_accumulator(self) -> None:
+        self.a = self.__rotate_left(self.a)
+
+    def ins_ror_accumulator(self) -> None:
+        self.a = self.__rotate_right(self.a)
+
+    def ins_rts(self) -> None:
+        return_address = self.pop_word_from_stack()
+        self.pc = (return_address + 1) & 0xFFFF
+        self.cycles -= 2
+
+    def ins_tsx(self) -> None:
+        self.x = self.sp
+        self.cycles -= 1
+        self.set_zero_and_negative_flags(self.x)
+
+    def ins_txs(self) -> None:
+        self.sp = self.x
+        self.cycles -= 1
+
+    def ins_pha(self) -> None:
+        self.push_byte_onto_stack(self.a)
+
+    def ins_pla(self) -> None:
+        self.a = self.pop_byte_from_stack()
+        self.set_zero_and_negative_flags(self.a)
+        self.cycles -= 1
+
+    def ins_php(self) -> None:
+        self.__push_processor_status_onto_stack()
+
+    def ins_plp(self) -> None:
+        self.__pop_processor_status_from_stack()
+        self.cycles -= 1
+
+    def ins_tax(self) -> None:
+        self.x = self.a
+        self.cycles -= 1
+        self.set_zero_and_negative_flags(self.x)
+
+    def ins_tay(self) -> None:
+        self.y = self.a
+        self.cycles -= 1
+        self.set_zero_and_negative_flags(self.y)
+
+    def ins_txa(self) -> None:
+        self.a = self.x
+        self.cycles -= 1
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_tya(self) -> None:
+        self.a = self.y
+        self.cycles -= 1
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_inx(self) -> None:
+        self.x = (self.x + 1) & 0xFF
+        self.cycles -= 1
+        self.set_zero_and_negative_flags(self.x)
+
+    def ins_iny(self) -> None:
+        self.y = (self.y + 1) & 0xFF
+        self.cycles -= 1
+        self.set_zero_and_negative_flags(self.y)
+
+    def ins_dex(self) -> None:
+        self.x = (self.x - 1) & 0xFF
+        self.cycles -= 1
+        self.set_zero_and_negative_flags(self.x)
+
+    def ins_dey(self) -> None:
+        self.y = (self.y - 1) & 0xFF
+        self.cycles -= 1
+        self.set_zero_and_negative_flags(self.y)
+
+    def ins_beq(self) -> None:
+        self.__branch_if(self.p & ProcessorStatus.ZeroFlagBit, True)
+
+    def ins_bne(self) -> None:
+        self.__branch_if(self.p & ProcessorStatus.ZeroFlagBit, False)
+
+    def ins_bcs(self) -> None:
+        self.__branch_if(self.p & ProcessorStatus.CarryFlagBit, True)
+
+    def ins_bcc(self) -> None:
+        self.__branch_if(self.p & ProcessorStatus.CarryFlagBit, False)
+
+    def ins_bmi(self) -> None:
+        self.__branch_if(self.p & ProcessorStatus.NegativeFlagBit, True)
+
+    def ins_bpl(self) -> None:
+        self.__branch_if(self.p & ProcessorStatus.NegativeFlagBit, False)
+
+    def ins_bvc(self) -> None:
+        self.__branch_if(self.p & ProcessorStatus.OverflowFlagBit, False)
+
+    def ins_bvs(self) -> None:
+        self.__branch_if(self.p & ProcessorStatus.OverflowFlagBit, True)
+
+    def ins_clc(self) -> None:
+        self.p &= ~ProcessorStatus.CarryFlagBit
+        self.cycles -= 1
+
+    def ins_sec(self) -> None:
+        self.p |= ProcessorStatus.CarryFlagBit
+        self.cycles -= 1
+
+    def ins_cld(self) -> None:
+        self.p &= ~ProcessorStatus.DecimalFlagBit
+        self.cycles -= 1
+
+    def ins_sed(self) -> None:
+        self.p |= ProcessorStatus.DecimalFlagBit
+        self.cycles -= 1
+
+    def ins_cli(self) -> None:
+        self.p &= ~ProcessorStatus.InterruptDisableFlagBit
+        self.cycles -= 1
+
+    def ins_sei(self) -> None:
+        self.p |= ProcessorStatus.InterruptDisableFlagBit
+        self.cycles -= 1
+
+    def ins_clv(self) -> None:
+        self.p &= ~ProcessorStatus.OverflowFlagBit
+        self.cycles -= 1
+
+    def ins_nop(self) -> None:
+        self.cycles -= 1
+
+    def ins_brk(self) -> None:
+        self.push_pc_plus_1_onto_stack()
+        self.__push_processor_status_onto_stack()
+        interrupt_vector = 0xFFFE
+        self.pc = self.read_word(interrupt_vector)
+        self.p |= ProcessorStatus.BreakFlagBit | ProcessorStatus.InterruptDisableFlagBit
+
+    def ins_rti(self) -> None:
+        self.__pop_processor_status_from_stack()
+        self.pc = self.pop_word_from_stack()
+
+    # Undocumented instructions (UndocumentedOpCodes), which take the effective address from their addressing mode
+
+    def ins_slo(self, address: int) -> None:
+        result = self.__arithmetic_shift_left(self.read_byte(address))
+        self.write_byte(address, result)
+        self.a |= result
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_rla(self, address: int) -> None:
+        result = self.__rotate_left(self.read_byte(address))
+        self.write_byte(address, result)
+        self.a &= result
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_sre(self, address: int) -> None:
+        result = self.__logical_shift_right(self.read_byte(address))
+        self.write_byte(address, result)
+        self.a ^= result
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_rra(self, address: int) -> None:
+        result = self.__rotate_right(self.read_byte(address))
+        self.write_byte(address, result)
+        self.__add_with_carry(result)
+
+    def ins_dcp(self, address: int) -> None:
+        value = (self.read_byte(address) - 1) & 0xFF
+        self.cycles -= 1
+        self.write_byte(address, value)
+        self.__register_compare(value, self.a)
+
+    def ins_isc(self, address: int) -> None:
+        value = (self.read_byte(address) + 1) & 0xFF
+        self.cycles -= 1
+        self.write_byte(address, value)
+        self.__subtract_with_carry(value)
+
+    def ins_sax(self, address: int) -> None:
+        self.write_byte(address, self.a & self.x)
+
+    def ins_lax(self, address: int) -> None:
+        self.a = self.x = self.read_byte(address)
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_anc(self, address: int) -> None:
+        """And, then copy the negative flag to the carry flag"""
+        self.a &= self.read_byte(address)
+        self.set_zero_and_negative_flags(self.a)
+        self.p = (self.p & ~ProcessorStatus.CarryFlagBit) | (self.a >> 7)
+
+    def ins_alr(self, address: int) -> None:
+        """And, then LSR A"""
+        value = self.a & self.read_byte(address)
+        self.p = (self.p & ~ProcessorStatus.CarryFlagBit) | (value & ProcessorStatus.ZeroBit)
+        self.a = value >> 1
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_arr(self, address: int) -> None:
+        """And, then ROR A, with C from bit 6 of the result and V from bit 6 xor bit 5 (binary mode only)"""
+        value = self.a & self.read_byte(address)
+        self.a = (value >> 1) | (self.p & ProcessorStatus.CarryFlagBit) << 7
+        p = self.p & ~(ProcessorStatus.CarryFlagBit | ProcessorStatus.OverflowFlagBit)
+        p |= (self.a >> 6) & ProcessorStatus.CarryFlagBit
+        p |= (self.a ^ self.a << 1) & ProcessorStatus.OverflowFlagBit
+        self.p = p
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_sbx(self, address: int) -> None:
+        """X = (A & X) - operand, setting the flags like CMP and ignoring the carry and decimal flags"""
+        value = self.read_byte(address)
+        and_x = self.a & self.x
+        self.__register_compare(value, and_x)
+        self.x = (and_x - value) & 0xFF
+
+    # ANE, LXA, LAS, TAS, SHA, SHX and SHY depend on the chip and its temperature on real hardware.
+    # These follow the usual emulation: UNSTABLE_MAGIC for the bits ANE and LXA take from the bus, and
+    # the stores AND with the high byte of the effective address plus one (ignoring page crossings).
+
+    def ins_ane(self, address: int) -> None:
+        self.a = (self.a | UNSTABLE_MAGIC) & self.x & self.read_byte(address)
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_lxa(self, address: int) -> None:
+        self.a = self.x = (self.a | UNSTABLE_MAGIC) & self.read_byte(address)
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_las(self, address: int) -> None:
+        self.a = self.x = self.sp = self.read_byte(address) & self.sp
+        self.set_zero_and_negative_flags(self.a)
+
+    def ins_tas(self, address: int) -> None:
+        self.sp = self.a & self.x
+        self.write_byte(address, self.sp & ((address >> 8) + 1) & 0xFF)
+
+    def ins_sha(self, address: int) -> None:
+        self.write_byte(address, self.a & self.x & ((address >> 8) + 1) & 0xFF)
+
+    def ins_shx(self, address: int) -> None:
+        self.write_byte(address, self.x & ((address >> 8) + 1) & 0xFF)
+
+    def ins_shy(self, address: int) -> None:
+        self.write_byte(address, self.y & ((address >> 8) + 1) & 0xFF)
+
+    def ins_dop(self, address: int) -> None:
+        self.read_byte(address)
+
+    def ins_top(self, address: int) -> None:
+        self.read_byte(address)
+
+    def ins_jam(self) -> None:
+        """Stops the CPU: the program counter stays on the JAM, which run_until_trap stops at"""
+        self.pc = (self.pc - 1) & 0xFFFF
+        self.cycles -= 1
+
+
+# Mnemonics whose OpCodes name has no addressing mode suffix but still take an operand
+DEFAULT_ADDRESSING_MODES = {"ADC": "IM", "SBC": "IM", "CMP": "IM", "CPX": "IM", "CPY": "IM", "JSR": "ABS"}
+
+# Mnemonics whose OpCodes name has no addressing mode suffix and work on the A register
+ACCUMULATOR_MNEMONICS = {"ASL", "LSR", "ROL", "ROR"}
+
+# Stores and read-modify-writes always take the cycle for the index, whether or not a page is crossed
+ALWAYS_INDEXED_MNEMONICS = {"STA", "STX", "STY", "ASL", "LSR", "ROL", "ROR", "INC", "DEC"}
+ALWAYS_INDEXED_MNEMONICS |= {"SLO", "RLA", "SRE", "RRA", "DCP", "ISC", "TAS", "SHA", "SHX", "SHY"}
+
+# The bits of A that ANE and LXA keep, which on a real chip vary
+UNSTABLE_MAGIC = 0xEE
+
+ADDRESSING_MODES = {
+    "IM": CPU.address_immediate,
+    "ZP": CPU.address_zero_page,
+    "ZPX": CPU.address_zero_page_x_offset,
+    "ZPY": CPU.address_zero_page_y_offset,
+    "ABS": CPU.address_absolute,
+    "ABSX": CPU.address_absolute_x_offset,
+    "ABSY": CPU.address_absolute_y_offset,
+    "IND": CPU.address_indirect,
+    "INDX": CPU.address_indirect_x_offset,
+    "INDY": CPU.address_indirect_y_offset,
+}
+
+ALWAYS_INDEXED_ADDRESSING_MODES = {
+    **ADDRESSING_MODES,
+    "ABSX": CPU.address_absolute_x_offset_5,
+    "ABSY": CPU.address_absolute_y_offset_5,
+    "INDY": CPU.address_indirect_x_offset_6,
+}
+
+
+def run_instrumented(cpu: CPU, budget: int, limit: int, stop_pc: int, trap: bool) -> Stop:
+    """CPU.run's loop for when there are breakpoints or watchpoints, running an instruction at a time with step"""
+    breakpoints = cpu.breakpoints
+    watch_hits = cpu.Memory.watch_hits
+    watch_hits.clear()
+    cpu.cycles = budget
+    count = 0
+    while True:
+        if count == limit:
+            reason = StopReason.INSTRUCTIONS
+            break
+        if cpu.cycles <= 0:
+            reason = StopReason.CYCLES
+            break
+        pc = cpu.pc
+        cpu.step()
+        count += 1
+        if watch_hits:
+            reason = StopReason.WATCHPOINT
+            break
+        if cpu.pc == stop_pc:
+            reason = StopReason.PC
+            break
+        if cpu.pc in breakpoints:
+            reason = StopReason.BREAKPOINT
+            break
+        if trap and cpu.pc == pc:
+            reason = StopReason.TRAP
+            break
+    return Stop(reason, count, budget - cpu.cycles)
+
+
+def _with_addressing_mode(operation: Callable, addressing_mode: Callable) -> Instruction:
+    """Binds an operation to the addressing mode that works out its effective address"""
+
+    def instruction(cpu: CPU) -> None:
+        operation(cpu, addressing_mode(cpu))
+
+    return instruction
+
+
+def _not_implemented(opcode: Byte) -> Instruction:
+    def instruction(cpu: CPU) -> None:
+        raise NotImplementedError(f"Instruction {opcode} not handled")
+
+    return instruction
+
+
+# The operations of undocumented opcodes run as NOPs (see Undocumented), which take the cycles the
+# opcode takes when implemented but change nothing. Reads still read, as the bus sees them.
+
+
+def _skip_read(cpu: CPU, address: int) -> None:
+    cpu.read_byte(address)
+
+
+def _skip_read_modify_write(cpu: CPU, address: int) -> None:
+    """Reads, then takes the cycles to modify and write back"""
+    cpu.read_byte(address)
+    cpu.cycles -= 2
+
+
+def _skip_store(cpu: CPU, address: int) -> None:
+    """Takes the cycle to write"""
+    cpu.cycles -= 1
+
+
+READ_MODIFY_WRITE_MNEMONICS = {"SLO", "RLA", "SRE", "RRA", "DCP", "ISC"}
+STORE_MNEMONICS = {"SAX", "TAS", "SHA", "SHX", "SHY"}
+
+
+def opcode_names(opcodes: type = OpCodes) -> Iterator[Tuple[int, str, Optional[str]]]:
+    """Yields (opcode, mnemonic, addressing mode) parsed from the INS_<MNEMONIC>[_<MODE>] names in OpCodes
+
+    The mode is one of the ADDRESSING_MODES keys, "A" for instructions working on the A register,
+    or None for implied instructions (and branches, which fetch their own offset). Pass
+    UndocumentedOpCodes for the undocumented opcodes, whose names may end with the opcode in hex.
+    """
+    for name, opcode in vars(opcodes).items():
+        if not name.startswith("INS_"):
+            continue
+        _, mnemonic, *mode = (part for part in name.split("_") if part != f"{int(opcode):02X}")
+        mode = mode[0] if mode else DEFAULT_ADDRESSING_MODES.get(mnemonic)
+        if mode is None and mnemonic in ACCUMULATOR_MNEMONICS:
+            mode = "A"
+        yield int(opcode), mnemonic, mode
+
+
+def _instruction(mnemonic: str, mode: Optional[str]) -> Instruction:
+    """The handler for the mnemonic in the addressing mode"""
+    if mode == "A":
+        return getattr(CPU, f"ins_{mnemonic.lower()}_accumulator")
+    if mode is None:
+        return getattr(CPU, f"ins_{mnemonic.lower()}")
+    addressing_modes = ALWAYS_INDEXED_ADDRESSING_MODES if mnemonic in ALWAYS_INDEXED_MNEMONICS else ADDRESSING_MODES
+    return _with_addressing_mode(getattr(CPU, f"ins_{mnemonic.lower()}"), addressing_modes[mode])
+
+
+def _skipped_instruction(mnemonic: str, mode: Optional[str]) -> Instruction:
+    """The handler for the undocumented mnemonic in the addressing mode run as a NOP"""
+    if mode is None:
+        return CPU.ins_nop
+    if mnemonic in READ_MODIFY_WRITE_MNEMONICS:
+        operation = _skip_read_modify_write
+    elif mnemonic in STORE_MNEMONICS:
+        operation = _skip_store
+    else:
+        operation = _skip_read
+    addressing_modes = ALWAYS_INDEXED_ADDRESSING_MODES if mnemonic in ALWAYS_INDEXED_MNEMONICS else ADDRESSING_MODES
+    return _with_addressing_mode(operation, addressing_modes[mode])
+
+
+def build_instruction_table(undocumented: int = Undocumented.TRAP) -> List[Instruction]:
+    """Builds the 256 entry dispatch table, indexed by opcode, from the INS_<MNEMONIC>[_<MODE>] names in OpCodes
+
+    The undocumented opcodes are added from UndocumentedOpCodes as the policy says, see Undocumented.
+    """
+    instructions = [_not_implemented(Byte(opcode)) for opcode in range(0x100)]
+    for opcode, mnemonic, mode in opcode_names():
+        instructions[opcode] = _instruction(mnemonic, mode)
+    for opcode, mnemonic, mode in opcode_names(UndocumentedOpCodes):
+        if undocumented == Undocumented.IMPLEMENT:
+            instructions[opcode] = _instruction(mnemonic, mode)
+        elif undocumented == Undocumented.NOP:
+            instructions[opcode] = _skipped_instruction(mnemonic, mode)
+    return instructions
+
+
+# Undocumented policy -> dispatch table, so CPUs with the same policy share one
+INSTRUCTION_TABLES = {
+    policy: build_instruction_table(policy) for policy in (Undocumented.TRAP, Undocumented.IMPLEMENT, Undocumented.NOP)
+}
+CPU.instructions = INSTRUCTION_TABLES[Undocumented.TRAP]
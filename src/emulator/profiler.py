@@ -0,0 +1,130 @@
+"""Finds where the guest code spends its time
+
+Profiler.run runs the CPU an instruction at a time (CPU.step), noting the program counter, opcode
+and cycles taken of each instruction in preallocated lists. Every CHUNK instructions (and at the
+end of a run) those are added into NumPy counters with np.bincount, so the per instruction cost is
+a few list stores rather than NumPy calls:
+
+    executions[pc]  how many times the instruction at pc ran
+    cycles[pc]      the cycles it took in total
+    opcodes[opcode] how many times each opcode ran
+
+hot_ranges groups the executed addresses into runs of code (instructions no more than an operand
+apart) and ranks them by cycles, which picks out the guest's hot loops. report formats those and
+the most run opcodes, the ones worth making faster in the CPU.
+"""
+from typing import List, NamedTuple
+
+import numpy as np
+
+from .c_types import s32
+from .disassembler import OPCODE_TABLES
+from .m6502 import CPU
+
+# Instructions noted before they are added into the counters
+CHUNK = 1 << 16
+
+# Instructions further apart than an opcode and its longest operand start a new range
+RANGE_GAP = 3
+
+
+class HotRange(NamedTuple):
+    """A run of executed code from start to end (inclusive, the last instruction's address)"""
+
+    start: int
+    end: int
+    instructions: int
+    cycles: int
+    share: float  # Of all the cycles profiled
+
+
+class Profiler(object):
+    """Runs a CPU counting executions and cycles per address and executions per opcode
+
+        profiler = Profiler(cpu)
+        profiler.run(10_000_000)
+        print(profiler.report())
+    """
+
+    def __init__(self, cpu: CPU):
+        self.cpu = cpu
+        self.executions = np.zeros(0x10000, dtype=np.int64)
+        self.cycles = np.zeros(0x10000, dtype=np.int64)
+        self.opcodes = np.zeros(0x100, dtype=np.int64)
+        self.pcs = [0] * CHUNK
+        self.opcodes_run = [0] * CHUNK
+        self.cycles_taken = [0] * CHUNK
+
+    def __add_chunk(self, count: int) -> None:
+        pcs = np.array(self.pcs[:count], dtype=np.int64)
+        self.executions += np.bincount(pcs, minlength=0x10000)
+        self.cycles += np.bincount(pcs, weights=self.cycles_taken[:count], minlength=0x10000).astype(np.int64)
+        self.opcodes += np.bincount(self.opcodes_run[:count], minlength=0x100)
+
+    def run(self, cycles: s32) -> s32:
+        """Runs instructions until the requested cycles are used, profiling each, returns the cycles used"""
+        cpu = self.cpu
+        data = cpu.Memory.data
+        step = cpu.step
+        pcs, opcodes_run, cycles_taken = self.pcs, self.opcodes_run, self.cycles_taken
+        count = 0
+
+        cpu.cycles = cycles
+        try:
+            while cpu.cycles > 0:
+                pc = cpu.pc
+                before = cpu.cycles
+                pcs[count] = pc
+                # Before the step, which self modifying code could overwrite the opcode in
+                opcodes_run[count] = data[pc]
+                step()
+                cycles_taken[count] = before - cpu.cycles
+                count += 1
+                if count == CHUNK:
+                    self.__add_chunk(count)
+                    count = 0
+        finally:
+            # Counts the instructions run up to one which raises
+            self.__add_chunk(count)
+        return cycles - cpu.cycles
+
+    def hot_ranges(self, top: int = 10) -> List[HotRange]:
+        """The ranges of code which took the most cycles, most first"""
+        executed = np.flatnonzero(self.executions)
+        if not len(executed):
+            return []
+        total = int(self.cycles.sum())
+        breaks = np.flatnonzero(np.diff(executed) > RANGE_GAP) + 1
+        ranges = []
+        for addresses in np.split(executed, breaks):
+            cycles = int(self.cycles[addresses].sum())
+            ranges.append(
+                HotRange(
+                    int(addresses[0]),
+                    int(addresses[-1]),
+                    int(self.executions[addresses].sum()),
+                    cycles,
+                    cycles / total if total else 0.0,
+                )
+            )
+        ranges.sort(key=lambda hot_range: hot_range.cycles, reverse=True)
+        return ranges[:top]
+
+    def report(self, top: int = 10) -> str:
+        """The hottest ranges and most run opcodes as text"""
+        lines = [f"{'range':<13} {'instructions':>12} {'cycles':>12} {'share':>6}"]
+        for hot_range in self.hot_ranges(top):
+            lines.append(
+                f"${hot_range.start:04X}-${hot_range.end:04X} {hot_range.instructions:>12,} "
+                f"{hot_range.cycles:>12,} {hot_range.share:>6.1%}"
+            )
+        lines.append("")
+        lines.append(f"{'opcode':<13} {'executions':>12}")
+        opcodes = OPCODE_TABLES[self.cpu.undocumented]
+        for opcode in np.argsort(self.opcodes)[::-1][:top]:
+            if not self.opcodes[opcode]:
+                break
+            decoded = opcodes[opcode]
+            name = "???" if decoded is None else f"{decoded.mnemonic} {decoded.mode or ''}"
+            lines.append(f"${int(opcode):02X} {name:<9} {int(self.opcodes[opcode]):>12,}")
+        return "\n".join(lines)
@@ -0,0 +1,258 @@
+"""Records the input a session gets from its devices, so the session can be replayed exactly without them
+
+Everything a CPU does follows from its state, apart from what comes in from outside: the values
+devices put on the bus for reads, and the interrupts they assert. Recorder is a Scheduler which
+logs just those into an InputLog as it runs. Player is a Scheduler which, starting the CPU from the
+same state, maps stand-in devices over the same pages which return the logged values, and asserts
+the logged interrupts at the cycles they were asserted at, so the session runs again exactly, at
+full speed and with none of the host's devices attached.
+
+Interrupts are keyed by the cycle (Scheduler.now) they were asserted at, which is an instruction
+boundary and so the same on every run. Device reads are not given a cycle: FastCPU counts cycles in
+a local until an instruction finishes, so there is no exact cycle to give a read part way through
+one. They are logged in the order they happen instead, which the same inputs always reproduce, and
+each keeps its address, so a replay which goes a different way (the starting state was not the
+same) raises a ValueError at the first read that does not match rather than running on with the
+wrong values.
+
+The log is two byte streams. Reads are run length encoded as (count, address, value), so a loop
+polling a status register which does not change logs one entry however long it polls. Interrupts
+are (kind, cycles since the interrupt before). Counts and cycles are LEB128 varints, so most records
+are a few bytes. InputLog.save writes the streams after a header holding the pages the devices were
+mapped at, which is all Player needs to stand in for them.
+
+Devices should only reach the CPU through reads and through Scheduler.irq and nmi called from event
+callbacks: writes a device makes to RAM itself, or interrupts asserted part way through a run of the
+CPU, are not logged.
+"""
+import struct
+from typing import Iterator, List, Optional, Tuple
+
+from .m6502 import CPU, Device
+from .scheduler import Scheduler
+
+MAGIC = b"6502IN\x00\x01"
+IRQ = 0
+NMI = 1
+
+# MAGIC, number of regions, bytes of reads, bytes of interrupts
+_HEADER = struct.Struct("<8sHII")
+# Address and length of a region
+_REGION = struct.Struct("<II")
+_READ = struct.Struct("<HB")
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """The varint at the position and the position after it"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class InputLog(object):
+    """The reads and interrupts a Recorder logged, and the regions its devices were mapped at"""
+
+    def __init__(self, regions: Optional[List[Tuple[int, int]]] = None, reads: bytes = b"", interrupts: bytes = b""):
+        self.regions: List[Tuple[int, int]] = list(regions or [])
+        self.reads = bytearray(reads)
+        self.interrupts = bytearray(interrupts)
+        # The read being counted, not yet in reads
+        self.last_read: Tuple[int, int] = (-1, -1)
+        self.repeats = 0
+        self.last_interrupt = 0
+
+    def add_read(self, address: int, value: int) -> None:
+        """Logs a read of a device, counting it with the one before if it was the same"""
+        if (address, value) == self.last_read:
+            self.repeats += 1
+        else:
+            self.__flush()
+            self.last_read = (address, value)
+            self.repeats = 1
+
+    def add_interrupt(self, kind: int, time: int) -> None:
+        """Logs an IRQ or NMI asserted at the time"""
+        self.interrupts.append(kind)
+        _write_varint(self.interrupts, time - self.last_interrupt)
+        self.last_interrupt = time
+
+    def __flush(self) -> None:
+        if self.repeats:
+            _write_varint(self.reads, self.repeats)
+            self.reads += _READ.pack(*self.last_read)
+            self.repeats = 0
+
+    def iter_reads(self) -> Iterator[Tuple[int, int]]:
+        """Each read logged as (address, value)"""
+        self.__flush()
+        reads = bytes(self.reads)
+        position = 0
+        while position < len(reads):
+            count, position = _read_varint(reads, position)
+            read = _READ.unpack_from(reads, position)
+            position += _READ.size
+            for _ in range(count):
+                yield read
+
+    def iter_interrupts(self) -> Iterator[Tuple[int, int]]:
+        """Each interrupt logged as (kind, time)"""
+        interrupts = bytes(self.interrupts)
+        position = 0
+        time = 0
+        while position < len(interrupts):
+            kind = interrupts[position]
+            delta, position = _read_varint(interrupts, position + 1)
+            time += delta
+            yield kind, time
+
+    def to_bytes(self) -> bytes:
+        """The log in its binary form, see from_bytes"""
+        self.__flush()
+        header = _HEADER.pack(MAGIC, len(self.regions), len(self.reads), len(self.interrupts))
+        regions = b"".join(_REGION.pack(address, length) for address, length in self.regions)
+        return header + regions + bytes(self.reads) + bytes(self.interrupts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "InputLog":
+        """Reads a log written by to_bytes"""
+        if len(data) < _HEADER.size:
+            raise ValueError("Too short to be an input log")
+        magic, region_count, reads_length, interrupts_length = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not an input log")
+        position = _HEADER.size
+        regions = [_REGION.unpack_from(data, position + _REGION.size * index) for index in range(region_count)]
+        position += _REGION.size * region_count
+        if len(data) != position + reads_length + interrupts_length:
+            raise ValueError("Input log is truncated")
+        reads = data[position : position + reads_length]
+        return cls(regions, reads, data[position + reads_length :])
+
+    def save(self, path: str) -> None:
+        """Writes the log to the file"""
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "InputLog":
+        """Reads a log saved to the file"""
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+class RecordingDevice(Device):
+    """Passes reads and writes on to a device, logging the values it reads"""
+
+    def __init__(self, device: Device, log: InputLog):
+        self.device = device
+        self.log = log
+
+    def read(self, address: int) -> int:
+        value = self.device.read(address)
+        self.log.add_read(address, value)
+        return value
+
+    def write(self, address: int, value: int) -> None:
+        self.device.write(address, value)
+
+
+class ReplayDevice(Device):
+    """Stands in for a device, reading back the values in a log and ignoring writes"""
+
+    def __init__(self, reads: Iterator[Tuple[int, int]]):
+        self.reads = reads
+
+    def read(self, address: int) -> int:
+        logged = next(self.reads, None)
+        if logged is None:
+            raise ValueError(f"Read of {address:#06x} past the end of the input log")
+        if logged[0] != address:
+            raise ValueError(f"Replay diverged: read of {address:#06x} where the log has {logged[0]:#06x}")
+        return logged[1]
+
+    def write(self, address: int, value: int) -> None:
+        pass
+
+
+class Recorder(Scheduler):
+    """A Scheduler which logs the reads of its CPU's devices and the interrupts asserted into log
+
+        recorder = Recorder(cpu)
+        cpu.Memory.map_device(0xD000, 0x100, keyboard)
+        recorder.run(1_000_000)
+        recorder.log.save("session.input")
+
+    Devices mapped by the time run is called are recorded.
+    """
+
+    def __init__(self, cpu: CPU):
+        super().__init__(cpu)
+        self.log = InputLog()
+
+    def __record_devices(self) -> None:
+        memory = self.cpu.Memory
+        for address, length, kind, device in list(memory.regions):
+            if kind == "device" and not isinstance(device, RecordingDevice):
+                memory.unmap(address, length)
+                memory.map_device(address, length, RecordingDevice(device, self.log))
+                self.log.regions.append((address, length))
+
+    def irq(self) -> None:
+        """Makes an IRQ pending, logging it"""
+        self.log.add_interrupt(IRQ, self.now)
+        super().irq()
+
+    def nmi(self) -> None:
+        """Takes an NMI now, logging it"""
+        self.log.add_interrupt(NMI, self.now)
+        super().nmi()
+
+    def run(self, cycles: int, trap: bool = False) -> int:
+        self.__record_devices()
+        return super().run(cycles, trap)
+
+
+class Player(Scheduler):
+    """A Scheduler which replays a log from a Recorder started from the same CPU state
+
+    player = Player(cpu, InputLog.load("session.input"))
+    player.run(1_000_000)
+    """
+
+    def __init__(self, cpu: CPU, log: InputLog):
+        super().__init__(cpu)
+        self.log = log
+        memory = cpu.Memory
+        # One stream for all the stand-ins, as the reads were logged in the order made to any device
+        reads = log.iter_reads()
+        for address, length in log.regions:
+            memory.unmap(address, length)
+            memory.map_device(address, length, ReplayDevice(reads))
+        self.interrupts = log.iter_interrupts()
+        self.__schedule_next_interrupt()
+
+    def __schedule_next_interrupt(self) -> None:
+        interrupt = next(self.interrupts, None)
+        if interrupt is not None:
+            kind, time = interrupt
+            self.schedule(time, lambda scheduler: self.__interrupt(kind))
+
+    def __interrupt(self, kind: int) -> None:
+        if kind == NMI:
+            self.nmi()
+        else:
+            self.irq()
+        self.__schedule_next_interrupt()
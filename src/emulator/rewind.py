@@ -0,0 +1,190 @@
+"""Runs a CPU so it can go back in time: step_back, goto_cycle and goto_instruction
+
+Rewinder.run runs the CPU in slices of interval cycles and takes a checkpoint at the end of each.
+A checkpoint is the registers, the time (cycles run) and the instructions run, plus the contents of
+just the pages which changed since the checkpoint before. Those are found by comparing memory with
+a copy taken at the last checkpoint, 4 KiB blocks first and then the pages of the blocks which
+differ, so nothing is added to the CPU's write path and the cost to forward execution is a few tens
+of microseconds per interval, whatever the CPU does. The first checkpoint holds the whole memory.
+
+Going back restores the latest checkpoint at or before the point asked for and runs forward from
+it to the exact instruction. A page's contents at a checkpoint is the copy taken at the latest
+checkpoint (up to that one) which wrote the page, so a restore only puts back the pages ever
+written, never all 64 KiB. Running the CPU from a checkpoint is deterministic, so the instructions
+between checkpoints do not need logging: the pages written per interval are the write log, and
+going forward again replays the writes exactly. A longer interval stores fewer copies of busy pages
+but means more to replay on each seek.
+
+Only the CPU and RAM are checkpointed. Devices mapped on the bus keep their own state, and what
+they return on a replay is whatever they return then.
+"""
+import bisect
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .const import StopReason
+from .m6502 import CPU, UNLIMITED_CYCLES, Stop
+
+PAGE_SIZE = 0x100
+# Memory is compared a block at a time, then a page at a time within the blocks which changed
+BLOCK_SIZE = 0x1000
+
+
+class Checkpoint(NamedTuple):
+    """The registers at a point in a Rewinder's run, the pages are kept in Rewinder.page_history"""
+
+    time: int  # Cycles run when it was taken
+    instructions: int  # Instructions run when it was taken
+    registers: Tuple[int, int, int, int, int, int]  # a, x, y, sp, p, pc
+
+
+class Rewinder(object):
+    """Runs a CPU taking a checkpoint every interval cycles, so it can be taken back to any earlier instruction
+
+    rewinder = Rewinder(cpu, interval=1_000_000)
+    rewinder.run(100_000_000)
+    rewinder.step_back()
+    rewinder.goto_cycle(42_000_000)
+    """
+
+    def __init__(self, cpu: CPU, interval: int = 1_000_000):
+        self.cpu = cpu
+        self.interval = interval
+        self.now = 0
+        self.instructions = 0
+        # The furthest point run, goto_* can go anywhere up to here
+        self.end = 0
+        self.end_instructions = 0
+        self.checkpoints: List[Checkpoint] = []
+        # Page -> [(checkpoint index, contents)] for every checkpoint which wrote the page
+        self.page_history: Dict[int, List[Tuple[int, bytes]]] = {}
+        self.base = bytes(cpu.Memory.data)
+        # Memory at the last checkpoint taken or restored
+        self.image = self.base
+        self.__checkpoint()
+
+    def __changed_pages(self, current: bytes) -> List[int]:
+        """The pages which differ between current and the image"""
+        image = self.image
+        pages = []
+        for block in range(0, len(current), BLOCK_SIZE):
+            if current[block : block + BLOCK_SIZE] != image[block : block + BLOCK_SIZE]:
+                for address in range(block, block + BLOCK_SIZE, PAGE_SIZE):
+                    if current[address : address + PAGE_SIZE] != image[address : address + PAGE_SIZE]:
+                        pages.append(address >> 8)
+        return pages
+
+    def __checkpoint(self) -> None:
+        cpu = self.cpu
+        index = len(self.checkpoints)
+        current = bytes(cpu.Memory.data)
+        for page in self.__changed_pages(current):
+            address = page << 8
+            self.page_history.setdefault(page, []).append((index, current[address : address + PAGE_SIZE]))
+        self.image = current
+        self.checkpoints.append(Checkpoint(self.now, self.instructions, (cpu.a, cpu.x, cpu.y, cpu.sp, cpu.p, cpu.pc)))
+
+    def __truncate(self) -> None:
+        """Drops the checkpoints after now, so running on from a point gone back to records a new history"""
+        keep = bisect.bisect_right([checkpoint.time for checkpoint in self.checkpoints], self.now)
+        if keep == len(self.checkpoints):
+            return
+        del self.checkpoints[keep:]
+        for history in self.page_history.values():
+            while history and history[-1][0] >= keep:
+                history.pop()
+
+    def page_at(self, index: int, page: int) -> bytes:
+        """The contents of the page at the checkpoint"""
+        history = self.page_history.get(page)
+        if history:
+            # (index + 1,) sorts after every (index, contents) and before every (index + 1, contents)
+            position = bisect.bisect_left(history, (index + 1,))
+            if position:
+                return history[position - 1][1]
+        address = page << 8
+        return self.base[address : address + PAGE_SIZE]
+
+    def __restore(self, index: int) -> None:
+        cpu = self.cpu
+        memory = cpu.Memory
+        checkpoint = self.checkpoints[index]
+        data = memory.data
+        # Pages which have changed at any checkpoint, or since the last one
+        for page in set(self.page_history).union(self.__changed_pages(bytes(data))):
+            address = page << 8
+            contents = self.page_at(index, page)
+            if data[address : address + PAGE_SIZE] != contents:
+                memory.load(address, contents)
+        self.image = bytes(data)
+        cpu.a, cpu.x, cpu.y, cpu.sp, cpu.p, cpu.pc = checkpoint.registers
+        self.now, self.instructions = checkpoint.time, checkpoint.instructions
+
+    def __run(self, cycles: Optional[int], instructions: Optional[int], until_pc: Optional[int], trap: bool) -> Stop:
+        """Runs the CPU, without checkpoints, moving now on"""
+        stop = self.cpu.run(cycles, instructions, until_pc, trap)
+        self.now += stop.cycles
+        self.instructions += stop.instructions
+        if self.now > self.end:
+            self.end, self.end_instructions = self.now, self.instructions
+        return stop
+
+    def run(
+        self,
+        cycles: Optional[int] = None,
+        instructions: Optional[int] = None,
+        until_pc: Optional[int] = None,
+        trap: bool = False,
+    ) -> Stop:
+        """Runs until the first of the limits given is reached, like CPU.run, taking checkpoints on the way
+
+        If now is not the end of the run (after going back) the checkpoints after now are dropped
+        first, as the run from here on is recorded again.
+        """
+        self.__truncate()
+        self.end, self.end_instructions = self.now, self.instructions
+        budget = UNLIMITED_CYCLES if cycles is None else cycles
+        limit = instructions
+        used = 0
+        count = 0
+        while True:
+            next_checkpoint = self.checkpoints[-1].time + self.interval
+            slice_cycles = min(budget - used, next_checkpoint - self.now)
+            stop = self.__run(slice_cycles, None if limit is None else limit - count, until_pc, trap)
+            used += stop.cycles
+            count += stop.instructions
+            if self.now >= next_checkpoint:
+                self.__checkpoint()
+            if stop.reason != StopReason.CYCLES or used >= budget:
+                return Stop(stop.reason, count, used)
+
+    def __replay(self, cycles: Optional[int], instructions: Optional[int]) -> None:
+        """Runs forward for the cycles or instructions, past any breakpoints and watchpoints"""
+        while (cycles is None or cycles > 0) and (instructions is None or instructions > 0):
+            stop = self.__run(cycles, instructions, None, False)
+            cycles = None if cycles is None else cycles - stop.cycles
+            instructions = None if instructions is None else instructions - stop.instructions
+
+    def goto_cycle(self, time: int) -> None:
+        """Goes to the first instruction starting at or after the time, which must not be past the end of the run"""
+        if not 0 <= time <= self.end:
+            raise ValueError(f"Can only go to cycles 0 to {self.end}, not {time}")
+        index = bisect.bisect_right([checkpoint.time for checkpoint in self.checkpoints], time) - 1
+        self.__restore(index)
+        self.__replay(time - self.now, None)
+
+    def goto_instruction(self, count: int) -> None:
+        """Goes to just before the instruction with the count of instructions run"""
+        if not 0 <= count <= self.end_instructions:
+            raise ValueError(f"Can only go to instructions 0 to {self.end_instructions}, not {count}")
+        index = bisect.bisect_right([checkpoint.instructions for checkpoint in self.checkpoints], count) - 1
+        self.__restore(index)
+        self.__replay(None, count - self.instructions)
+
+    def step_back(self, instructions: int = 1) -> None:
+        """Goes back the number of instructions"""
+        self.goto_instruction(max(self.instructions - instructions, 0))
+
+    @property
+    def stored_bytes(self) -> int:
+        """The bytes of memory the checkpoints hold, on top of the first full copy"""
+        return sum(len(contents) for history in self.page_history.values() for _, contents in history)
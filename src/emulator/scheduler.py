@@ -0,0 +1,122 @@
+"""Keeps time for a CPU and the devices around it
+
+Scheduler.now counts the cycles run since the scheduler was made. Devices post events for a point
+in time (a timer running out, a byte arriving on a serial line) with schedule or schedule_in, and
+Scheduler.run executes the CPU straight through to the next event's time with CPU.run before
+calling it, so devices cost something per event rather than per instruction. Events are kept in a
+heap ordered by time, then by the order they were posted.
+
+Events fire at the first instruction boundary on or after their time, which is also where the CPU
+takes interrupts. nmi takes an NMI there and then. irq makes an IRQ pending, which is taken as soon
+as the I flag allows: while one is pending but masked the CPU is run an instruction at a time, so
+the IRQ goes in straight after the CLI (or RTI, PLP) which unmasks it.
+
+A run also ends early when the CPU stops for a reason of its own: at a breakpoint or watchpoint,
+or with trap at an instruction which jumps to itself (such as JAM). Scheduler.stop says why the last
+run ended, so a system with devices can be debugged like a bare CPU.
+"""
+import heapq
+import itertools
+from typing import Callable, List, Optional, Tuple
+
+from .const import ProcessorStatus, StopReason
+from .m6502 import CPU, Stop
+
+Callback = Callable[["Scheduler"], None]
+
+
+class Event(object):
+    """An event posted with Scheduler.schedule, which can be cancelled until it fires"""
+
+    __slots__ = ("time", "callback")
+
+    def __init__(self, time: int, callback: Optional[Callback]):
+        self.time = time
+        self.callback = callback
+
+    def cancel(self) -> None:
+        """Stops the event from firing"""
+        self.callback = None
+
+
+class Scheduler(object):
+    """Runs a CPU, calling the callbacks of events as the cycle count reaches their time
+
+        scheduler = Scheduler(cpu)
+        scheduler.schedule_in(10_000, lambda scheduler: scheduler.irq())
+        scheduler.run(1_000_000)
+    """
+
+    def __init__(self, cpu: CPU):
+        self.cpu = cpu
+        self.now = 0
+        self.irq_pending = False
+        # Why the last run ended, with the instructions and cycles it ran
+        self.stop: Optional[Stop] = None
+        # (time, sequence, event), the sequence keeps events for the same time in the order they were posted
+        self.events: List[Tuple[int, int, Event]] = []
+        self.sequence = itertools.count()
+
+    def schedule(self, time: int, callback: Callback) -> Event:
+        """Calls callback(scheduler) once now reaches the time"""
+        event = Event(time, callback)
+        heapq.heappush(self.events, (time, next(self.sequence), event))
+        return event
+
+    def schedule_in(self, cycles: int, callback: Callback) -> Event:
+        """Calls callback(scheduler) the number of cycles from now"""
+        return self.schedule(self.now + cycles, callback)
+
+    def next_event_time(self) -> Optional[int]:
+        """When the next event that has not been cancelled is due, None if there are none"""
+        events = self.events
+        while events and events[0][2].callback is None:
+            heapq.heappop(events)
+        return events[0][0] if events else None
+
+    def irq(self) -> None:
+        """Makes an IRQ pending, taken once the I flag is clear"""
+        self.irq_pending = True
+
+    def nmi(self) -> None:
+        """Takes an NMI now"""
+        self.now += self.cpu.nmi()
+
+    def __fire_due_events(self) -> None:
+        events = self.events
+        while events and events[0][0] <= self.now:
+            _, _, event = heapq.heappop(events)
+            callback = event.callback
+            if callback is not None:
+                event.callback = None
+                callback(self)
+
+    def run(self, cycles: int, trap: bool = False) -> int:
+        """Runs the CPU and fires the events due for at least the cycles, returns the cycles used
+
+        Returns early if the CPU stops at a breakpoint or watchpoint, or if trap, at an instruction
+        which leaves the program counter where it was. self.stop has the reason (CYCLES otherwise).
+        """
+        cpu = self.cpu
+        start = self.now
+        end = start + cycles
+        instructions = 0
+        while True:
+            self.__fire_due_events()
+            if self.irq_pending and not cpu.p & ProcessorStatus.InterruptDisableFlagBit:
+                self.irq_pending = False
+                self.now += cpu.irq()
+            if self.now >= end:
+                self.stop = Stop(StopReason.CYCLES, instructions, self.now - start)
+                return self.now - start
+            next_time = self.next_event_time()
+            until = end if next_time is None else min(next_time, end)
+            if self.irq_pending:
+                stop = cpu.run(until - self.now, instructions=1, trap=trap)
+            else:
+                stop = cpu.run(until - self.now, trap=trap)
+            self.now += stop.cycles
+            instructions += stop.instructions
+            if stop.reason not in (StopReason.CYCLES, StopReason.INSTRUCTIONS):
+                self.stop = Stop(stop.reason, instructions, self.now - start)
+                return self.now - start
@@ -0,0 +1,153 @@
+"""Records an instruction trace, for diffing against other emulators
+
+TraceRecorder.run runs the CPU an instruction at a time (CPU.step) and before each instruction packs
+a RECORD (program counter, opcode, the two bytes after it, A, X, Y, P, SP and the cycles run so far)
+into a preallocated bytearray with struct.pack_into. The buffer is a ring: once full it starts
+again from the beginning, so it holds the latest records. Given a path, each time the ring fills
+it is copied and handed to a background thread which appends it to the file, so the whole trace
+ends up on disk without the run loop waiting on writes. Call close (or use the recorder as a
+context manager) to write out the last part filled.
+
+Traces (records, or read_trace on a file) come back as a NumPy structured array with TRACE_DTYPE
+when NumPy is installed, or as a list of RECORD tuples when it is not. The bytes are the same
+either way.
+"""
+import queue
+import struct
+import threading
+from typing import Any, BinaryIO, Iterator, Optional, Tuple
+
+from .c_types import s32
+from .const import Undocumented
+from .disassembler import disassemble
+from .m6502 import CPU
+
+# pc, opcode, operand bytes 1 and 2, a, x, y, p, sp, cycles
+RECORD = struct.Struct("<HBBBBBBBBQ")
+FIELDS = ("pc", "opcode", "operand1", "operand2", "a", "x", "y", "p", "sp", "cycles")
+TRACE_DTYPE = [(name, format) for name, format in zip(FIELDS, ("<u2", *["u1"] * 8, "<u8"))]
+
+
+def _as_trace(data: bytes) -> Any:
+    """The records in data, as a NumPy structured array if NumPy is installed, otherwise a list of tuples"""
+    try:
+        import numpy as np
+    except ImportError:
+        return list(RECORD.iter_unpack(data))
+    return np.frombuffer(data, dtype=np.dtype(TRACE_DTYPE))
+
+
+def read_trace(path: str) -> Any:
+    """Reads a trace streamed to a file by a TraceRecorder"""
+    with open(path, "rb") as file:
+        return _as_trace(file.read())
+
+
+class TraceRecorder(object):
+    """Runs a CPU recording a trace of the instructions into a ring buffer, and optionally a file
+
+        with TraceRecorder(cpu, path="run.trace") as recorder:
+            recorder.run(1_000_000)
+        trace = read_trace("run.trace")
+    """
+
+    def __init__(self, cpu: CPU, size: int = 1 << 16, path: Optional[str] = None):
+        self.cpu = cpu
+        self.size = size
+        self.buffer = bytearray(size * RECORD.size)
+        # Where the next record goes in the buffer, in bytes
+        self.offset = 0
+        self.recorded = 0
+        self.cycles = 0
+        self.file: Optional[BinaryIO] = None
+        self.chunks: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self.writer: Optional[threading.Thread] = None
+        if path is not None:
+            self.file = open(path, "wb")
+            self.writer = threading.Thread(target=self.__write_chunks, name="trace writer", daemon=True)
+            self.writer.start()
+
+    def __write_chunks(self) -> None:
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                return
+            self.file.write(chunk)
+
+    def run(self, cycles: s32) -> s32:
+        """Runs instructions until the requested cycles are used, recording each, returns the cycles used"""
+        cpu = self.cpu
+        data = cpu.Memory.data
+        step = cpu.step
+        pack_into = RECORD.pack_into
+        record_size = RECORD.size
+        buffer = self.buffer
+        end = len(buffer)
+        offset = self.offset
+        start_cycles = self.cycles + cycles
+        recorded = 0
+
+        cpu.cycles = cycles
+        try:
+            while cpu.cycles > 0:
+                pc = cpu.pc
+                pack_into(
+                    buffer,
+                    offset,
+                    pc,
+                    data[pc],
+                    data[(pc + 1) & 0xFFFF],
+                    data[(pc + 2) & 0xFFFF],
+                    cpu.a,
+                    cpu.x,
+                    cpu.y,
+                    cpu.p,
+                    cpu.sp,
+                    start_cycles - cpu.cycles,
+                )
+                offset += record_size
+                recorded += 1
+                if offset == end:
+                    if self.file is not None:
+                        self.chunks.put(bytes(buffer))
+                    offset = 0
+                step()
+        finally:
+            # Kept if an instruction raises, so the trace leads up to (and includes) the one that failed
+            self.offset = offset
+            self.recorded += recorded
+            self.cycles = start_cycles - cpu.cycles
+        return cycles - cpu.cycles
+
+    def records(self) -> Any:
+        """The records still in the ring buffer, oldest first"""
+        if self.recorded < self.size:
+            return _as_trace(bytes(self.buffer[: self.offset]))
+        return _as_trace(bytes(self.buffer[self.offset :] + self.buffer[: self.offset]))
+
+    def close(self) -> None:
+        """Writes the rest of the trace to the file, waits for the writer and closes the file"""
+        if self.file is None:
+            return
+        self.chunks.put(bytes(self.buffer[: self.offset]))
+        self.chunks.put(None)
+        self.writer.join()
+        self.file.close()
+        self.file = None
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc_info: Tuple) -> None:
+        self.close()
+
+
+def trace_lines(trace: Any, undocumented: int = Undocumented.TRAP) -> Iterator[str]:
+    """Formats each record of a trace as a line of text, disassembling the instruction, for diffing with logs
+
+    Pass the traced CPU's undocumented policy to name the undocumented opcodes it ran.
+    """
+    for record in trace:
+        pc, opcode, operand1, operand2, a, x, y, p, sp, cycles = (int(value) for value in record)
+        instruction = next(disassemble(bytes([opcode, operand1, operand2]), origin=pc, undocumented=undocumented))
+        yield f"{instruction!s:<28}  A:{a:02X} X:{x:02X} Y:{y:02X} P:{p:02X} SP:{sp:02X} CYC:{cycles}"
@@ -0,0 +1,455 @@
+"""Translates 6502 basic blocks into Python functions
+
+A basic block is the run of instructions from an address up to and including the next branch,
+JMP, JSR, RTS, RTI or BRK. Translator.translate decodes a block once and generates a Python
+function for it, with the operands baked in as constants, the registers held in locals and the
+cycles the block always takes summed into a single subtraction. Only page crossings and taken
+branches are still counted as the block runs.
+
+Blocks are cached by their start address, so a loop is decoded the first time round and every
+later pass is a dictionary lookup and one call. The pages a block was translated from are watched
+(see Memory.watch_pages), so writing to one of them (self modifying code, loading a program over
+old code or CPU.restore) drops just the blocks containing the addresses written. A block which overwrites its
+own later instructions still runs to its end as translated, the next pass picks up the change.
+
+Translator.execute keeps to the cycles CPU.execute would run: a block is only called when the
+interpreter would have carried on to its last instruction, otherwise the CPU's own dispatch
+table runs the next instruction.
+"""
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from . import arithmetic
+from .arithmetic import ARITHMETIC_FLAGS
+from .c_types import s32
+from .const import NOT_ZERO_AND_NEGATIVE_FLAGS, ZERO_AND_NEGATIVE_FLAGS, ProcessorStatus
+from .m6502 import ALWAYS_INDEXED_MNEMONICS, CPU, Memory, opcode_names
+
+OPERAND_LENGTHS = {
+    None: 0,
+    "A": 0,
+    "IM": 1,
+    "ZP": 1,
+    "ZPX": 1,
+    "ZPY": 1,
+    "ABS": 2,
+    "ABSX": 2,
+    "ABSY": 2,
+    "IND": 2,
+    "INDX": 1,
+    "INDY": 1,
+    "REL": 1,
+}
+
+# Branch mnemonic -> (flag bit tested, whether the branch is taken when the bit is set)
+BRANCHES = {
+    "BEQ": (ProcessorStatus.ZeroFlagBit, True),
+    "BNE": (ProcessorStatus.ZeroFlagBit, False),
+    "BCS": (ProcessorStatus.CarryFlagBit, True),
+    "BCC": (ProcessorStatus.CarryFlagBit, False),
+    "BMI": (ProcessorStatus.NegativeFlagBit, True),
+    "BPL": (ProcessorStatus.NegativeFlagBit, False),
+    "BVS": (ProcessorStatus.OverflowFlagBit, True),
+    "BVC": (ProcessorStatus.OverflowFlagBit, False),
+}
+
+BLOCK_ENDING_MNEMONICS = {"JMP", "JSR", "RTS", "RTI", "BRK", *BRANCHES}
+
+# Opcode -> (mnemonic, addressing mode) for every instruction the translator understands, branches
+# are given the relative ("REL") mode for their offset
+DECODE: Dict[int, Tuple[str, Optional[str]]] = {
+    opcode: (mnemonic, "REL" if mnemonic in BRANCHES else mode) for opcode, mnemonic, mode in opcode_names()
+}
+
+# Keeps the generated functions a sensible size when there is a long run of straight line code
+MAX_BLOCK_INSTRUCTIONS = 64
+
+LOAD_REGISTERS = {"LDA": "a", "LDX": "x", "LDY": "y"}
+STORE_REGISTERS = {"STA": "a", "STX": "x", "STY": "y"}
+LOGICAL_OPERATORS = {"AND": "&", "ORA": "|", "EOR": "^"}
+COMPARE_REGISTERS = {"CMP": "a", "CPX": "x", "CPY": "y"}
+ARITHMETIC_TABLES = {"ADC": "ADC_TABLE", "SBC": "SBC_TABLE"}
+
+# Register moves and steps: mnemonic -> (statement, register whose Z/N flags it sets or None)
+REGISTER_OPERATIONS = {
+    "TAX": ("x = a", "x"),
+    "TAY": ("y = a", "y"),
+    "TXA": ("a = x", "a"),
+    "TYA": ("a = y", "a"),
+    "TSX": ("x = sp", "x"),
+    "TXS": ("sp = x", None),
+    "INX": ("x = (x + 1) & 0xFF", "x"),
+    "INY": ("y = (y + 1) & 0xFF", "y"),
+    "DEX": ("x = (x - 1) & 0xFF", "x"),
+    "DEY": ("y = (y - 1) & 0xFF", "y"),
+}
+
+FLAG_OPERATIONS = {
+    "CLC": f"p &= 0x{0xFF & ~ProcessorStatus.CarryFlagBit:02X}",
+    "SEC": f"p |= 0x{ProcessorStatus.CarryFlagBit:02X}",
+    "CLD": f"p &= 0x{0xFF & ~ProcessorStatus.DecimalFlagBit:02X}",
+    "SED": f"p |= 0x{ProcessorStatus.DecimalFlagBit:02X}",
+    "CLI": f"p &= 0x{0xFF & ~ProcessorStatus.InterruptDisableFlagBit:02X}",
+    "SEI": f"p |= 0x{ProcessorStatus.InterruptDisableFlagBit:02X}",
+    "CLV": f"p &= 0x{0xFF & ~ProcessorStatus.OverflowFlagBit:02X}",
+    "NOP": "",
+}
+
+# Shifts and rotates of {r}, setting the carry from the bit shifted out
+SHIFT_OPERATIONS = {
+    "ASL": ["p = (p & 0xFE) | {r} >> 7", "{r} = ({r} << 1) & 0xFF"],
+    "LSR": ["p = (p & 0xFE) | ({r} & 0x01)", "{r} >>= 1"],
+    "ROL": ["{r} = ({r} << 1) | (p & 0x01)", "p = (p & 0xFE) | {r} >> 8", "{r} &= 0xFF"],
+    "ROR": ["carry = {r} & 0x01", "{r} = ({r} >> 1) | (p & 0x01) << 7", "p = (p & 0xFE) | carry"],
+}
+
+STATUS_PUSHED = ProcessorStatus.BreakFlagBit | ProcessorStatus.UnusedFlagBit
+STATUS_PULLED_MASK = 0xFF & ~STATUS_PUSHED
+
+# The namespace the generated functions run in
+BLOCK_GLOBALS = {
+    "arithmetic": arithmetic,
+    "ZERO_AND_NEGATIVE_FLAGS": ZERO_AND_NEGATIVE_FLAGS,
+}
+
+
+class Block(NamedTuple):
+    start: int
+    length: int  # In bytes, from start
+    instructions: int
+    cycle_budget: int  # The most cycles the instructions before the last one can take
+    function: Callable[[CPU, Callable, Callable], None]
+    source: str
+
+
+def block_pages(block: Block) -> Set[int]:
+    """The pages the block's code is on"""
+    return {block.start >> 8, ((block.start + block.length - 1) & 0xFFFF) >> 8}
+
+
+def _set_zero_and_negative_flags(register: str) -> str:
+    return f"p = (p & 0x{0xFF & NOT_ZERO_AND_NEGATIVE_FLAGS:02X}) | ZERO_AND_NEGATIVE_FLAGS[{register}]"
+
+
+def _push(value: str) -> List[str]:
+    return [f"write(0x100 | sp, {value})", "sp = (sp - 1) & 0xFF"]
+
+
+def _pull_word() -> List[str]:
+    return [
+        "pc = read(0x100 | ((sp + 1) & 0xFF)) | read(0x100 | ((sp + 2) & 0xFF)) << 8",
+        "sp = (sp + 2) & 0xFF",
+    ]
+
+
+def _return_address(address: Optional[int], runtime: str, offset: int) -> Tuple[str, str]:
+    """Returns the (high, low) byte expressions of the address offset bytes on from the instruction's
+
+    runtime is the expression for it from pc when the instruction is decoded at run time.
+    """
+    if address is None:
+        return f"({runtime}) >> 8", f"{runtime} & 0xFF"
+    return_address = (address + offset) & 0xFFFF
+    return f"0x{return_address >> 8:02X}", f"0x{return_address & 0xFF:02X}"
+
+
+def _effective_address(mode: str, operand: Optional[int], always_indexed: bool) -> Tuple[List[str], str, int, int]:
+    """Returns (statements, address expression, fixed cycles, page crossing cycles) for an addressing mode
+
+    The cycles are the ones the mode takes on top of fetching the opcode and operand. An operand of
+    None means it is only known at run time, in the local operand.
+    """
+    value = "operand" if operand is None else f"0x{operand:0{2 * OPERAND_LENGTHS[mode]}X}"
+    if mode in ("ZP", "ABS"):
+        return [], value, 0, 0
+    if mode in ("ZPX", "ZPY"):
+        index = mode[-1].lower()
+        return [f"address = ({value} + {index}) & 0xFF"], "address", 1, 0
+    if mode in ("ABSX", "ABSY"):
+        index = mode[-1].lower()
+        statements = [f"address = ({value} + {index}) & 0xFFFF"]
+        if always_indexed:
+            return statements, "address", 1, 0
+        if operand is None:
+            statements.append(f"if (operand & 0xFF) + {index} > 0xFF:")
+        else:
+            statements.append(f"if {index} > 0x{0xFF - (operand & 0xFF):02X}:")
+        statements.append("    cycles -= 1")
+        return statements, "address", 0, 1
+    if mode == "INDX":
+        statements = [
+            f"pointer = ({value} + x) & 0xFF",
+            "address = read(pointer) | read((pointer + 1) & 0xFF) << 8",
+        ]
+        return statements, "address", 3, 0
+    if mode == "INDY":
+        high = "(operand + 1) & 0xFF" if operand is None else f"0x{(operand + 1) & 0xFF:02X}"
+        statements = [
+            f"pointer = read({value}) | read({high}) << 8",
+            "address = (pointer + y) & 0xFFFF",
+        ]
+        if always_indexed:
+            return statements, "address", 3, 0
+        statements.append("if (pointer & 0xFF) + y > 0xFF:")
+        statements.append("    cycles -= 1")
+        return statements, "address", 2, 1
+    raise ValueError(f"Addressing mode {mode} has no effective address")
+
+
+def translate_instruction(
+    address: Optional[int], mnemonic: str, mode: Optional[str], operand: Optional[int]
+) -> Tuple[List[str], int, int]:
+    """Returns (statements, fixed cycles, most extra cycles) for the instruction at the address
+
+    The statements work on the locals of a block function: a, x, y, p, sp, pc and cycles. Instructions
+    which end a block set pc, the rest leave it alone.
+
+    With an address and operand of None the instruction is decoded at run time instead (see
+    emulator/fast.py): the statements expect the operand in the local operand and pc to already be
+    the address of the next instruction.
+    """
+    cycles = 1 + OPERAND_LENGTHS[mode]
+    runtime = address is None
+    value = "operand" if runtime else f"0x{operand:0{2 * OPERAND_LENGTHS[mode]}X}"
+
+    if mnemonic in BRANCHES:
+        bit, taken_when_set = BRANCHES[mnemonic]
+        condition = f"p & 0x{bit:02X}" if taken_when_set else f"not p & 0x{bit:02X}"
+        if runtime:
+            statements = [
+                f"if {condition}:",
+                "    target = (pc + (operand - 0x100 if operand & 0x80 else operand)) & 0xFFFF",
+                "    cycles -= 1 if target >> 8 == pc >> 8 else 2",
+                "    pc = target",
+            ]
+            return statements, cycles, 2
+        next_address = (address + 1 + OPERAND_LENGTHS[mode]) & 0xFFFF
+        offset = operand - 0x100 if operand & 0x80 else operand
+        target = (next_address + offset) & 0xFFFF
+        taken_cycles = 1 if target >> 8 == next_address >> 8 else 2
+        statements = [
+            f"if {condition}:",
+            f"    pc = 0x{target:04X}",
+            f"    cycles -= {taken_cycles}",
+            "else:",
+            f"    pc = 0x{next_address:04X}",
+        ]
+        return statements, cycles, taken_cycles
+    if mnemonic in REGISTER_OPERATIONS:
+        statement, register = REGISTER_OPERATIONS[mnemonic]
+        statements = [statement]
+        if register is not None:
+            statements.append(_set_zero_and_negative_flags(register))
+        return statements, cycles + 1, 0
+    if mnemonic in FLAG_OPERATIONS:
+        statement = FLAG_OPERATIONS[mnemonic]
+        return [statement] if statement else [], cycles + 1, 0
+    if mnemonic in SHIFT_OPERATIONS and mode == "A":
+        statements = [statement.format(r="a") for statement in SHIFT_OPERATIONS[mnemonic]]
+        return statements + [_set_zero_and_negative_flags("a")], cycles + 1, 0
+    if mnemonic == "PHA":
+        return _push("a"), cycles + 2, 0
+    if mnemonic == "PHP":
+        return _push(f"p | 0x{STATUS_PUSHED:02X}"), cycles + 2, 0
+    if mnemonic == "PLA":
+        statements = ["sp = (sp + 1) & 0xFF", "a = read(0x100 | sp)", _set_zero_and_negative_flags("a")]
+        return statements, cycles + 3, 0
+    if mnemonic == "PLP":
+        return ["sp = (sp + 1) & 0xFF", f"p = read(0x100 | sp) & 0x{STATUS_PULLED_MASK:02X}"], cycles + 3, 0
+    if mnemonic == "RTS":
+        statements = _pull_word() + ["pc = (pc + 1) & 0xFFFF"]
+        return statements, cycles + 5, 0
+    if mnemonic == "RTI":
+        statements = ["sp = (sp + 1) & 0xFF", f"p = read(0x100 | sp) & 0x{STATUS_PULLED_MASK:02X}"] + _pull_word()
+        return statements, cycles + 5, 0
+    if mnemonic == "BRK":
+        high, low = _return_address(address, "(pc + 1) & 0xFFFF", 2)
+        statements = (
+            _push(high)
+            + _push(low)
+            + _push(f"p | 0x{STATUS_PUSHED:02X}")
+            + [
+                "pc = read(0xFFFE) | read(0xFFFF) << 8",
+                f"p |= 0x{ProcessorStatus.BreakFlagBit | ProcessorStatus.InterruptDisableFlagBit:02X}",
+            ]
+        )
+        return statements, cycles + 6, 0
+    if mnemonic == "JMP":
+        if mode == "IND":
+            high = "(operand + 1) & 0xFFFF" if runtime else f"0x{(operand + 1) & 0xFFFF:04X}"
+            return [f"pc = read({value}) | read({high}) << 8"], cycles + 2, 0
+        return [f"pc = {value}"], cycles, 0
+    if mnemonic == "JSR":
+        high, low = _return_address(address, "(pc - 1) & 0xFFFF", 2)
+        statements = _push(high) + _push(low) + [f"pc = {value}"]
+        return statements, cycles + 3, 0
+
+    # Everything left works on memory, or an immediate operand
+    if mode == "IM":
+        # Reading the operand is the fetch of the instruction's second byte, already counted
+        statements, page_cycles = [], 0
+        cycles -= 1
+    else:
+        statements, effective_address, mode_cycles, page_cycles = _effective_address(
+            mode, operand, mnemonic in ALWAYS_INDEXED_MNEMONICS
+        )
+        value = f"read({effective_address})"
+        cycles += mode_cycles
+
+    if mnemonic in LOAD_REGISTERS:
+        register = LOAD_REGISTERS[mnemonic]
+        statements += [f"{register} = {value}", _set_zero_and_negative_flags(register)]
+        return statements, cycles + 1, page_cycles
+    if mnemonic in STORE_REGISTERS:
+        statements.append(f"write({effective_address}, {STORE_REGISTERS[mnemonic]})")
+        return statements, cycles + 1, page_cycles
+    if mnemonic in LOGICAL_OPERATORS:
+        statements += [f"a {LOGICAL_OPERATORS[mnemonic]}= {value}", _set_zero_and_negative_flags("a")]
+        return statements, cycles + 1, page_cycles
+    if mnemonic in ARITHMETIC_TABLES:
+        statements += [
+            f"entry = arithmetic.{ARITHMETIC_TABLES[mnemonic]}[(p & 0x08) << 14 | (p & 0x01) << 16 | a << 8 | {value}]",
+            "a = entry & 0xFF",
+            f"p = (p & 0x{0xFF & ~ARITHMETIC_FLAGS:02X}) | entry >> 8",
+        ]
+        return statements, cycles + 1, page_cycles
+    if mnemonic in COMPARE_REGISTERS:
+        register = COMPARE_REGISTERS[mnemonic]
+        statements += [
+            f"value = {value}",
+            f"p = (p & 0x7C) | (({register} - value) & 0x80) | (0x02 if {register} == value else 0) | ({register} >= value)",
+        ]
+        return statements, cycles + 1, page_cycles
+    if mnemonic == "BIT":
+        statements += [
+            f"value = {value}",
+            "p = (p & 0x3D) | (value & 0xC0) | (0 if a & value else 0x02)",
+        ]
+        return statements, cycles + 1, page_cycles
+    if mnemonic in SHIFT_OPERATIONS:
+        statements.append(f"value = {value}")
+        statements += [statement.format(r="value") for statement in SHIFT_OPERATIONS[mnemonic]]
+        statements += [f"write({effective_address}, value)", _set_zero_and_negative_flags("value")]
+        return statements, cycles + 3, page_cycles
+    if mnemonic in ("INC", "DEC"):
+        step = "+" if mnemonic == "INC" else "-"
+        statements += [
+            f"value = ({value} {step} 1) & 0xFF",
+            f"write({effective_address}, value)",
+            _set_zero_and_negative_flags("value"),
+        ]
+        return statements, cycles + 3, page_cycles
+    raise ValueError(f"Instruction {mnemonic} {mode} can not be translated")
+
+
+class Translator(object):
+    """Runs a CPU by translating its code into Python functions a basic block at a time
+
+    Usage is the same as CPU.execute:
+
+        translator = Translator(cpu)
+        cycles_used = translator.execute(10_000)
+    """
+
+    def __init__(self, cpu: CPU):
+        self.cpu = cpu
+        self.memory: Memory = cpu.Memory
+        self.memory.watch_writes(self.invalidate)
+        self.blocks: Dict[int, Block] = {}
+        # Page -> start addresses of the blocks with code on the page
+        self.pages: Dict[int, Set[int]] = {}
+
+    def translate(self, start: int) -> Optional[Block]:
+        """Translates and caches the block starting at the address, None if its first opcode can not be translated"""
+        read = self.memory.read
+        body: List[str] = []
+        fixed_cycles = 0
+        cycle_budget = 0
+        last_cycles = 0
+        address = start
+        instructions = 0
+        mnemonic = None
+        while instructions < MAX_BLOCK_INSTRUCTIONS and mnemonic not in BLOCK_ENDING_MNEMONICS:
+            opcode = read(address)
+            if opcode not in DECODE:
+                break
+            mnemonic, mode = DECODE[opcode]
+            length = OPERAND_LENGTHS[mode]
+            operand = 0
+            for i in range(length):
+                operand |= read((address + 1 + i) & 0xFFFF) << (8 * i)
+            statements, cycles, extra_cycles = translate_instruction(address, mnemonic, mode, operand)
+
+            body.append(f"# ${address:04X} {mnemonic} {mode or ''}".rstrip())
+            body += statements
+            fixed_cycles += cycles
+            cycle_budget += last_cycles
+            last_cycles = cycles + extra_cycles
+            address = (address + 1 + length) & 0xFFFF
+            instructions += 1
+        if not instructions:
+            return None
+        if mnemonic not in BLOCK_ENDING_MNEMONICS:
+            body.append(f"pc = 0x{address:04X}")
+
+        name = f"block_{start:04X}"
+        source = "\n".join(
+            [
+                f"def {name}(cpu, read, write):",
+                "    a, x, y, p, sp = cpu.a, cpu.x, cpu.y, cpu.p, cpu.sp",
+                f"    cycles = cpu.cycles - {fixed_cycles}",
+                *(f"    {statement}" for statement in body),
+                "    cpu.a, cpu.x, cpu.y, cpu.p, cpu.sp, cpu.pc = a, x, y, p, sp, pc",
+                "    cpu.cycles = cycles",
+            ]
+        )
+        namespace = dict(BLOCK_GLOBALS)
+        exec(compile(source, f"<6502 block ${start:04X}>", "exec"), namespace)
+        block = Block(start, (address - start) & 0xFFFF, instructions, cycle_budget, namespace[name], source)
+        self.blocks[start] = block
+        for page in block_pages(block):
+            self.pages.setdefault(page, set()).add(start)
+        self.memory.watch_pages(block.start, block.length)
+        return block
+
+    def invalidate(self, address: Optional[int] = None, length: int = 1) -> None:
+        """Drops the cached blocks translated from the length bytes at the address, or every block if no address"""
+        if address is None:
+            self.blocks.clear()
+            self.pages.clear()
+            return
+        last_address = (address + length - 1) & 0xFFFF
+        for page in {address >> 8, last_address >> 8}:
+            starts = self.pages.get(page)
+            if not starts:
+                continue
+            for start in list(starts):
+                block = self.blocks[start]
+                if (address - start) & 0xFFFF < block.length or (start - address) & 0xFFFF < length:
+                    del self.blocks[start]
+                    for block_page in block_pages(block):
+                        self.pages[block_page].discard(start)
+            if starts:
+                # Other blocks on the page are still cached, so keep hearing about writes to it
+                self.memory.watch_pages(page << 8, 1)
+
+    def execute(self, cycles: s32) -> s32:
+        """Runs instructions until the requested cycles are used, returns the number of cycles that were used"""
+        cpu = self.cpu
+        if cpu.Memory is not self.memory:
+            # The CPU has been reset, none of the blocks are for the new memory
+            self.memory = cpu.Memory
+            self.memory.watch_writes(self.invalidate)
+            self.invalidate()
+        read = self.memory.read
+        write = self.memory.write
+        blocks = self.blocks
+        instructions = cpu.instructions
+
+        cpu.cycles = cycles
+        while cpu.cycles > 0:
+            block = blocks.get(cpu.pc) or self.translate(cpu.pc)
+            if block is not None and cpu.cycles > block.cycle_budget:
+                block.function(cpu, read, write)
+            else:
+                instructions[cpu.fetch_byte()](cpu)
+        return cycles - cpu.cycles
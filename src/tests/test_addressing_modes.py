@@ -0,0 +1,60 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..benchmarks.addressing_modes import ORIGIN, format_timings, prepare, time_opcode, time_opcodes
+from ..emulator.disassembler import OPCODES
+from ..emulator.fast import BASE_CYCLES
+
+
+@pytest.mark.parametrize("engine", ["cpu", "fast"])
+def test_every_opcode_is_timed_slowest_first(engine):
+    # when:
+    timings = time_opcodes(engine, iterations=5)
+
+    # then:
+    AssertThat(sorted(timing.opcode for timing in timings)).IsEqualTo(
+        [opcode for opcode in range(0x100) if OPCODES[opcode] is not None]
+    )
+    ns = [timing.ns_per_instruction for timing in timings]
+    AssertThat(ns).IsEqualTo(sorted(ns, reverse=True))
+
+
+@pytest.mark.parametrize("opcode", [0xEA, 0xB5, 0xBD, 0xB1, 0x81, 0x6C, 0x20])
+def test_timed_cycles_are_the_base_cycles(opcode):
+    # when:
+    timing = time_opcode("cpu", opcode, iterations=5)
+
+    # then:
+    AssertThat(timing.cycles).IsEqualTo(BASE_CYCLES[opcode])
+    AssertThat(timing.ns_per_cycle).IsEqualTo(timing.ns_per_instruction / timing.cycles)
+
+
+def test_indirect_operands_point_into_memory():
+    # given:
+    cpu = prepare("cpu", 0xB1)
+    cpu.Memory.data[0x0400] = 0x99
+
+    # when:
+    cpu.step()
+
+    # then:
+    AssertThat(cpu.a).IsEqualTo(0x99)
+    AssertThat(cpu.pc).IsEqualTo(ORIGIN + 2)
+
+
+def test_format_timings_is_relative_to_nop():
+    # given:
+    timings = time_opcodes("fast", iterations=5, opcodes=[0xEA, 0xA9])
+
+    # when:
+    table = format_timings(timings)
+
+    # then:
+    AssertThat(table).Contains("NOP      imp")
+    AssertThat(table).Contains("LDA      IM")
+    AssertThat(table).Contains("x NOP")
+
+
+def test_undocumented_opcodes_can_not_be_timed():
+    with pytest.raises(ValueError):
+        prepare("cpu", 0xA7)
@@ -0,0 +1,68 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..benchmarks.instructions_per_second import copy_loop
+from ..emulator.c_types import Byte
+from ..emulator.const import Undocumented
+from ..emulator.m6502 import CPU
+from ..emulator.translator import DECODE
+from .test_translator import random_cpu, registers
+
+np = pytest.importorskip("numpy")
+batch = pytest.importorskip("src.emulator.batch")
+
+
+@pytest.mark.parametrize("opcode", sorted(DECODE), ids=lambda opcode: f"{DECODE[opcode][0]}_{opcode:02X}")
+def test_batch_instruction_matches_the_interpreter(opcode):
+    cpus = []
+    for seed in range(16):
+        cpu, rng = random_cpu(seed)
+        cpu.pc = rng.getrandbits(16)
+        cpu.Memory.data[cpu.pc] = opcode
+        cpus.append(cpu)
+    lanes = batch.BatchCPU.from_cpus(cpus)
+
+    cycles_used = lanes.execute(1)
+
+    for lane, cpu in enumerate(cpus):
+        AssertThat(int(cycles_used[lane])).IsEqualTo(cpu.execute(1))
+        AssertThat(registers(lanes.lane(lane))).IsEqualTo(registers(cpu))
+        AssertThat(lanes.memory[lane].tobytes() == bytes(cpu.Memory.data)).IsTrue()
+
+
+def test_batch_runs_each_lane_like_its_own_cpu():
+    program = [Byte(x) for x in copy_loop]
+    cpus = []
+    for lane in range(8):
+        cpu = CPU()
+        cpu.program_counter = cpu.load_program(program, len(program))
+        cpu.Memory.data[0x0300:0x0380] = bytes((lane * 37 + i) & 0xFF for i in range(0x80))
+        cpu.p = lane & 0x09  # Some lanes in decimal mode, some with the carry set
+        cpus.append(cpu)
+    lanes = batch.BatchCPU.from_cpus(cpus)
+
+    for cycles in (1, 7, 3_000, 3):
+        cycles_used = lanes.execute(cycles)
+        for lane, cpu in enumerate(cpus):
+            AssertThat(int(cycles_used[lane])).IsEqualTo(cpu.execute(cycles))
+            AssertThat(registers(lanes.lane(lane))).IsEqualTo(registers(cpu))
+    for lane, cpu in enumerate(cpus):
+        AssertThat(lanes.memory[lane].tobytes() == bytes(cpu.Memory.data)).IsTrue()
+
+
+def test_batch_raises_for_opcodes_that_are_not_implemented():
+    lanes = batch.BatchCPU(4)
+    lanes.pc[:] = 0x0200
+    lanes.memory[:, 0x0200] = 0x02
+
+    with AssertThat(NotImplementedError).IsRaised():
+        lanes.execute(1)
+
+
+def test_batch_rejects_cpus_which_run_undocumented_opcodes():
+    with pytest.raises(ValueError, match="CPU 1 has Undocumented.IMPLEMENT"):
+        batch.BatchCPU.from_cpus([CPU(), CPU(undocumented=Undocumented.IMPLEMENT)])
+    with pytest.raises(ValueError, match="Undocumented.NOP"):
+        batch.BatchCPU.from_cpus([CPU(undocumented=Undocumented.NOP)])
+    with pytest.raises(ValueError):
+        batch.BatchCPU(1, Undocumented.IMPLEMENT)
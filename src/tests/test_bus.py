@@ -0,0 +1,176 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..emulator.const import OpCodes
+from ..emulator.m6502 import CPU, Device, Memory
+from ..emulator.translator import Translator
+
+
+class Latch(Device):
+    """Remembers the writes made to it and reads back as the low byte of the address plus the last value"""
+
+    def __init__(self):
+        self.writes = []
+
+    def read(self, address):
+        return (address + (self.writes[-1][1] if self.writes else 0)) & 0xFF
+
+    def write(self, address, value):
+        self.writes.append((address, value))
+
+
+def load_device_program(cpu):
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_LDA_IM
+    cpu.Memory[0xFF01] = 0x42
+    cpu.Memory[0xFF02] = OpCodes.INS_STA_ABS
+    cpu.Memory[0xFF03] = 0x10
+    cpu.Memory[0xFF04] = 0xD0
+    cpu.Memory[0xFF05] = OpCodes.INS_LDX_ABS
+    cpu.Memory[0xFF06] = 0x01
+    cpu.Memory[0xFF07] = 0xD0
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_device_pages_go_to_the_device(checked):
+    # Given:
+    memory = Memory(checked)
+    latch = Latch()
+    memory.map_device(0xD000, 0x100, latch)
+
+    # When:
+    memory.write(0xD010, 0x42)
+    memory.write(0xD100, 0x24)
+
+    # Then:
+    AssertThat(latch.writes).ContainsExactly((0xD010, 0x42))
+    AssertThat(memory.read(0xD001)).IsEqualTo(0x43)
+    AssertThat(memory.data[0xD010]).IsEqualTo(0)
+    AssertThat(memory.read(0xD100)).IsEqualTo(0x24)
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_cpu_reads_and_writes_devices(checked):
+    # Given:
+    cpu = CPU(Memory(checked))
+    latch = Latch()
+    cpu.Memory.map_device(0xD000, 0x100, latch)
+    load_device_program(cpu)
+
+    # When:
+    cpu.execute(10)
+
+    # Then:
+    AssertThat(latch.writes).ContainsExactly((0xD010, 0x42))
+    AssertThat(cpu.X).IsEqualTo(0x43)
+
+
+def test_translated_code_reads_and_writes_devices():
+    # Given:
+    cpu = CPU(Memory(checked=False))
+    latch = Latch()
+    cpu.Memory.map_device(0xD000, 0x100, latch)
+    load_device_program(cpu)
+
+    # When:
+    Translator(cpu).execute(10)
+
+    # Then:
+    AssertThat(latch.writes).ContainsExactly((0xD010, 0x42))
+    AssertThat(cpu.X).IsEqualTo(0x43)
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_rom_ignores_writes(checked):
+    # Given:
+    memory = Memory(checked)
+    memory.map_rom(0xE000, bytes(range(0x100)) * 2)
+
+    # When:
+    memory.write(0xE101, 0x00)
+    memory[0xE002] = 0xFF
+
+    # Then:
+    AssertThat(memory.read(0xE101)).IsEqualTo(0x01)
+    AssertThat(memory[0xE002]).IsEqualTo(0x02)
+    AssertThat(memory.read_handlers[0xE0]).IsNone()
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_mirrors_are_another_view_of_the_same_ram(checked):
+    # Given:
+    memory = Memory(checked)
+    memory.map_mirror(0x0800, 0x0800, 0x0000)
+
+    # When:
+    memory.write(0x0812, 0x34)
+    memory.write(0x0013, 0x56)
+
+    # Then:
+    AssertThat(memory.data[0x0012]).IsEqualTo(0x34)
+    AssertThat(memory.data[0x0812]).IsEqualTo(0)
+    AssertThat(memory.read(0x0813)).IsEqualTo(0x56)
+
+
+def test_writes_through_a_mirror_are_watched():
+    # Given:
+    memory = Memory(checked=False)
+    memory.map_mirror(0x0800, 0x0800, 0x0000)
+    memory.track_dirty_pages()
+
+    # When:
+    memory.write(0x0812, 0x34)
+
+    # Then:
+    AssertThat(memory.dirty_pages).ContainsExactly(0x00)
+
+
+def test_unchecked_memory_uses_the_bytearray_until_something_is_mapped():
+    # Given:
+    memory = Memory(checked=False)
+    AssertThat(memory.read).IsEqualTo(memory.data.__getitem__)
+
+    # When:
+    memory.map_device(0xD000, 0x100, Latch())
+    AssertThat(memory.read).IsNotEqualTo(memory.data.__getitem__)
+    memory.unmap(0xD000, 1)
+
+    # Then:
+    AssertThat(memory.read).IsEqualTo(memory.data.__getitem__)
+    AssertThat(memory.write).IsEqualTo(memory.data.__setitem__)
+    AssertThat(memory.regions).IsEmpty()
+
+
+def test_only_whole_pages_can_be_mapped():
+    memory = Memory()
+    with pytest.raises(ValueError):
+        memory.map_device(0xD010, 0x100, Latch())
+    with pytest.raises(ValueError):
+        memory.map_mirror(0xFF00, 0x200, 0x0000)
+
+
+def test_mirrors_must_be_of_memory():
+    memory = Memory()
+    with pytest.raises(ValueError):
+        memory.map_mirror(0xF000, 0x1000, 0xFF00)
+    with pytest.raises(ValueError):
+        memory.map_mirror(0xF000, 0x100, -0x100)
+    AssertThat(memory.regions).IsEmpty()
+
+
+def test_reset_and_fork_keep_the_mappings(cpu):
+    # Given:
+    latch = Latch()
+    cpu.Memory.map_device(0xD000, 0x100, latch)
+    cpu.Memory.map_rom(0xFF00, bytes([0xEA]) * 0x100)
+
+    # When:
+    cpu.reset()
+    fork = cpu.fork()
+
+    # Then:
+    for memory in (cpu.Memory, fork.Memory):
+        memory.write(0xD000, 1)
+        memory.write(0xFF00, 0)
+        AssertThat(memory.read(0xFF00)).IsEqualTo(0xEA)
+    AssertThat(latch.writes).HasSize(2)
@@ -0,0 +1,112 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..emulator.const import OpCodes, StopReason
+from ..emulator.fast import FastCPU
+from ..emulator.m6502 import CPU, Device, Memory, WatchHit
+
+cpu_classes = pytest.mark.parametrize("cpu_class", [CPU, FastCPU], ids=["bus_accurate", "fast"])
+
+
+def load_store_loop(cpu):
+    """$FF00: INX / STX $0200 / LDA $0300 / JMP $FF00"""
+    cpu.reset_to(0xFF00)
+    program = [OpCodes.INS_INX, OpCodes.INS_STX_ABS, 0x00, 0x02, OpCodes.INS_LDA_ABS, 0x00, 0x03]
+    program += [OpCodes.INS_JMP_ABS, 0x00, 0xFF]
+    for offset, value in enumerate(program):
+        cpu.Memory[0xFF00 + offset] = value
+
+
+@cpu_classes
+def test_run_stops_before_the_instruction_at_a_breakpoint(cpu_class):
+    # Given:
+    cpu = cpu_class()
+    load_store_loop(cpu)
+    cpu.breakpoints.add(0xFF04)
+
+    # When:
+    first = cpu.run(cycles=1000)
+    second = cpu.run(cycles=1000)
+
+    # Then:
+    AssertThat(first).IsEqualTo((StopReason.BREAKPOINT, 2, 6))
+    AssertThat(second.reason).IsEqualTo(StopReason.BREAKPOINT)
+    AssertThat(second.instructions).IsEqualTo(4)
+    AssertThat(cpu.program_counter).IsEqualTo(0xFF04)
+    AssertThat(cpu.X).IsEqualTo(2)
+
+
+@cpu_classes
+def test_run_stops_after_an_instruction_writing_a_watched_address(cpu_class):
+    # Given:
+    cpu = cpu_class()
+    load_store_loop(cpu)
+    cpu.Memory.add_watchpoint(0x0200)
+
+    # When:
+    stop = cpu.run(cycles=1000)
+
+    # Then:
+    AssertThat(stop.reason).IsEqualTo(StopReason.WATCHPOINT)
+    AssertThat(cpu.Memory.watch_hits).ContainsExactly(WatchHit(0x0200, 1, True))
+    AssertThat(cpu.program_counter).IsEqualTo(0xFF04)
+    AssertThat(cpu.Memory[0x0200]).IsEqualTo(1)
+
+
+@cpu_classes
+def test_read_watchpoints_only_stop_for_reads(cpu_class):
+    # Given:
+    cpu = cpu_class()
+    load_store_loop(cpu)
+    cpu.Memory.data[0x0300] = 0x42
+    cpu.Memory.add_watchpoint(0x0200, 0x101, read=True, write=False)
+
+    # When:
+    stop = cpu.run(cycles=1000)
+
+    # Then:
+    AssertThat(stop.reason).IsEqualTo(StopReason.WATCHPOINT)
+    AssertThat(cpu.Memory.watch_hits).ContainsExactly(WatchHit(0x0300, 0x42, False))
+    AssertThat(cpu.A).IsEqualTo(0x42)
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_removing_the_last_watchpoint_puts_the_fast_path_back(checked):
+    # Given:
+    memory = Memory(checked)
+    memory.add_watchpoint(0x1234, read=True)
+
+    # When:
+    memory.remove_watchpoint(0x1234)
+
+    # Then:
+    AssertThat(memory.read_handlers[0x12]).IsNone()
+    AssertThat(memory.unwatched_handlers).IsEmpty()
+    AssertThat("read" in vars(memory)).IsEqualTo(not checked)
+    if not checked:
+        AssertThat(memory.read).IsEqualTo(memory.data.__getitem__)
+
+
+def test_watchpoints_on_device_pages_still_reach_the_device():
+    # Given:
+    class Register(Device):
+        value = 0
+
+        def read(self, address):
+            return self.value
+
+        def write(self, address, value):
+            self.value = value
+
+    memory = Memory(checked=False)
+    register = Register()
+    memory.map_device(0xD000, 0x100, register)
+
+    # When:
+    memory.add_watchpoint(0xD000, read=True)
+    memory.write(0xD000, 7)
+
+    # Then:
+    AssertThat(memory.read(0xD000)).IsEqualTo(7)
+    AssertThat(register.value).IsEqualTo(7)
+    AssertThat(memory.watch_hits).ContainsExactly(WatchHit(0xD000, 7, True), WatchHit(0xD000, 7, False)).InOrder()
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from truth.truth import AssertThat
+
+from ..benchmarks.instructions_per_second import copy_loop
+from ..emulator.const import Undocumented
+from ..emulator.disassembler import OPCODE_TABLES, OPCODES, Opcode, disassemble
+from ..emulator.fast import BASE_CYCLES
+
+
+def test_opcode_table_has_the_mnemonic_mode_length_and_cycles():
+    AssertThat(OPCODES).HasSize(0x100)
+    AssertThat(OPCODES[0xA9]).IsEqualTo(Opcode("LDA", "IM", 2, 2))
+    AssertThat(OPCODES[0x7E]).IsEqualTo(Opcode("ROR", "ABSX", 3, 7))
+    AssertThat(OPCODES[0x6C]).IsEqualTo(Opcode("JMP", "IND", 3, 5))
+    AssertThat(OPCODES[0xF0]).IsEqualTo(Opcode("BEQ", "REL", 2, 2))
+    AssertThat(OPCODES[0x0A]).IsEqualTo(Opcode("ASL", "A", 1, 2))
+    AssertThat(OPCODES[0x02]).IsNone()
+    AssertThat(BASE_CYCLES).IsEqualTo([None if opcode is None else opcode.cycles for opcode in OPCODES])
+
+
+def test_disassemble_the_copy_loop():
+    # When:
+    lines = [str(instruction) for instruction in disassemble(bytes(copy_loop[2:]), origin=0x0200)]
+
+    # Then:
+    AssertThat(lines).ContainsExactly(
+        "$0200  A2 00     LDX #$00",
+        "$0202  BD 00 03  LDA $0300,X",
+        "$0205  49 5A     EOR #$5A",
+        "$0207  69 01     ADC #$01",
+        "$0209  9D 00 04  STA $0400,X",
+        "$020C  E8        INX",
+        "$020D  E0 80     CPX #$80",
+        "$020F  D0 F1     BNE $0202",
+        "$0211  4C 00 02  JMP $0200",
+    ).InOrder()
+
+
+def test_disassemble_every_addressing_mode():
+    # fmt: off
+    code = bytes([
+        0xA5, 0x10, 0xB5, 0x10, 0xB6, 0x10, 0xB9, 0x34, 0x12, 0x6C, 0x34, 0x12,
+        0xA1, 0x10, 0xB1, 0x10, 0x2A, 0x60,
+    ])
+    # fmt: on
+    AssertThat([f"{i.mnemonic} {i.operand}".rstrip() for i in disassemble(code)]).ContainsExactly(
+        "LDA $10", "LDA $10,X", "LDX $10,Y", "LDA $1234,Y", "JMP ($1234)", "LDA ($10,X)", "LDA ($10),Y", "ROL A", "RTS"
+    ).InOrder()
+
+
+def test_unknown_opcodes_and_cut_short_instructions_are_bytes():
+    AssertThat([str(i) for i in disassemble(bytes([0x02, 0xEA, 0xAD, 0x00]))]).ContainsExactly(
+        "$0000  02        .byte $02", "$0001  EA        NOP", "$0002  AD        .byte $AD", "$0003  00        BRK"
+    ).InOrder()
+
+
+def test_disassemble_is_lazy_over_a_whole_rom_image():
+    # Given:
+    image = (Path(__file__).parent / "6502_functional_test.bin").read_bytes()
+
+    # When:
+    instructions = disassemble(image, 0x0400)
+
+    # Then:
+    AssertThat(str(next(instructions))).IsEqualTo("$0400  D8        CLD")
+    AssertThat(str(next(instructions))).IsEqualTo("$0401  A2 FF     LDX #$FF")
+    AssertThat(sum(1 for _ in disassemble(image))).IsGreaterThan(10_000)
+
+
+def test_undocumented_opcodes_are_named_under_the_policies_which_run_them():
+    # Given:
+    code = bytes([0xA7, 0x10, 0xCF, 0x34, 0x12, 0x02])
+
+    # When:
+    named = [f"{i.mnemonic} {i.operand}".rstrip() for i in disassemble(code, undocumented=Undocumented.IMPLEMENT)]
+    trapped = [i.mnemonic for i in disassemble(code)]
+
+    # Then:
+    AssertThat(named).ContainsExactly("LAX $10", "DCP $1234", "JAM").InOrder()
+    AssertThat(trapped[0]).IsEqualTo(".byte")
+    AssertThat(OPCODE_TABLES[Undocumented.TRAP]).IsEqualTo(OPCODES)
+    AssertThat(OPCODE_TABLES[Undocumented.NOP][0x03]).IsEqualTo(Opcode("SLO", "INDX", 2, 8))
+    AssertThat(OPCODE_TABLES[Undocumented.IMPLEMENT][0x0C]).IsEqualTo(Opcode("TOP", "ABS", 3, 4))
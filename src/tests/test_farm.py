@@ -0,0 +1,81 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..benchmarks.instructions_per_second import copy_loop
+from ..emulator.const import Undocumented
+from ..emulator.farm import Job, memory_image, run_job, run_jobs
+
+# The copy loop without its two byte load address
+ROM = bytes(copy_loop[2:])
+LOAD_ADDRESS = 0x0200
+
+
+def jobs(count):
+    for job in range(count):
+        yield Job(inputs=[(0x0300, bytes((job + i) & 0xFF for i in range(0x80)))], cycles=5_000, read=[(0x0400, 0x80)])
+
+
+def test_run_jobs_returns_a_result_for_every_job():
+    expected = {
+        index: run_job(memoryview(memory_image(ROM, LOAD_ADDRESS)), index, job, LOAD_ADDRESS)
+        for index, job in enumerate(jobs(10))
+    }
+
+    results = list(run_jobs(ROM, jobs(10), load_address=LOAD_ADDRESS, max_workers=2))
+
+    AssertThat(sorted(result.index for result in results)).IsEqualTo(list(range(10)))
+    for result in results:
+        AssertThat(result).IsEqualTo(expected[result.index])
+        AssertThat(result.error).IsNone()
+        AssertThat(result.cycles).IsAtLeast(5_000)
+
+
+def test_run_job_matches_the_interpreter():
+    image = memoryview(memory_image(ROM, LOAD_ADDRESS))
+    for job in jobs(3):
+        AssertThat(run_job(image, 0, job, LOAD_ADDRESS, translate=True)).IsEqualTo(
+            run_job(image, 0, job, LOAD_ADDRESS, translate=False)
+        )
+
+
+def test_job_registers_set_the_starting_state():
+    image = memoryview(memory_image(bytes([0xE8, 0x4C, 0x00, 0x02]), LOAD_ADDRESS))  # INX, JMP $0200
+
+    result = run_job(image, 0, Job(registers={"x": 0x10, "pc": 0x0200}, cycles=5), 0x0000)
+
+    AssertThat(result.registers["x"]).IsEqualTo(0x11)
+    AssertThat(result.registers["pc"]).IsEqualTo(0x0200)
+
+
+def test_jobs_that_raise_report_the_error():
+    results = list(run_jobs(bytes([0xEA, 0x02]), [Job(cycles=10)], load_address=LOAD_ADDRESS, max_workers=1))
+
+    AssertThat(results).HasSize(1)
+    AssertThat(results[0].error).Contains("NotImplementedError")
+    AssertThat(results[0].registers["pc"]).IsEqualTo(LOAD_ADDRESS + 2)
+
+
+def test_jobs_can_run_undocumented_opcodes():
+    image = memoryview(memory_image(bytes([0xA7, 0x10, 0x4C, 0x00, 0x02]), LOAD_ADDRESS))  # LAX $10, JMP $0200
+
+    result = run_job(image, 0, Job(cycles=100), LOAD_ADDRESS, undocumented=Undocumented.IMPLEMENT)
+
+    AssertThat(result.error).IsNone()
+    AssertThat(run_job(image, 0, Job(cycles=100), LOAD_ADDRESS).error).IsNotNone()
+
+
+def test_jobs_that_can_not_be_set_up_report_the_error_without_stopping_the_others():
+    bad_jobs = [Job(registers={"q": 1}), Job(inputs=[(0xFFF0, bytes(0x20))]), *jobs(3)]
+
+    results = sorted(run_jobs(ROM, bad_jobs, load_address=LOAD_ADDRESS, max_workers=1), key=lambda result: result.index)
+
+    AssertThat(results).HasSize(5)
+    AssertThat(results[0].error).Contains("Unknown register q")
+    AssertThat(results[1].error).Contains("do not fit in memory")
+    AssertThat(results[0].cycles).IsEqualTo(0)
+    AssertThat([result.error for result in results[2:]]).ContainsExactly(None, None, None)
+
+
+def test_roms_must_fit_in_memory():
+    with pytest.raises(ValueError, match="0x20 byte ROM at 0xfff0"):
+        memory_image(bytes(0x20), 0xFFF0)
@@ -0,0 +1,64 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..benchmarks.instructions_per_second import copy_loop
+from ..emulator.c_types import Byte
+from ..emulator.fast import BASE_CYCLES, FastCPU
+from ..emulator.m6502 import CPU, Memory
+from ..emulator.translator import DECODE
+from .test_translator import random_cpu, registers
+
+
+@pytest.mark.parametrize("opcode", sorted(DECODE), ids=lambda opcode: f"{DECODE[opcode][0]}_{opcode:02X}")
+def test_fast_instruction_matches_the_bus_accurate_cpu(opcode):
+    for seed in range(8):
+        accurate, rng = random_cpu(seed)
+        accurate.pc = rng.getrandbits(16)
+        accurate.Memory.data[accurate.pc] = opcode
+        fast = FastCPU()
+        fast.Memory.data[:] = accurate.Memory.data
+        fast.a, fast.x, fast.y, fast.p, fast.sp, fast.pc = registers(accurate)
+
+        AssertThat(fast.execute(1)).IsEqualTo(accurate.execute(1))
+        AssertThat(registers(fast)).IsEqualTo(registers(accurate))
+        AssertThat(fast.cycles).IsEqualTo(accurate.cycles)
+        AssertThat(fast.Memory.data == accurate.Memory.data).IsTrue()
+
+
+def test_base_cycles_are_the_documented_timings():
+    AssertThat(BASE_CYCLES[0xA9]).IsEqualTo(2)  # LDA #
+    AssertThat(BASE_CYCLES[0xBD]).IsEqualTo(4)  # LDA abs,X, +1 crossing a page
+    AssertThat(BASE_CYCLES[0x9D]).IsEqualTo(5)  # STA abs,X
+    AssertThat(BASE_CYCLES[0xFE]).IsEqualTo(7)  # INC abs,X
+    AssertThat(BASE_CYCLES[0xD0]).IsEqualTo(2)  # BNE, +1 taken, +2 to another page
+    AssertThat(BASE_CYCLES[0x00]).IsEqualTo(7)  # BRK
+    AssertThat(BASE_CYCLES[0x02]).IsNone()
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_fast_copy_loop_matches_the_bus_accurate_cpu(checked):
+    program = [Byte(x) for x in copy_loop]
+    accurate, fast = CPU(Memory(checked)), FastCPU(Memory(checked))
+    for cpu in (accurate, fast):
+        cpu.program_counter = cpu.load_program(program, len(program))
+        cpu.Memory.data[0x0300:0x0380] = bytes(range(0x80))
+
+    for cycles in (1, 7, 100, 5_000, 3):
+        AssertThat(fast.execute(cycles)).IsEqualTo(accurate.execute(cycles))
+        AssertThat(registers(fast)).IsEqualTo(registers(accurate))
+    AssertThat(fast.Memory.data == accurate.Memory.data).IsTrue()
+
+
+def test_opcodes_without_a_fast_instruction_use_the_cpus_own():
+    cpu = FastCPU()
+    cpu.reset_to(0xFF00)
+    cpu.Memory.data[0xFF00] = 0x02
+    with pytest.raises(NotImplementedError):
+        cpu.execute(1)
+
+
+def test_fast_cpu_forks_and_resets_to_a_fast_cpu():
+    cpu = FastCPU()
+    AssertThat(cpu.fork()).IsInstanceOf(FastCPU)
+    cpu.reset()
+    AssertThat(cpu).IsInstanceOf(FastCPU)
@@ -1,3 +1,7 @@
+from truth.truth import AssertThat
+
+from ..emulator.const import OpCodes
+
 # ExpectUnaffectedFlags
 # INXCanIncrementAZeroValue
 # INXCanIncrement255
@@ -14,9 +18,51 @@
 # DECCanDecrementAValueInTheZeroPage
 # DECCanDecrementAValueInTheZeroPageX
 # DECCanDecrementAValueAbsolute
-# DECCanDecrementAValueAbsoluteX
-# INCCanIncrementAValueInTheZeroPage
 # INCCanIncrementAValueInTheZeroPageX
 # INCCanIncrementAValueAbsolute
 # INCCanIncrementAValueAbsoluteX
 # TestLoadAProgramThatCanIncMemory
+
+
+def test_inc_can_increment_a_value_in_the_zero_page(cpu):
+    """INCCanIncrementAValueInTheZeroPage"""
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Flag.Z = True
+    cpu.Flag.N = True
+    cpu.Memory[0xFF00] = OpCodes.INS_INC_ZP
+    cpu.Memory[0xFF01] = 0x42
+    cpu.Memory[0x0042] = 57
+    expected_cycles = 5
+
+    # When:
+    cycles_used = cpu.execute(expected_cycles)
+
+    # Then:
+    AssertThat(cycles_used).IsEqualTo(expected_cycles)
+    AssertThat(cpu.Memory[0x0042]).IsEqualTo(58)
+    AssertThat(cpu.Flag.Z).IsFalsy()
+    AssertThat(cpu.Flag.N).IsFalsy()
+
+
+def test_dec_can_decrement_a_value_absolute_x(cpu):
+    """DECCanDecrementAValueAbsoluteX"""
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Flag.Z = True
+    cpu.Flag.N = False
+    cpu.X = 0x10
+    cpu.Memory[0xFF00] = OpCodes.INS_DEC_ABSX
+    cpu.Memory[0xFF01] = 0x00
+    cpu.Memory[0xFF02] = 0x80
+    cpu.Memory[0x8010] = 0
+    expected_cycles = 7
+
+    # When:
+    cycles_used = cpu.execute(expected_cycles)
+
+    # Then:
+    AssertThat(cycles_used).IsEqualTo(expected_cycles)
+    AssertThat(cpu.Memory[0x8010]).IsEqualTo(0xFF)
+    AssertThat(cpu.Flag.Z).IsFalsy()
+    AssertThat(cpu.Flag.N).IsTruthy()
@@ -1,6 +1,11 @@
+from pathlib import Path
+
 from truth.truth import AssertThat
 
 from ..emulator.c_types import Byte
+from ..emulator.const import StopReason
+from ..emulator.loaders import load_binary
+from ..emulator.m6502 import CPU, Memory
 
 test_program = """
 ; TestPrg
@@ -41,19 +46,15 @@ def test_load_program_and_execute_it(cpu):
     cpu.program_counter = start_address
 
     # then:
-    clock = 1000
-    while clock > 0:
-        clock -= cpu.execute(1)
-
-
-# TODO: LoadThe6502TestPrg - unsure on how to read in as binary
-# def test_load_6502_program_and_execute_it(cpu):
-#     # when:
-#     program = []
-#     with open(Path(__file__).parent / "6502_functional_test.bin", "rb") as f:
-#         data = [Byte(x) for x in bytearray(f.read())]
-
-#     start_address = cpu.load_program(program, len(test_program))
-#     cpu.program_counter = 0x400
-#     while True:
-#         cpu.execute(1)
+    AssertThat(cpu.run_cycles(1000).cycles).IsAtLeast(1000)
+
+
+def test_load_6502_functional_test_and_execute_it():
+    # when:
+    cpu = CPU(Memory(checked=False))
+    load_binary(cpu.Memory, Path(__file__).parent / "6502_functional_test.bin")
+    cpu.program_counter = 0x400
+
+    # then:
+    AssertThat(cpu.Memory.data[0x0400:0x0404]).IsEqualTo(bytearray([0xD8, 0xA2, 0xFF, 0x9A]))
+    AssertThat(cpu.run_cycles(100_000).reason).IsEqualTo(StopReason.CYCLES)
@@ -1,5 +1,3 @@
-import copy
-
 import pytest
 from truth.truth import AssertThat
 
@@ -29,7 +27,7 @@ def test_load_register_immediate(cpu, op_code, register):
     stored_value = 0x84
     cpu.Memory[0xFFFC] = op_code
     cpu.Memory[0xFFFD] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -58,7 +56,7 @@ def test_load_register_zero_page(cpu, op_code, register):
     cpu.Memory[0xFFFC] = op_code
     cpu.Memory[0xFFFD] = 0x42
     cpu.Memory[0x0042] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -87,7 +85,7 @@ def test_load_register_zero_page_x_offset(cpu, op_code, register):
     cpu.Memory[0xFFFC] = op_code
     cpu.Memory[0xFFFD] = 0x42
     cpu.Memory[0x0047] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -113,7 +111,7 @@ def test_load_register_zero_page_y_offset(cpu, op_code, register):
     cpu.Memory[0xFFFC] = op_code
     cpu.Memory[0xFFFD] = 0x42
     cpu.Memory[0x0047] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -144,7 +142,7 @@ def test_load_register_absolute(cpu, op_code, register):
     cpu.Memory[0xFFFD] = 0x80
     cpu.Memory[0xFFFE] = 0x44  # 0x4480
     cpu.Memory[0x4480] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -175,7 +173,7 @@ def test_load_register_absolute_x_offset(cpu, op_code, register):
     cpu.Memory[0xFFFD] = 0x80
     cpu.Memory[0xFFFE] = 0x44  # 0x4481
     cpu.Memory[0x4481] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -206,7 +204,7 @@ def test_load_register_absolute_y_offset(cpu, op_code, register):
     cpu.Memory[0xFFFD] = 0x80
     cpu.Memory[0xFFFE] = 0x44  # 0x4481
     cpu.Memory[0x4481] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -237,7 +235,7 @@ def test_load_register_absolute_y_offset_when_crossing_page(cpu, op_code, regist
     cpu.Memory[0xFFFD] = 0xFF
     cpu.Memory[0xFFFE] = 0x44  # 0x44FF
     cpu.Memory[0x4500] = stored_value  # 0x44FF+0x1 crosses page boundary!
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -268,7 +266,7 @@ def test_load_register_absolute_x_offset_when_crossing_page(cpu, op_code, regist
     cpu.Memory[0xFFFD] = 0xFF
     cpu.Memory[0xFFFE] = 0x44  # 0x44FF
     cpu.Memory[0x4500] = stored_value  # 0x44FF+0x1 crosses page boundary!
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -297,7 +295,7 @@ def test_the_cpu_can_execute_more_cycles_than_requested_if_required_by_the_instr
     expected_cycles = 1
     cpu.Memory[0xFFFC] = OpCodes.INS_LDA_IM
     cpu.Memory[0xFFFD] = 0x84
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -312,7 +310,7 @@ def test_load_register_immediate_can_affect_the_zero_flag(cpu):
     cpu.A = 0x44
     cpu.Memory[0xFFFC] = OpCodes.INS_LDA_IM
     cpu.Memory[0xFFFD] = 0x0
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -333,7 +331,7 @@ def test_load_register_zero_page_x_can_load_a_value_into_the_register_when_it_wr
     cpu.Memory[0xFFFC] = OpCodes.INS_LDA_ZPX
     cpu.Memory[0xFFFD] = 0x80
     cpu.Memory[0x007F] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -357,7 +355,7 @@ def test_load_register_indirect_x_can_load_a_value_into_the_register(cpu):
     cpu.Memory[0x0006] = 0x00  # 0x2 + 0x4
     cpu.Memory[0x0007] = 0x80
     cpu.Memory[0x8000] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -381,7 +379,7 @@ def test_load_register_indirect_y_can_load_a_value_into_the_register(cpu):
     cpu.Memory[0x0002] = 0x00  # 0x2 + 0x4
     cpu.Memory[0x0003] = 0x80
     cpu.Memory[0x8004] = stored_value
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
@@ -405,7 +403,7 @@ def test_load_register_indirect_y_can_load_a_value_into_the_register_when_it_cro
     cpu.Memory[0x0005] = 0xFF
     cpu.Memory[0x0006] = 0x80
     cpu.Memory[0x8100] = stored_value  # 0x80FF + 0x1
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When
     cycles_used = cpu.execute(expected_cycles)
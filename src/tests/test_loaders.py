@@ -0,0 +1,109 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..emulator.const import OpCodes
+from ..emulator.loaders import load_binary, load_intel_hex, load_prg
+from ..emulator.m6502 import CPU, Memory
+from ..emulator.translator import Translator
+
+# The test program from test_load_program.py, $1000: LDA #$FF / STA $90 / STA $8000 / EOR #$CC / JMP $1002
+program = bytes([0xA9, 0xFF, 0x85, 0x90, 0x8D, 0x00, 0x80, 0x49, 0xCC, 0x4C, 0x02, 0x10])
+
+intel_hex = """\
+:0C100000A9FF85908D008049CC4C0210A7
+:0400000300001000E9
+:00000001FF
+"""
+
+
+def test_load_binary_copies_the_file_to_the_address(tmp_path):
+    # Given:
+    path = tmp_path / "program.bin"
+    path.write_bytes(program)
+    memory = Memory()
+
+    # When:
+    length = load_binary(memory, path, 0x1000)
+
+    # Then:
+    AssertThat(length).IsEqualTo(len(program))
+    AssertThat(bytes(memory.data[0x1000 : 0x1000 + len(program)])).IsEqualTo(program)
+    AssertThat(memory.data[0x0FFF]).IsEqualTo(0)
+    AssertThat(memory.data[0x1000 + len(program)]).IsEqualTo(0)
+
+
+def test_load_binary_which_does_not_fit_raises(tmp_path):
+    path = tmp_path / "program.bin"
+    path.write_bytes(program)
+    with pytest.raises(ValueError):
+        load_binary(Memory(), path, 0xFFFC)
+
+
+def test_load_prg_uses_the_load_address_in_the_file(tmp_path):
+    # Given:
+    path = tmp_path / "program.prg"
+    path.write_bytes(bytes([0x00, 0x10]) + program)
+    memory = Memory()
+
+    # When:
+    address = load_prg(memory, path)
+
+    # Then:
+    AssertThat(address).IsEqualTo(0x1000)
+    AssertThat(bytes(memory.data[0x1000 : 0x1000 + len(program)])).IsEqualTo(program)
+
+
+def test_load_intel_hex_copies_the_data_records_and_returns_the_start_address(tmp_path):
+    # Given:
+    path = tmp_path / "program.hex"
+    path.write_text(intel_hex)
+    memory = Memory()
+
+    # When:
+    start = load_intel_hex(memory, path)
+
+    # Then:
+    AssertThat(start).IsEqualTo(0x1000)
+    AssertThat(bytes(memory.data[0x1000 : 0x1000 + len(program)])).IsEqualTo(program)
+
+
+def test_load_intel_hex_with_a_bad_checksum_raises(tmp_path):
+    path = tmp_path / "program.hex"
+    path.write_text(intel_hex.replace("A7", "A8"))
+    with pytest.raises(ValueError):
+        load_intel_hex(Memory(), path)
+
+
+def test_loading_over_translated_code_drops_its_blocks(tmp_path, cpu):
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_LDA_IM
+    cpu.Memory[0xFF01] = 0x11
+    cpu.Memory[0xFF02] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF03] = 0x00
+    cpu.Memory[0xFF04] = 0xFF
+    translator = Translator(cpu)
+    translator.execute(5)
+    path = tmp_path / "patch.bin"
+    path.write_bytes(bytes([0x22]))
+
+    # When:
+    load_binary(cpu.Memory, path, 0xFF01)
+    translator.execute(5)
+
+    # Then:
+    AssertThat(cpu.A).IsEqualTo(0x22)
+
+
+def test_loaders_fill_rom(tmp_path):
+    # Given:
+    cpu = CPU(Memory(checked=False))
+    cpu.Memory.map_rom(0x1000, bytes(0x100))
+    path = tmp_path / "program.prg"
+    path.write_bytes(bytes([0x00, 0x10]) + program)
+
+    # When:
+    load_prg(cpu.Memory, path)
+
+    # Then:
+    AssertThat(cpu.Memory.read(0x1000)).IsEqualTo(0xA9)
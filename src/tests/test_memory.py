@@ -0,0 +1,88 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..emulator.c_types import Byte
+from ..emulator.m6502 import CPU, Memory
+
+
+def test_memory_is_a_single_64k_bytearray():
+    memory = Memory()
+    AssertThat(memory.data).IsInstanceOf(bytearray)
+    AssertThat(len(memory.data)).IsEqualTo(0x10000)
+    AssertThat(memory.view.obj).IsSameAs(memory.data)
+
+
+def test_memory_read_and_write_use_plain_ints():
+    memory = Memory()
+    memory.write(0x1234, 0x42)
+    AssertThat(memory.read(0x1234)).IsEqualTo(0x42)
+    AssertThat(type(memory.read(0x1234))).IsEqualTo(int)
+
+
+def test_memory_indexing_returns_a_byte_and_wraps_values():
+    memory = Memory()
+    memory[0x8000] = -1
+    memory[0x8001] = Byte(0x37)
+    AssertThat(memory[0x8000]).IsInstanceOf(Byte)
+    AssertThat(memory[0x8000]).IsEqualTo(0xFF)
+    AssertThat(memory[0x8001]).IsEqualTo(0x37)
+
+
+def test_memory_view_gives_bulk_access():
+    memory = Memory()
+    memory.view[0x0200:0x0204] = bytes([1, 2, 3, 4])
+    AssertThat(memory.read(0x0203)).IsEqualTo(4)
+    AssertThat(bytes(memory.view[0x0200:0x0202])).IsEqualTo(bytes([1, 2]))
+
+
+def test_checked_memory_asserts_out_of_bounds_access():
+    memory = Memory()
+    with AssertThat(AssertionError).IsRaised():
+        memory.read(0x10000)
+    with AssertThat(AssertionError).IsRaised():
+        memory.write(-1, 0)
+    with AssertThat(AssertionError).IsRaised():
+        memory.write(0x0000, 0x100)
+
+
+def test_unchecked_memory_reads_and_writes_the_bytearray_directly():
+    memory = Memory(checked=False)
+    memory.write(0x0042, 0x84)
+    AssertThat(memory.read(0x0042)).IsEqualTo(0x84)
+    AssertThat(memory.data[0x0042]).IsEqualTo(0x84)
+
+
+def test_cpu_reset_keeps_the_memory_mode():
+    cpu = CPU(Memory(checked=False))
+    cpu.reset_to(0xFF00)
+    AssertThat(cpu.Memory.checked).IsFalse()
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_writes_to_watched_pages_call_the_watchers(checked):
+    memory = Memory(checked)
+    written = []
+    memory.watch_writes(lambda address, length: written.append((address, length)))
+    memory.watch_pages(0x02F0, 0x20)
+
+    memory.write(0x0400, 0x01)
+    memory[0x0301] = 0x02
+    memory.write(0x0301, 0x03)
+
+    AssertThat(written).ContainsExactly((0x0301, 1))
+    AssertThat(memory.read(0x0301)).IsEqualTo(0x03)
+    AssertThat(memory.watched_pages[0x02]).IsTruthy()
+    AssertThat(memory.watched_pages[0x03]).IsFalsy()
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_dirty_pages_are_the_pages_written_since_tracking_started(checked):
+    memory = Memory(checked)
+    memory.write(0x1234, 0x01)
+    memory.track_dirty_pages()
+
+    memory.write(0x0400, 0x01)
+    memory.write(0x0401, 0x01)
+    memory[0xFFFF] = 0x02
+
+    AssertThat(memory.dirty_pages).ContainsExactly(0x04, 0xFF)
@@ -0,0 +1,102 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..emulator.const import OpCodes, Undocumented
+from ..emulator.m6502 import CPU
+
+np = pytest.importorskip("numpy")
+from ..emulator.profiler import Profiler  # noqa: E402 isort:skip
+
+
+def load_loops(cpu):
+    """$0200: JSR $0300 / JMP $0200, $0300: LDX #$10 / DEX / BNE $0302 / RTS"""
+    cpu.reset_to(0x0200)
+    program = {
+        0x0200: [OpCodes.INS_JSR, 0x00, 0x03, OpCodes.INS_JMP_ABS, 0x00, 0x02],
+        0x0300: [OpCodes.INS_LDX_IM, 0x10, OpCodes.INS_DEX, OpCodes.INS_BNE, 0xFD, OpCodes.INS_RTS],
+    }
+    for address, code in program.items():
+        for offset, value in enumerate(code):
+            cpu.Memory[address + offset] = value
+
+
+def test_counts_executions_and_cycles_per_address():
+    # Given:
+    cpu = CPU()
+    load_loops(cpu)
+    profiler = Profiler(cpu)
+
+    # When:
+    used = profiler.run(10_000)
+
+    # Then:
+    AssertThat(int(profiler.cycles.sum())).IsEqualTo(used)
+    calls = int(profiler.executions[0x0300])
+    AssertThat(int(profiler.executions[0x0302])).IsIn(range(16 * (calls - 1) + 1, 16 * calls + 1))
+    AssertThat(int(profiler.cycles[0x0302])).IsEqualTo(2 * int(profiler.executions[0x0302]))
+    AssertThat(int(profiler.opcodes[OpCodes.INS_DEX])).IsEqualTo(int(profiler.executions[0x0302]))
+    AssertThat(int(profiler.executions[0x0301])).IsEqualTo(0)
+
+
+def test_hot_ranges_are_ranked_by_cycles():
+    # Given:
+    cpu = CPU()
+    load_loops(cpu)
+    profiler = Profiler(cpu)
+
+    # When:
+    profiler.run(10_000)
+    ranges = profiler.hot_ranges()
+
+    # Then:
+    AssertThat([(hot_range.start, hot_range.end) for hot_range in ranges]).ContainsExactly(
+        (0x0300, 0x0305), (0x0200, 0x0203)
+    ).InOrder()
+    AssertThat(sum(hot_range.share for hot_range in ranges)).IsWithin(1e-9).Of(1.0)
+    AssertThat(profiler.report()).Contains("$0300-$0305")
+    AssertThat(profiler.report()).Contains("DEX")
+
+
+def test_report_names_undocumented_opcodes_the_cpu_runs():
+    # Given: LAX $10 / JMP $0200
+    cpu = CPU(undocumented=Undocumented.IMPLEMENT)
+    cpu.reset_to(0x0200)
+    cpu.Memory.data[0x0200:0x0205] = bytes([0xA7, 0x10, OpCodes.INS_JMP_ABS, 0x00, 0x02])
+    profiler = Profiler(cpu)
+
+    # When:
+    profiler.run(1000)
+
+    # Then:
+    AssertThat(profiler.report()).Contains("$A7 LAX ZP")
+
+
+def test_counts_the_opcode_run_when_an_instruction_overwrites_itself():
+    # Given: $0400: LDA #$EA / STA $0402, which writes NOP over the STA's own opcode
+    cpu = CPU()
+    cpu.reset_to(0x0400)
+    cpu.Memory.data[0x0400:0x0405] = bytes([OpCodes.INS_LDA_IM, 0xEA, OpCodes.INS_STA_ABS, 0x02, 0x04])
+    profiler = Profiler(cpu)
+
+    # When:
+    profiler.run(6)
+
+    # Then:
+    AssertThat(int(profiler.opcodes[OpCodes.INS_STA_ABS])).IsEqualTo(1)
+    AssertThat(int(profiler.opcodes[0xEA])).IsEqualTo(0)
+
+
+def test_a_run_which_raises_keeps_its_counts():
+    # Given: 5 NOPs, then $02 which the default policy does not run
+    cpu = CPU()
+    cpu.reset_to(0x0200)
+    cpu.Memory.data[0x0200:0x0206] = bytes([0xEA] * 5 + [0x02])
+    profiler = Profiler(cpu)
+
+    # When:
+    with pytest.raises(NotImplementedError):
+        profiler.run(100)
+
+    # Then:
+    AssertThat(int(profiler.opcodes[0xEA])).IsEqualTo(5)
+    AssertThat(int(profiler.cycles.sum())).IsEqualTo(10)
@@ -0,0 +1,50 @@
+from truth.truth import AssertThat
+
+from ..emulator.c_types import Byte, Word
+from ..emulator.const import OpCodes
+
+
+def test_registers_are_plain_ints_inside_the_cpu(cpu):
+    for register in (cpu.a, cpu.x, cpu.y, cpu.pc, cpu.sp):
+        AssertThat(type(register)).IsEqualTo(int)
+
+
+def test_public_registers_are_byte_and_word(cpu):
+    AssertThat(cpu.A).IsInstanceOf(Byte)
+    AssertThat(cpu.X).IsInstanceOf(Byte)
+    AssertThat(cpu.Y).IsInstanceOf(Byte)
+    AssertThat(cpu.stack_pointer).IsInstanceOf(Byte)
+    AssertThat(cpu.program_counter).IsInstanceOf(Word)
+
+
+def test_setting_a_public_register_wraps_the_value(cpu):
+    cpu.A = 0x1FF
+    cpu.X = -1
+    cpu.program_counter = 0x10001
+    AssertThat(cpu.a).IsEqualTo(0xFF)
+    AssertThat(cpu.x).IsEqualTo(0xFF)
+    AssertThat(cpu.pc).IsEqualTo(0x0001)
+
+
+def test_load_register_zero_page_x_wraps_within_the_zero_page(cpu):
+    """LDAZeroPageXCanLoadAValueIntoTheARegisterWhenItWraps"""
+    cpu.X = 0xFF
+    cpu.Memory[0xFFFC] = OpCodes.INS_LDA_ZPX
+    cpu.Memory[0xFFFD] = 0x80
+    cpu.Memory[0x007F] = 0x37
+
+    cycles_used = cpu.execute(4)
+
+    AssertThat(cpu.A).IsEqualTo(0x37)
+    AssertThat(cycles_used).IsEqualTo(4)
+
+
+def test_inx_wraps_around_to_zero(cpu):
+    """INXCanIncrement255"""
+    cpu.X = 0xFF
+    cpu.Memory[0xFFFC] = OpCodes.INS_INX
+
+    cpu.execute(2)
+
+    AssertThat(cpu.X).IsEqualTo(0)
+    AssertThat(cpu.Flag.Z).IsTruthy()
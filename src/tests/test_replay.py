@@ -0,0 +1,137 @@
+import random
+
+import pytest
+from truth.truth import AssertThat
+
+from ..emulator.fast import FastCPU
+from ..emulator.m6502 import CPU, Device
+from ..emulator.replay import IRQ, NMI, InputLog, Player, Recorder
+
+# CLI / loop: LDA $D000 / BEQ loop / CLC / ADC $10 / STA $10 / JMP loop
+polling_loop = [0x58, 0xAD, 0x00, 0xD0, 0xF0, 0xFB, 0x18, 0x65, 0x10, 0x85, 0x10, 0x4C, 0x01, 0x02]
+# IRQ: INC $11 / LDA $D001 / STA $12 / RTI
+irq_handler = [0xE6, 0x11, 0xAD, 0x01, 0xD0, 0x85, 0x12, 0x40]
+
+
+class Keyboard(Device):
+    """Stands for host input: a key now and then at $D000, anything at $D001"""
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+
+    def read(self, address):
+        if address == 0xD000:
+            return self.random.randrange(1, 0x100) if self.random.random() < 0.01 else 0
+        return self.random.randrange(0x100)
+
+    def write(self, address, value):
+        pass
+
+
+def make_cpu(cpu_type):
+    cpu = cpu_type()
+    cpu.reset_to(0x0200)
+    cpu.sp = 0xFF
+    cpu.Memory.data[0x0200 : 0x0200 + len(polling_loop)] = bytes(polling_loop)
+    cpu.Memory.data[0xF000 : 0xF000 + len(irq_handler)] = bytes(irq_handler)
+    cpu.Memory.data[0xFFFE:0x10000] = bytes([0x00, 0xF0])
+    return cpu
+
+
+def record(cpu_type, cycles, seed=1):
+    cpu = make_cpu(cpu_type)
+    recorder = Recorder(cpu)
+    cpu.Memory.map_device(0xD000, 0x100, Keyboard(seed))
+    timing = random.Random(seed)
+
+    def assert_irq(scheduler):
+        scheduler.irq()
+        scheduler.schedule_in(timing.randrange(50, 500), assert_irq)
+
+    recorder.schedule_in(timing.randrange(50, 500), assert_irq)
+    recorder.run(cycles)
+    return cpu, recorder
+
+
+def state(cpu):
+    return (cpu.a, cpu.x, cpu.y, cpu.sp, cpu.p, cpu.pc, bytes(cpu.Memory.data))
+
+
+@pytest.mark.parametrize("cpu_type", [CPU, FastCPU])
+def test_replay_reproduces_the_session_without_the_devices(cpu_type):
+    # Given:
+    recorded, recorder = record(cpu_type, 20_000)
+
+    # When:
+    cpu = make_cpu(cpu_type)
+    player = Player(cpu, InputLog.from_bytes(recorder.log.to_bytes()))
+    player.run(recorder.now)
+
+    # Then:
+    AssertThat(player.now).IsEqualTo(recorder.now)
+    AssertThat(cpu.Memory.data[0x11]).IsGreaterThan(0)
+    AssertThat(state(cpu)).IsEqualTo(state(recorded))
+
+
+def test_repeated_reads_are_logged_once():
+    # Given:
+    _, recorder = record(CPU, 20_000)
+    log = recorder.log
+
+    # When:
+    reads = list(log.iter_reads())
+    data = log.to_bytes()
+
+    # Then:
+    AssertThat(len(reads)).IsGreaterThan(1000)
+    AssertThat(len(data)).IsLessThan(len(reads))
+
+
+def test_interrupts_are_logged_at_their_cycle():
+    # Given:
+    log = InputLog()
+
+    # When:
+    log.add_interrupt(IRQ, 100)
+    log.add_interrupt(NMI, 100)
+    log.add_interrupt(IRQ, 1_000_000)
+
+    # Then:
+    AssertThat(list(log.iter_interrupts())).ContainsExactly((IRQ, 100), (NMI, 100), (IRQ, 1_000_000)).InOrder()
+    # A kind byte each, then 1, 1 and 3 varint bytes
+    AssertThat(len(log.interrupts)).IsEqualTo(8)
+
+
+def test_saved_logs_load_back(tmp_path):
+    # Given:
+    log = InputLog([(0xD000, 0x100)])
+    for value in [0, 0, 0, 5, 0]:
+        log.add_read(0xD000, value)
+    log.add_interrupt(IRQ, 1234)
+    path = str(tmp_path / "session.input")
+
+    # When:
+    log.save(path)
+    loaded = InputLog.load(path)
+
+    # Then:
+    AssertThat(loaded.regions).IsEqualTo([(0xD000, 0x100)])
+    AssertThat(list(loaded.iter_reads())).IsEqualTo([(0xD000, 0), (0xD000, 0), (0xD000, 0), (0xD000, 5), (0xD000, 0)])
+    AssertThat(list(loaded.iter_interrupts())).IsEqualTo([(IRQ, 1234)])
+
+
+def test_a_replay_which_diverges_raises():
+    # Given:
+    _, recorder = record(CPU, 5_000)
+    cpu = make_cpu(CPU)
+    cpu.Memory.data[0x0202] = 0x01  # LDA $D001 rather than $D000
+    player = Player(cpu, recorder.log)
+
+    # Then:
+    with pytest.raises(ValueError):
+        player.run(5_000)
+
+
+def test_logs_must_be_input_logs():
+    with pytest.raises(ValueError):
+        InputLog.from_bytes(b"not an input log at all")
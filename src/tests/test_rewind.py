@@ -0,0 +1,127 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..benchmarks.instructions_per_second import copy_loop
+from ..emulator.c_types import Byte
+from ..emulator.const import StopReason
+from ..emulator.fast import FastCPU
+from ..emulator.m6502 import CPU
+from ..emulator.rewind import PAGE_SIZE, Rewinder
+
+
+def loaded(cpu):
+    program = [Byte(x) for x in copy_loop]
+    cpu.program_counter = cpu.load_program(program, len(program))
+    cpu.Memory.data[0x0300:0x0380] = bytes(range(0x80))
+    return cpu
+
+
+def state(cpu):
+    return (cpu.a, cpu.x, cpu.y, cpu.sp, cpu.p, cpu.pc, bytes(cpu.Memory.data))
+
+
+@pytest.mark.parametrize("cpu_type", [CPU, FastCPU])
+def test_step_back_returns_to_the_instruction_before(cpu_type):
+    # given:
+    rewinder = Rewinder(loaded(cpu_type()), interval=1000)
+    rewinder.run(10_000)
+    reference = loaded(cpu_type())
+    reference.run_instructions(rewinder.instructions - 3)
+
+    # when:
+    rewinder.step_back(3)
+
+    # then:
+    AssertThat(state(rewinder.cpu)).IsEqualTo(state(reference))
+
+
+def test_goto_cycle_matches_running_from_the_start(cpu):
+    # given:
+    rewinder = Rewinder(loaded(cpu), interval=1000)
+    rewinder.run(10_000)
+    reference = loaded(CPU())
+    stop = reference.run_cycles(4321)
+
+    # when:
+    rewinder.goto_cycle(4321)
+
+    # then:
+    AssertThat(rewinder.now).IsEqualTo(stop.cycles)
+    AssertThat(state(rewinder.cpu)).IsEqualTo(state(reference))
+
+
+def test_goto_can_go_forward_again_to_the_end(cpu):
+    # given:
+    rewinder = Rewinder(loaded(cpu), interval=1000)
+    rewinder.run(10_000)
+    end = state(cpu)
+
+    # when:
+    rewinder.goto_cycle(10)
+    rewinder.goto_instruction(rewinder.end_instructions)
+
+    # then:
+    AssertThat(rewinder.now).IsEqualTo(rewinder.end)
+    AssertThat(state(cpu)).IsEqualTo(end)
+
+
+def test_running_after_going_back_records_a_new_history(cpu):
+    # given:
+    rewinder = Rewinder(loaded(cpu), interval=1000)
+    rewinder.run(10_000)
+    rewinder.goto_cycle(2500)
+    cpu.Memory.data[0x0300] = 0xFF
+
+    # when:
+    rewinder.run(500)
+
+    # then:
+    AssertThat(rewinder.end).IsEqualTo(rewinder.now)
+    AssertThat(rewinder.checkpoints[-1].time).IsAtMost(rewinder.now)
+    rewinder.goto_cycle(2000)
+    AssertThat(cpu.Memory.data[0x0300]).IsEqualTo(0x00)
+    rewinder.goto_instruction(rewinder.end_instructions)
+    AssertThat(cpu.Memory.data[0x0300]).IsEqualTo(0xFF)
+
+
+def test_checkpoints_keep_only_the_pages_that_changed(cpu):
+    # given:
+    rewinder = Rewinder(loaded(cpu), interval=1000)
+
+    # when:
+    rewinder.run(10_000)
+
+    # then:
+    AssertThat(len(rewinder.checkpoints)).IsAtLeast(10)
+    # The copy loop only writes page $04
+    AssertThat(list(rewinder.page_history)).IsEqualTo([0x04])
+    # and only while it was copying, not at every checkpoint after
+    copies = len(rewinder.page_history[0x04])
+    AssertThat(copies).IsLessThan(len(rewinder.checkpoints))
+    AssertThat(rewinder.stored_bytes).IsEqualTo(copies * PAGE_SIZE)
+
+
+def test_replaying_ignores_breakpoints_but_run_stops_at_them(cpu):
+    # given:
+    rewinder = Rewinder(loaded(cpu), interval=1000)
+    rewinder.run(5000)
+    cpu.breakpoints.add(0x0202)
+
+    # when:
+    rewinder.goto_cycle(3000)
+    stop = rewinder.run(1000)
+
+    # then:
+    AssertThat(rewinder.now).IsAtLeast(3000)
+    AssertThat(stop.reason).IsEqualTo(StopReason.BREAKPOINT)
+    AssertThat(cpu.pc).IsEqualTo(0x0202)
+
+
+def test_cannot_go_past_the_end_of_the_run(cpu):
+    rewinder = Rewinder(loaded(cpu))
+    rewinder.run(100)
+
+    with pytest.raises(ValueError):
+        rewinder.goto_cycle(rewinder.end + 1)
+    with pytest.raises(ValueError):
+        rewinder.goto_instruction(rewinder.end_instructions + 1)
@@ -0,0 +1,96 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..emulator.const import OpCodes, StopReason
+from ..emulator.fast import FastCPU
+from ..emulator.m6502 import CPU
+
+cpu_classes = pytest.mark.parametrize("cpu_class", [CPU, FastCPU], ids=["bus_accurate", "fast"])
+
+
+def load_counting_loop(cpu):
+    """$FF00: INX / BNE $FF00 / JMP $FF05 (a trap once X wraps round)"""
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_INX
+    cpu.Memory[0xFF01] = OpCodes.INS_BNE
+    cpu.Memory[0xFF02] = 0xFD
+    cpu.Memory[0xFF03] = OpCodes.INS_NOP
+    cpu.Memory[0xFF04] = OpCodes.INS_NOP
+    cpu.Memory[0xFF05] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF06] = 0x05
+    cpu.Memory[0xFF07] = 0xFF
+
+
+@cpu_classes
+def test_run_instructions_stops_after_the_number_of_instructions(cpu_class):
+    # Given:
+    cpu = cpu_class()
+    load_counting_loop(cpu)
+
+    # When:
+    stop = cpu.run_instructions(10)
+
+    # Then:
+    AssertThat(stop).IsEqualTo((StopReason.INSTRUCTIONS, 10, 25))
+    AssertThat(cpu.X).IsEqualTo(5)
+    AssertThat(cpu.program_counter).IsEqualTo(0xFF00)
+
+
+@cpu_classes
+def test_run_cycles_uses_the_same_cycles_as_execute(cpu_class):
+    # Given:
+    cpu, other = cpu_class(), cpu_class()
+    load_counting_loop(cpu)
+    load_counting_loop(other)
+
+    # When:
+    stop = cpu.run_cycles(100)
+
+    # Then:
+    AssertThat(stop.reason).IsEqualTo(StopReason.CYCLES)
+    AssertThat(stop.cycles).IsEqualTo(other.execute(100))
+    AssertThat((cpu.x, cpu.pc, cpu.cycles)).IsEqualTo((other.x, other.pc, other.cycles))
+
+
+@cpu_classes
+def test_run_until_pc_stops_when_the_program_counter_gets_there(cpu_class):
+    # Given:
+    cpu = cpu_class()
+    load_counting_loop(cpu)
+
+    # When:
+    stop = cpu.run_until_pc(0xFF03)
+
+    # Then:
+    AssertThat(stop.reason).IsEqualTo(StopReason.PC)
+    AssertThat(stop.instructions).IsEqualTo(2 * 256)
+    AssertThat(cpu.X).IsEqualTo(0)
+
+
+@cpu_classes
+def test_run_until_trap_stops_at_a_jump_to_itself(cpu_class):
+    # Given:
+    cpu = cpu_class()
+    load_counting_loop(cpu)
+
+    # When:
+    stop = cpu.run_until_trap()
+
+    # Then:
+    AssertThat(stop.reason).IsEqualTo(StopReason.TRAP)
+    AssertThat(stop.instructions).IsEqualTo(2 * 256 + 3)
+    AssertThat(cpu.program_counter).IsEqualTo(0xFF05)
+
+
+@cpu_classes
+def test_run_stops_at_the_cycle_limit_before_the_trap(cpu_class):
+    # Given:
+    cpu = cpu_class()
+    load_counting_loop(cpu)
+
+    # When:
+    stop = cpu.run_until_trap(cycles=50)
+
+    # Then:
+    AssertThat(stop.reason).IsEqualTo(StopReason.CYCLES)
+    AssertThat(stop.cycles).IsAtLeast(50)
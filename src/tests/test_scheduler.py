@@ -0,0 +1,175 @@
+from truth.truth import AssertThat
+
+from ..emulator.const import OpCodes, ProcessorStatus, StopReason
+from ..emulator.fast import FastCPU
+from ..emulator.m6502 import Stop
+from ..emulator.scheduler import Scheduler
+
+
+def load_program(cpu, address, program):
+    for offset, value in enumerate(program):
+        cpu.Memory[address + offset] = value
+
+
+def load_interrupt_handlers(cpu):
+    """IRQ: INC $10 / RTI, NMI: INC $11 / RTI"""
+    load_program(cpu, 0xF000, [OpCodes.INS_INC_ZP, 0x10, OpCodes.INS_RTI])
+    load_program(cpu, 0xF010, [OpCodes.INS_INC_ZP, 0x11, OpCodes.INS_RTI])
+    load_program(cpu, 0xFFFA, [0x10, 0xF0, 0x00, 0x00, 0x00, 0xF0])
+
+
+def make_cpu(program):
+    cpu = FastCPU()
+    cpu.reset_to(0x0200)
+    cpu.sp = 0xFF
+    load_program(cpu, 0x0200, program)
+    load_interrupt_handlers(cpu)
+    return cpu
+
+
+# JMP $0200
+idle_loop = [OpCodes.INS_JMP_ABS, 0x00, 0x02]
+
+
+def test_events_fire_in_time_order_once_their_time_is_reached():
+    # Given:
+    scheduler = Scheduler(make_cpu(idle_loop))
+    fired = []
+    scheduler.schedule(300, lambda scheduler: fired.append(("b", scheduler.now)))
+    scheduler.schedule(100, lambda scheduler: fired.append(("a", scheduler.now)))
+    scheduler.schedule_in(100, lambda scheduler: fired.append(("c", scheduler.now)))
+
+    # When:
+    used = scheduler.run(1000)
+
+    # Then:
+    AssertThat([name for name, _ in fired]).ContainsExactly("a", "c", "b").InOrder()
+    AssertThat([now for _, now in fired]).ContainsExactly(102, 102, 300).InOrder()
+    AssertThat(used).IsAtLeast(1000)
+    AssertThat(scheduler.now).IsEqualTo(used)
+
+
+def test_cancelled_events_do_not_fire():
+    # Given:
+    scheduler = Scheduler(make_cpu(idle_loop))
+    fired = []
+    event = scheduler.schedule(100, lambda scheduler: fired.append(scheduler.now))
+
+    # When:
+    event.cancel()
+    scheduler.run(1000)
+
+    # Then:
+    AssertThat(fired).IsEmpty()
+    AssertThat(scheduler.next_event_time()).IsNone()
+
+
+def test_a_timer_rescheduling_itself_fires_once_per_period():
+    # Given:
+    scheduler = Scheduler(make_cpu(idle_loop))
+    ticks = []
+
+    def tick(scheduler):
+        ticks.append(scheduler.now)
+        scheduler.schedule_in(1000, tick)
+
+    scheduler.schedule(1000, tick)
+
+    # When:
+    scheduler.run(10_500)
+
+    # Then:
+    AssertThat(ticks).HasSize(10)
+
+
+def test_irq_runs_the_handler_and_returns():
+    # Given:
+    cpu = make_cpu(idle_loop)
+    scheduler = Scheduler(cpu)
+    scheduler.schedule(100, lambda scheduler: scheduler.irq())
+
+    # When:
+    scheduler.run(1000)
+
+    # Then:
+    AssertThat(cpu.Memory[0x10]).IsEqualTo(1)
+    AssertThat(cpu.Memory[0x01FD] & ProcessorStatus.BreakFlagBit).IsEqualTo(0)
+    AssertThat(cpu.stack_pointer).IsEqualTo(0xFF)
+    AssertThat(cpu.program_counter).IsIn([0x0200, 0x0203])
+
+
+def test_masked_irq_is_taken_straight_after_cli():
+    # Given:
+    cpu = make_cpu(
+        [OpCodes.INS_SEI]
+        + [OpCodes.INS_NOP] * 100
+        + [OpCodes.INS_CLI, OpCodes.INS_JMP_ABS, 0x66, 0x02]  # CLI at $0265, JMP * at $0266
+    )
+    scheduler = Scheduler(cpu)
+    scheduler.schedule(10, lambda scheduler: scheduler.irq())
+
+    # When:
+    scheduler.run(1000)
+
+    # Then:
+    AssertThat(cpu.Memory[0x10]).IsEqualTo(1)
+    AssertThat((cpu.Memory[0x01FF], cpu.Memory[0x01FE])).IsEqualTo((0x02, 0x66))
+
+
+def test_nmi_is_taken_even_with_interrupts_disabled():
+    # Given:
+    cpu = make_cpu([OpCodes.INS_SEI] + idle_loop)
+    scheduler = Scheduler(cpu)
+    scheduler.schedule(100, lambda scheduler: scheduler.nmi())
+    scheduler.schedule(200, lambda scheduler: scheduler.irq())
+
+    # When:
+    scheduler.run(1000)
+
+    # Then:
+    AssertThat(cpu.Memory[0x11]).IsEqualTo(1)
+    AssertThat(cpu.Memory[0x10]).IsEqualTo(0)
+    AssertThat(scheduler.irq_pending).IsTrue()
+
+
+def test_run_stops_at_breakpoints_and_watchpoints_and_can_carry_on():
+    # Given: INC $20 / JMP $0200
+    cpu = make_cpu([OpCodes.INS_INC_ZP, 0x20, OpCodes.INS_JMP_ABS, 0x00, 0x02])
+    scheduler = Scheduler(cpu)
+    scheduler.schedule(500, lambda scheduler: None)
+    cpu.breakpoints.add(0x0202)
+
+    # When:
+    used = scheduler.run(1000)
+
+    # Then:
+    AssertThat(scheduler.stop.reason).IsEqualTo(StopReason.BREAKPOINT)
+    AssertThat(scheduler.stop.cycles).IsEqualTo(used)
+    AssertThat(cpu.pc).IsEqualTo(0x0202)
+    AssertThat(scheduler.now).IsEqualTo(used)
+
+    # When:
+    cpu.breakpoints.clear()
+    cpu.Memory.add_watchpoint(0x20)
+    scheduler.run(1000)
+
+    # Then:
+    AssertThat(scheduler.stop.reason).IsEqualTo(StopReason.WATCHPOINT)
+    AssertThat(cpu.pc).IsEqualTo(0x0202)
+
+
+def test_run_stops_at_a_trap_only_when_asked():
+    # Given: JMP *
+    cpu = make_cpu([OpCodes.INS_JMP_ABS, 0x00, 0x02])
+    scheduler = Scheduler(cpu)
+
+    # When:
+    scheduler.run(1000)
+    untrapped = scheduler.stop
+    used = scheduler.run(1000, trap=True)
+
+    # Then:
+    AssertThat(untrapped.reason).IsEqualTo(StopReason.CYCLES)
+    AssertThat(untrapped.cycles).IsAtLeast(1000)
+    AssertThat(scheduler.stop).IsEqualTo(Stop(StopReason.TRAP, 1, 3))
+    AssertThat(used).IsEqualTo(3)
@@ -1,5 +1,8 @@
+from truth.truth import AssertThat
+
+from ..emulator.const import OpCodes
+
 # ASLCanShiftTheValueOfOne
-# ASLCanShiftANegativeValue
 # ASLZeroPageCanShiftTheValueOfOne
 # ASLZeroPageCanShiftANegativeValue
 # ASLZeroPageXCanShiftTheValueOfOne
@@ -16,14 +19,12 @@
 # LSRZeroPageXCanShiftAZeroIntoTheCarryFlag
 # LSRAbsCanShiftTheValueOfOne
 # LSRAbsCanShiftAZeroIntoTheCarryFlag
-# LSRAbsXCanShiftTheValueOfOne
 # LSRAbsXCanShiftAZeroIntoTheCarryFlag
 # ROLCanShiftABitOutOfTheCarryFlag
 # ROLCanShiftABitIntoTheCarryFlag
 # ROLCanShiftZeroWithNoCarry
 # ROLCanShiftAValueThatResultInANegativeValue
 # ROLZeroPageCanShiftABitOutOfTheCarryFlag
-# ROLZeroPageCanShiftABitIntoTheCarryFlag
 # ROLZeroPageCanShiftZeroWithNoCarry
 # ROLZeroPageCanShiftAValueThatResultInANegativeValue
 # ROLZeroPageXCanShiftABitOutOfTheCarryFlag
@@ -38,7 +39,6 @@
 # ROLAbsoluteXCanShiftABitIntoTheCarryFlag
 # ROLAbsoluteXCanShiftZeroWithNoCarry
 # ROLAbsoluteXCanShiftAValueThatResultInANegativeValue
-# RORCanShiftTheCarryFlagIntoTheOperand
 # RORCanShiftAValueIntoTheCarryFlag
 # RORCanRotateANumber
 # RORZeroPageCanShiftTheCarryFlagIntoTheOperand
@@ -53,3 +53,89 @@
 # RORAbsoluteXPageCanShiftTheCarryFlagIntoTheOperand
 # RORAbsoluteXPageCanShiftAValueIntoTheCarryFlag
 # RORAbsoluteXPageCanRotateANumber
+
+
+def test_asl_can_shift_a_negative_value(cpu):
+    """ASLCanShiftANegativeValue"""
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.A = 0b11000010
+    cpu.Memory[0xFF00] = OpCodes.INS_ASL
+    expected_cycles = 2
+
+    # When:
+    cycles_used = cpu.execute(expected_cycles)
+
+    # Then:
+    AssertThat(cycles_used).IsEqualTo(expected_cycles)
+    AssertThat(cpu.A).IsEqualTo(0b10000100)
+    AssertThat(cpu.Flag.C).IsTruthy()
+    AssertThat(cpu.Flag.N).IsTruthy()
+    AssertThat(cpu.Flag.Z).IsFalsy()
+
+
+def test_lsr_abs_x_can_shift_the_value_of_one(cpu):
+    """LSRAbsXCanShiftTheValueOfOne"""
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Flag.C = False
+    cpu.Flag.Z = False
+    cpu.Flag.N = True
+    cpu.X = 0x10
+    cpu.Memory[0xFF00] = OpCodes.INS_LSR_ABSX
+    cpu.Memory[0xFF01] = 0x00
+    cpu.Memory[0xFF02] = 0x80
+    cpu.Memory[0x8010] = 1
+    expected_cycles = 7
+
+    # When:
+    cycles_used = cpu.execute(expected_cycles)
+
+    # Then:
+    AssertThat(cycles_used).IsEqualTo(expected_cycles)
+    AssertThat(cpu.Memory[0x8010]).IsEqualTo(0)
+    AssertThat(cpu.Flag.C).IsTruthy()
+    AssertThat(cpu.Flag.Z).IsTruthy()
+    AssertThat(cpu.Flag.N).IsFalsy()
+
+
+def test_rol_zero_page_can_shift_a_bit_into_the_carry_flag(cpu):
+    """ROLZeroPageCanShiftABitIntoTheCarryFlag"""
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Flag.C = False
+    cpu.Memory[0xFF00] = OpCodes.INS_ROL_ZP
+    cpu.Memory[0xFF01] = 0x42
+    cpu.Memory[0x0042] = 0b10000000
+    expected_cycles = 5
+
+    # When:
+    cycles_used = cpu.execute(expected_cycles)
+
+    # Then:
+    AssertThat(cycles_used).IsEqualTo(expected_cycles)
+    AssertThat(cpu.Memory[0x0042]).IsEqualTo(0)
+    AssertThat(cpu.Flag.C).IsTruthy()
+    AssertThat(cpu.Flag.Z).IsTruthy()
+    AssertThat(cpu.Flag.N).IsFalsy()
+
+
+def test_ror_can_shift_the_carry_flag_into_the_operand(cpu):
+    """RORCanShiftTheCarryFlagIntoTheOperand"""
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Flag.C = True
+    cpu.Flag.Z = True
+    cpu.A = 0
+    cpu.Memory[0xFF00] = OpCodes.INS_ROR
+    expected_cycles = 2
+
+    # When:
+    cycles_used = cpu.execute(expected_cycles)
+
+    # Then:
+    AssertThat(cycles_used).IsEqualTo(expected_cycles)
+    AssertThat(cpu.A).IsEqualTo(0b10000000)
+    AssertThat(cpu.Flag.C).IsFalsy()
+    AssertThat(cpu.Flag.Z).IsFalsy()
+    AssertThat(cpu.Flag.N).IsTruthy()
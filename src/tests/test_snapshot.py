@@ -0,0 +1,101 @@
+from truth.truth import AssertThat
+
+from ..benchmarks.instructions_per_second import copy_loop
+from ..emulator.c_types import Byte
+from ..emulator.const import OpCodes
+from ..emulator.translator import Translator
+from .test_translator import registers
+
+
+def load_copy_loop(cpu):
+    program = [Byte(x) for x in copy_loop]
+    cpu.program_counter = cpu.load_program(program, len(program))
+    cpu.Memory.data[0x0300:0x0380] = bytes(range(0x80))
+
+
+def test_restore_puts_the_registers_and_memory_back(cpu):
+    # Given:
+    load_copy_loop(cpu)
+    snapshot = cpu.snapshot()
+    state = registers(cpu), cpu.cycles, bytes(cpu.Memory.data)
+
+    # When:
+    cpu.execute(3_000)
+    AssertThat(cpu.Memory[0x0400]).IsNotEqualTo(0)
+    cpu.restore(snapshot)
+
+    # Then:
+    AssertThat((registers(cpu), cpu.cycles, bytes(cpu.Memory.data))).IsEqualTo(state)
+
+
+def test_restore_only_copies_the_pages_written_since_the_snapshot(cpu):
+    # Given:
+    load_copy_loop(cpu)
+    snapshot = cpu.snapshot()
+
+    # When:
+    cpu.execute(3_000)
+
+    # Then:
+    AssertThat(cpu.Memory.dirty_pages).ContainsExactly(0x04)
+    cpu.restore(snapshot)
+    AssertThat(cpu.Memory.dirty_pages).IsEmpty()
+    AssertThat(cpu.Memory[0x0400]).IsEqualTo(0)
+
+
+def test_restore_an_older_snapshot_copies_all_of_memory(cpu):
+    # Given:
+    load_copy_loop(cpu)
+    first = cpu.snapshot()
+    cpu.execute(3_000)
+    second = cpu.snapshot()
+    cpu.execute(3_000)
+
+    # When:
+    cpu.restore(first)
+
+    # Then:
+    AssertThat(bytes(cpu.Memory.data)).IsEqualTo(first.memory)
+    cpu.restore(second)
+    AssertThat(bytes(cpu.Memory.data)).IsEqualTo(second.memory)
+    AssertThat(cpu.snapshot().registers).IsEqualTo(second.registers)
+
+
+def test_fork_is_independent_and_can_restore_the_parents_snapshot(cpu):
+    # Given:
+    load_copy_loop(cpu)
+    snapshot = cpu.snapshot()
+    cpu.execute(100)
+    state = registers(cpu), cpu.cycles, bytes(cpu.Memory.data)
+
+    # When:
+    fork = cpu.fork()
+    fork.execute(3_000)
+
+    # Then:
+    AssertThat((registers(cpu), cpu.cycles, bytes(cpu.Memory.data))).IsEqualTo(state)
+    AssertThat(fork.Memory.data == cpu.Memory.data).IsFalse()
+    fork.restore(snapshot)
+    AssertThat(bytes(fork.Memory.data)).IsEqualTo(snapshot.memory)
+    AssertThat(fork.snapshot().registers).IsEqualTo(snapshot.registers)
+
+
+def test_restore_drops_translated_blocks_for_the_pages_it_copies(cpu):
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_LDA_IM
+    cpu.Memory[0xFF01] = 0x11
+    cpu.Memory[0xFF02] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF03] = 0x00
+    cpu.Memory[0xFF04] = 0xFF
+    snapshot = cpu.snapshot()
+    translator = Translator(cpu)
+    cpu.Memory[0xFF01] = 0x22
+    translator.execute(5)
+
+    # When:
+    cpu.restore(snapshot)
+    translator.execute(5)
+
+    # Then:
+    AssertThat(cpu.A).IsEqualTo(0x11)
@@ -1,3 +1,7 @@
+from truth.truth import AssertThat
+
+from ..emulator.const import OpCodes, ProcessorStatus
+
 # TSXCanTransferTheStackPointerToXRegister
 # TSXCanTransferAZeroStackPointerToXRegister
 # TSXCanTransferANegativeStackPointerToXRegister
@@ -6,7 +10,53 @@
 # PLACanPullAValueFromTheStackIntoTheARegsiter
 # PLACanPullAZeroValueFromTheStackIntoTheARegsiter
 # PLACanPullANegativeValueFromTheStackIntoTheARegsiter
-# PHPCanPushProcessorStatusOntoTheStack
-# PHPAlwaysSetsBits4And5OnTheStack
-# PLPCanPullAValueFromTheStackIntoTheProcessorStatus
-# PLPClearsBits4And5WhenPullingFromTheStack
+
+
+def test_php_can_push_processor_status_onto_the_stack(cpu):
+    """PHPCanPushProcessorStatusOntoTheStack"""
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.processor_status = 0xCC
+    cpu.Memory[0xFF00] = OpCodes.INS_PHP
+    expected_cycles = 3
+
+    # When:
+    cycles_used = cpu.execute(expected_cycles)
+
+    # Then:
+    AssertThat(cycles_used).IsEqualTo(expected_cycles)
+    AssertThat(cpu.Memory[cpu.sp_to_address + 1]).IsEqualTo(
+        0xCC | ProcessorStatus.UnusedFlagBit | ProcessorStatus.BreakFlagBit
+    )
+    AssertThat(cpu.processor_status).IsEqualTo(0xCC)
+    AssertThat(cpu.stack_pointer).IsEqualTo(0xFE)
+
+
+def test_plp_clears_bits_4_and_5_when_pulling_from_the_stack(cpu):
+    """PLPClearsBits4And5WhenPullingFromTheStack"""
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.stack_pointer = 0xFE
+    cpu.Memory[0x01FF] = 0xFF
+    cpu.Memory[0xFF00] = OpCodes.INS_PLP
+    expected_cycles = 4
+
+    # When:
+    cycles_used = cpu.execute(expected_cycles)
+
+    # Then:
+    AssertThat(cycles_used).IsEqualTo(expected_cycles)
+    AssertThat(cpu.processor_status).IsEqualTo(0xFF & ~(ProcessorStatus.UnusedFlagBit | ProcessorStatus.BreakFlagBit))
+    AssertThat(cpu.Flag.N).IsTruthy()
+    AssertThat(cpu.Flag.C).IsTruthy()
+    AssertThat(cpu.Flag.B).IsFalsy()
+
+
+def test_flags_are_bits_of_the_processor_status(cpu):
+    cpu.Flag.C = True
+    cpu.Flag.N = True
+    AssertThat(cpu.processor_status).IsEqualTo(ProcessorStatus.CarryFlagBit | ProcessorStatus.NegativeFlagBit)
+
+    cpu.processor_status = ProcessorStatus.OverflowFlagBit
+    AssertThat(cpu.Flag.V).IsEqualTo(1)
+    AssertThat(cpu.Flag.C).IsEqualTo(0)
@@ -1,5 +1,3 @@
-import copy
-
 from truth.truth import AssertThat
 
 from ..emulator.const import OpCodes
@@ -12,7 +10,7 @@ def test_clc_will_clear_the_carry_flag(cpu):
     cpu.Flag.C = True
     cpu.Memory[0xFF00] = OpCodes.INS_CLC
     expected_cycles = 2
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When:
     cycles_used = cpu.execute(expected_cycles)
@@ -35,7 +33,7 @@ def test_sec_will_clear_the_carry_flag(cpu):
     cpu.Flag.C = False
     cpu.Memory[0xFF00] = OpCodes.INS_SEC
     expected_cycles = 2
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When:
     cycles_used = cpu.execute(expected_cycles)
@@ -58,7 +56,7 @@ def test_cld_will_clear_the_decimal_flag(cpu):
     cpu.Flag.D = True
     cpu.Memory[0xFF00] = OpCodes.INS_CLD
     expected_cycles = 2
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When:
     cycles_used = cpu.execute(expected_cycles)
@@ -81,7 +79,7 @@ def test_sed_will_clear_the_decimal_flag(cpu):
     cpu.Flag.D = False
     cpu.Memory[0xFF00] = OpCodes.INS_SED
     expected_cycles = 2
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When:
     cycles_used = cpu.execute(expected_cycles)
@@ -104,7 +102,7 @@ def test_cli_will_clear_the_interrupt_flag(cpu):
     cpu.Flag.I = True
     cpu.Memory[0xFF00] = OpCodes.INS_CLI
     expected_cycles = 2
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When:
     cycles_used = cpu.execute(expected_cycles)
@@ -127,7 +125,7 @@ def test_sei_will_clear_the_interrupt_flag(cpu):
     cpu.Flag.I = False
     cpu.Memory[0xFF00] = OpCodes.INS_SEI
     expected_cycles = 2
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When:
     cycles_used = cpu.execute(expected_cycles)
@@ -150,7 +148,7 @@ def test_clv_will_clear_the_overflow_flag(cpu):
     cpu.Flag.V = True
     cpu.Memory[0xFF00] = OpCodes.INS_CLV
     expected_cycles = 2
-    cpu_copy = copy.copy(cpu)
+    cpu_copy = cpu.fork()
 
     # When:
     cycles_used = cpu.execute(expected_cycles)
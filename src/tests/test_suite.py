@@ -0,0 +1,118 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..benchmarks.suite import (
+    KERNELS,
+    Kernel,
+    branches,
+    format_results,
+    load_kernel,
+    load_results,
+    memcpy,
+    multiply,
+    regressions,
+    run_functional_test,
+    run_kernel,
+    save_results,
+    stack,
+)
+
+ENGINES = ["cpu", "fast"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_memcpy_kernel_copies_four_pages(engine):
+    # given:
+    cpu = load_kernel(engine, Kernel("memcpy", memcpy))
+    source = bytes(range(0x100)) * 4
+    cpu.Memory.load(0x1000, source)
+
+    # when:
+    cpu.run_until_pc(0x0220)
+
+    # then:
+    AssertThat(bytes(cpu.Memory.data[0x2000:0x2400])).IsEqualTo(source)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_multiply_kernel_multiplies(engine):
+    # given:
+    cpu = load_kernel(engine, Kernel("multiply", multiply))
+    cpu.run_until_pc(0x0206)
+    data = cpu.Memory.data
+
+    for _ in range(300):
+        # when:
+        factors = data[0xF0], data[0xF1]
+        cpu.run_until_pc(0x0209)
+
+        # then:
+        AssertThat(data[0xF2] << 8 | data[0xF3]).IsEqualTo(factors[0] * factors[1])
+        data[0xF0], data[0xF1] = (factors[0] * 7 + 13) & 0xFF, (factors[1] * 5 + 3) & 0xFF
+        cpu.run_until_pc(0x0206)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_branches_kernel_counts_each_case(engine):
+    # given:
+    cpu = load_kernel(engine, Kernel("branches", branches))
+
+    # when:
+    cpu.run_until_pc(0x0223)
+
+    # then:
+    AssertThat(list(cpu.Memory.data[0x10:0x14])).IsEqualTo([64, 64, 64, 64])
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_stack_kernel_returns_to_the_top_of_the_stack(engine):
+    # given:
+    cpu = load_kernel(engine, Kernel("stack", stack))
+    sp = cpu.sp
+
+    # when:
+    for _ in range(3):
+        cpu.run_until_pc(0x0205)
+
+    # then:
+    AssertThat(cpu.Memory.data[0x20]).IsEqualTo(3)
+    AssertThat(cpu.sp).IsEqualTo(sp)
+
+
+@pytest.mark.parametrize("kernel", KERNELS, ids=[kernel.name for kernel in KERNELS])
+def test_run_kernel_reports_rates(kernel):
+    # when:
+    result = run_kernel("fast", kernel, num_cycles=20_000, repeat=1)
+
+    # then:
+    AssertThat(result.benchmark).IsEqualTo(kernel.name)
+    AssertThat(result.cycles).IsAtLeast(20_000)
+    AssertThat(result.instructions).IsGreaterThan(0)
+    AssertThat(result.cycles_per_second).IsEqualTo(result.cycles / result.seconds)
+    AssertThat(result.mhz).IsEqualTo(result.cycles_per_second / 1e6)
+    AssertThat(result.passed).IsNone()
+
+
+def test_functional_test_stopped_early_has_not_passed():
+    # when:
+    result = run_functional_test("fast", cycles=100_000)
+
+    # then:
+    AssertThat(result.cycles).IsAtLeast(100_000)
+    AssertThat(result.passed).IsFalse()
+
+
+def test_results_round_trip_through_json_and_find_regressions(tmp_path):
+    # given:
+    results = [run_kernel("fast", KERNELS[0], num_cycles=20_000, repeat=1)]
+    path = str(tmp_path / "results.json")
+    save_results(results, path)
+    baseline = load_results(path)
+    slower = [results[0]._replace(cycles_per_second=results[0].cycles_per_second * 0.8)]
+
+    # then:
+    AssertThat(baseline).IsEqualTo(results)
+    AssertThat(regressions(results, baseline)).IsEmpty()
+    AssertThat(regressions(slower, baseline)).HasSize(1)
+    AssertThat(regressions(slower, baseline, tolerance=0.3)).IsEmpty()
+    AssertThat(format_results(results)).Contains("memcpy")
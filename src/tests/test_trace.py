@@ -0,0 +1,91 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..benchmarks.instructions_per_second import copy_loop
+from ..emulator.c_types import Byte
+from ..emulator.m6502 import CPU
+from ..emulator.trace import TraceRecorder, read_trace, trace_lines
+
+
+def as_tuples(trace):
+    return [tuple(int(value) for value in record) for record in trace]
+
+
+def copy_loop_cpu():
+    cpu = CPU()
+    program = [Byte(x) for x in copy_loop]
+    cpu.program_counter = cpu.load_program(program, len(program))
+    return cpu
+
+
+def test_records_hold_the_state_before_each_instruction():
+    # Given:
+    cpu = copy_loop_cpu()
+    recorder = TraceRecorder(cpu)
+
+    # When:
+    recorder.run(10)
+
+    # Then:
+    AssertThat(as_tuples(recorder.records())[:3]).ContainsExactly(
+        (0x0200, 0xA2, 0x00, 0xBD, 0, 0, 0, 0, 0xFF, 0),  # LDX #$00
+        (0x0202, 0xBD, 0x00, 0x03, 0, 0, 0, 0x02, 0xFF, 2),  # LDA $0300,X
+        (0x0205, 0x49, 0x5A, 0x69, 0, 0, 0, 0x02, 0xFF, 6),  # EOR #$5A
+    ).InOrder()
+    AssertThat(list(trace_lines(recorder.records()))[:2]).ContainsExactly(
+        "$0200  A2 00     LDX #$00     A:00 X:00 Y:00 P:00 SP:FF CYC:0",
+        "$0202  BD 00 03  LDA $0300,X  A:00 X:00 Y:00 P:02 SP:FF CYC:2",
+    ).InOrder()
+
+
+def test_ring_buffer_keeps_the_latest_records():
+    # Given:
+    traced = copy_loop_cpu()
+    recorder = TraceRecorder(traced, size=16)
+    full = TraceRecorder(copy_loop_cpu(), size=1000)
+
+    # When:
+    recorder.run(300)
+    recorder.run(200)
+    full.run(500)
+
+    # Then:
+    AssertThat(recorder.recorded).IsEqualTo(full.recorded)
+    AssertThat(as_tuples(recorder.records())).IsEqualTo(as_tuples(full.records())[-16:])
+
+
+def test_streamed_file_holds_the_whole_trace(tmp_path):
+    # Given:
+    path = str(tmp_path / "copy_loop.trace")
+    full = TraceRecorder(copy_loop_cpu(), size=10_000)
+
+    # When:
+    with TraceRecorder(copy_loop_cpu(), size=64, path=path) as recorder:
+        recorder.run(5_000)
+    full.run(5_000)
+
+    # Then:
+    AssertThat(recorder.recorded).IsGreaterThan(64)
+    AssertThat(as_tuples(read_trace(path))).IsEqualTo(as_tuples(full.records()))
+
+
+@pytest.mark.parametrize("size", [100, 4])
+def test_a_run_stopped_by_an_unhandled_opcode_keeps_its_records(tmp_path, size):
+    # Given: 5 NOPs, then $02 which the default policy does not run
+    cpu = CPU()
+    cpu.Memory.data[0x0200:0x0206] = bytes([0xEA] * 5 + [0x02])
+    cpu.pc = 0x0200
+    path = str(tmp_path / "crash.trace")
+    recorder = TraceRecorder(cpu, size=size, path=path)
+
+    # When:
+    with pytest.raises(NotImplementedError):
+        recorder.run(100)
+    recorder.close()
+
+    # Then:
+    pcs = [0x0200 + index for index in range(6)]
+    AssertThat(recorder.recorded).IsEqualTo(6)
+    AssertThat([record[0] for record in as_tuples(recorder.records())]).IsEqualTo(pcs[-size:])
+    AssertThat([record[0] for record in as_tuples(read_trace(path))]).IsEqualTo(pcs)
+    AssertThat(as_tuples(read_trace(path))[-1][1]).IsEqualTo(0x02)
@@ -0,0 +1,189 @@
+import random
+
+import pytest
+from truth.truth import AssertThat
+
+from ..benchmarks.instructions_per_second import copy_loop
+from ..emulator.c_types import Byte
+from ..emulator.const import OpCodes
+from ..emulator.m6502 import CPU, Memory
+from ..emulator.translator import DECODE, Translator
+
+
+def registers(cpu):
+    return cpu.a, cpu.x, cpu.y, cpu.p, cpu.sp, cpu.pc
+
+
+def random_cpu(seed):
+    """Makes a CPU with random registers and memory, so addresses, flags and page crossings vary"""
+    rng = random.Random(seed)
+    cpu = CPU()
+    cpu.Memory.data[:] = rng.getrandbits(8 * cpu.Memory.max_memory).to_bytes(cpu.Memory.max_memory, "little")
+    cpu.a, cpu.x, cpu.y, cpu.p, cpu.sp = (rng.getrandbits(8) for _ in range(5))
+    return cpu, rng
+
+
+@pytest.mark.parametrize("opcode", sorted(DECODE), ids=lambda opcode: f"{DECODE[opcode][0]}_{opcode:02X}")
+def test_translated_instruction_matches_the_interpreter(opcode):
+    for seed in range(8):
+        interpreted, rng = random_cpu(seed)
+        interpreted.pc = 0x0200 + rng.getrandbits(8)
+        interpreted.Memory.data[interpreted.pc] = opcode
+        # An opcode the translator does not know, so the block is the one instruction
+        interpreted.Memory.data[(interpreted.pc + 1 + rng.getrandbits(2)) & 0xFFFF] = 0x02
+        translated = CPU()
+        translated.Memory.data[:] = interpreted.Memory.data
+        translated.a, translated.x, translated.y, translated.p, translated.sp, translated.pc = registers(interpreted)
+
+        interpreted_cycles = interpreted.execute(1)
+        translated_cycles = Translator(translated).execute(1)
+
+        AssertThat(translated_cycles).IsEqualTo(interpreted_cycles)
+        AssertThat(registers(translated)).IsEqualTo(registers(interpreted))
+        AssertThat(translated.Memory.data == interpreted.Memory.data).IsTrue()
+
+
+def test_translated_copy_loop_matches_the_interpreter():
+    program = [Byte(x) for x in copy_loop]
+    interpreted, translated = CPU(), CPU()
+    for cpu in (interpreted, translated):
+        cpu.program_counter = cpu.load_program(program, len(program))
+        cpu.Memory.data[0x0300:0x0380] = bytes(range(0x80))
+    translator = Translator(translated)
+
+    for cycles in (1, 7, 100, 5_000, 3):
+        AssertThat(translator.execute(cycles)).IsEqualTo(interpreted.execute(cycles))
+        AssertThat(registers(translated)).IsEqualTo(registers(interpreted))
+    AssertThat(translated.Memory.data == interpreted.Memory.data).IsTrue()
+
+
+def test_blocks_are_translated_once_and_cached(cpu):
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_INX
+    cpu.Memory[0xFF01] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF02] = 0x00
+    cpu.Memory[0xFF03] = 0xFF
+    translator = Translator(cpu)
+
+    # When:
+    translator.execute(5)
+    block = translator.blocks[0xFF00]
+    translator.execute(500)
+
+    # Then:
+    AssertThat(translator.blocks).HasSize(1)
+    AssertThat(translator.blocks[0xFF00]).IsSameAs(block)
+    AssertThat(block.instructions).IsEqualTo(2)
+    AssertThat(block.length).IsEqualTo(4)
+    AssertThat(cpu.X).IsEqualTo(101)
+
+
+def test_invalidate_drops_the_block_containing_the_address(cpu):
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_LDA_IM
+    cpu.Memory[0xFF01] = 0x11
+    cpu.Memory[0xFF02] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF03] = 0x00
+    cpu.Memory[0xFF04] = 0xFF
+    translator = Translator(cpu)
+    translator.execute(5)
+
+    # When:
+    cpu.Memory.data[0xFF01] = 0x22
+    translator.invalidate(0xFF01)
+    translator.execute(5)
+
+    # Then:
+    AssertThat(cpu.A).IsEqualTo(0x22)
+
+
+def test_writing_to_translated_code_drops_only_the_blocks_containing_it(cpu):
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_LDA_IM
+    cpu.Memory[0xFF01] = 0x11
+    cpu.Memory[0xFF02] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF03] = 0x10
+    cpu.Memory[0xFF04] = 0xFF
+    cpu.Memory[0xFF10] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF11] = 0x00
+    cpu.Memory[0xFF12] = 0xFF
+    translator = Translator(cpu)
+    translator.execute(6)
+    other_block = translator.blocks[0xFF10]
+
+    # When:
+    cpu.Memory[0xFF01] = 0x22
+
+    # Then:
+    AssertThat(translator.blocks).DoesNotContainKey(0xFF00)
+    AssertThat(translator.blocks[0xFF10]).IsSameAs(other_block)
+    AssertThat(cpu.Memory.watched_pages[0xFF]).IsTruthy()
+    translator.execute(6)
+    AssertThat(cpu.A).IsEqualTo(0x22)
+
+
+def test_writing_to_data_pages_keeps_the_blocks(cpu):
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_INX
+    cpu.Memory[0xFF01] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF02] = 0x00
+    cpu.Memory[0xFF03] = 0xFF
+    translator = Translator(cpu)
+    translator.execute(5)
+    block = translator.blocks[0xFF00]
+
+    # When:
+    cpu.Memory[0xFE00] = 0x42
+
+    # Then:
+    AssertThat(translator.blocks[0xFF00]).IsSameAs(block)
+    AssertThat(cpu.Memory.watched_pages[0xFE]).IsFalsy()
+
+
+@pytest.mark.parametrize("checked", [True, False])
+def test_self_modifying_code_matches_the_interpreter(checked):
+    # fmt: off
+    program = [
+        0x00, 0x02,
+        0xA9, 0x00,        # loop: LDA #$00
+        0x9D, 0x00, 0x03,  #       STA $0300,X
+        0xEE, 0x03, 0x02,  #       INC loop+1
+        0xE8,              #       INX
+        0xD0, 0xF5,        #       BNE loop
+        0x4C, 0x00, 0x02,  #       JMP loop
+    ]
+    # fmt: on
+    interpreted, translated = CPU(Memory(checked)), CPU(Memory(checked))
+    for cpu in (interpreted, translated):
+        cpu.program_counter = cpu.load_program([Byte(x) for x in program], len(program))
+
+    AssertThat(Translator(translated).execute(20_000)).IsEqualTo(interpreted.execute(20_000))
+    AssertThat(registers(translated)).IsEqualTo(registers(interpreted))
+    AssertThat(translated.Memory.data == interpreted.Memory.data).IsTrue()
+
+
+def test_reset_drops_every_block(cpu):
+    # Given:
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_INX
+    cpu.Memory[0xFF01] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF02] = 0x00
+    cpu.Memory[0xFF03] = 0xFF
+    translator = Translator(cpu)
+    translator.execute(5)
+
+    # When:
+    cpu.reset_to(0xFF00)
+    cpu.Memory[0xFF00] = OpCodes.INS_INY
+    cpu.Memory[0xFF01] = OpCodes.INS_JMP_ABS
+    cpu.Memory[0xFF02] = 0x00
+    cpu.Memory[0xFF03] = 0xFF
+    translator.execute(5)
+
+    # Then:
+    AssertThat(cpu.X).IsEqualTo(0)
+    AssertThat(cpu.Y).IsEqualTo(1)
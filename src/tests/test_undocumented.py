@@ -0,0 +1,252 @@
+import pytest
+from truth.truth import AssertThat
+
+from ..emulator.const import ProcessorStatus, StopReason, Undocumented, UndocumentedOpCodes
+from ..emulator.fast import FastCPU
+from ..emulator.m6502 import CPU, opcode_names
+
+UNDOCUMENTED = list(opcode_names(UndocumentedOpCodes))
+
+C = ProcessorStatus.CarryFlagBit
+Z = ProcessorStatus.ZeroFlagBit
+V = ProcessorStatus.OverflowFlagBit
+N = ProcessorStatus.NegativeFlagBit
+
+# Cycles without page crossings, from the NMOS 6502 timing tables
+READ_MODIFY_WRITE_CYCLES = {"ZP": 5, "ZPX": 6, "ABS": 6, "ABSX": 7, "ABSY": 7, "INDX": 8, "INDY": 8}
+READ_CYCLES = {"IM": 2, "ZP": 3, "ZPX": 4, "ZPY": 4, "ABS": 4, "ABSX": 4, "ABSY": 4, "INDX": 6, "INDY": 5}
+STORE_CYCLES = {"ABSX": 5, "ABSY": 5, "INDY": 6}
+
+
+def expected_cycles(mnemonic, mode):
+    if mnemonic in ("SLO", "RLA", "SRE", "RRA", "DCP", "ISC"):
+        return READ_MODIFY_WRITE_CYCLES[mode]
+    if mnemonic in ("TAS", "SHA", "SHX", "SHY"):
+        return STORE_CYCLES[mode]
+    if mode is None:
+        return 2
+    return READ_CYCLES[mode]
+
+
+def run(program, undocumented=Undocumented.IMPLEMENT, a=0, x=0, y=0, p=0, memory=()):
+    """Runs the program's first instruction from $0200, with memory set from (address, value) pairs"""
+    cpu = CPU(undocumented=undocumented)
+    cpu.Memory.data[0x0200 : 0x0200 + len(program)] = bytes(program)
+    for address, value in memory:
+        cpu.Memory.data[address] = value
+    cpu.pc, cpu.a, cpu.x, cpu.y, cpu.p = 0x0200, a, x, y, p
+    cpu.execute(1)
+    return cpu
+
+
+def test_every_opcode_is_documented_or_undocumented():
+    documented = [opcode for opcode, _, _ in opcode_names()]
+    undocumented = [opcode for opcode, _, _ in UNDOCUMENTED]
+
+    AssertThat(len(undocumented)).IsEqualTo(105)
+    AssertThat(sorted(documented + undocumented)).IsEqualTo(list(range(0x100)))
+
+
+@pytest.mark.parametrize(
+    "opcode, mnemonic, mode",
+    [entry for entry in UNDOCUMENTED if entry[1] != "JAM"],
+    ids=lambda value: f"{value:02X}" if isinstance(value, int) else str(value),
+)
+def test_undocumented_opcode_takes_its_documented_cycles(opcode, mnemonic, mode):
+    # given:
+    cpu = CPU(undocumented=Undocumented.IMPLEMENT)
+    cpu.Memory.data[0x0200:0x0203] = bytes([opcode, 0x10, 0x00])
+    cpu.pc = 0x0200
+
+    # when:
+    cycles = cpu.execute(1)
+
+    # then:
+    AssertThat(cycles).IsEqualTo(expected_cycles(mnemonic, mode))
+
+
+def test_lax_loads_a_and_x():
+    cpu = run([UndocumentedOpCodes.INS_LAX_ZP, 0x42], memory=[(0x42, 0x80)])
+
+    AssertThat(cpu.a).IsEqualTo(0x80)
+    AssertThat(cpu.x).IsEqualTo(0x80)
+    AssertThat(cpu.p & N).IsEqualTo(N)
+
+
+def test_sax_stores_a_and_x():
+    cpu = run([UndocumentedOpCodes.INS_SAX_ABS, 0x00, 0x03], a=0xF0, x=0x3C)
+
+    AssertThat(cpu.Memory.data[0x0300]).IsEqualTo(0x30)
+
+
+def test_dcp_decrements_then_compares():
+    cpu = run([UndocumentedOpCodes.INS_DCP_ZP, 0x42], a=0x10, memory=[(0x42, 0x11)])
+
+    AssertThat(cpu.Memory.data[0x42]).IsEqualTo(0x10)
+    AssertThat(cpu.p & (Z | C | N)).IsEqualTo(Z | C)
+
+
+def test_isc_increments_then_subtracts():
+    cpu = run([UndocumentedOpCodes.INS_ISC_ZP, 0x42], a=0x20, p=C, memory=[(0x42, 0x0F)])
+
+    AssertThat(cpu.Memory.data[0x42]).IsEqualTo(0x10)
+    AssertThat(cpu.a).IsEqualTo(0x10)
+    AssertThat(cpu.p & C).IsEqualTo(C)
+
+
+def test_slo_shifts_left_then_ors():
+    cpu = run([UndocumentedOpCodes.INS_SLO_ZP, 0x42], a=0x01, memory=[(0x42, 0x81)])
+
+    AssertThat(cpu.Memory.data[0x42]).IsEqualTo(0x02)
+    AssertThat(cpu.a).IsEqualTo(0x03)
+    AssertThat(cpu.p & C).IsEqualTo(C)
+
+
+def test_rla_rotates_left_then_ands():
+    cpu = run([UndocumentedOpCodes.INS_RLA_ZP, 0x42], a=0xFF, p=C, memory=[(0x42, 0x80)])
+
+    AssertThat(cpu.Memory.data[0x42]).IsEqualTo(0x01)
+    AssertThat(cpu.a).IsEqualTo(0x01)
+    AssertThat(cpu.p & C).IsEqualTo(C)
+
+
+def test_sre_shifts_right_then_eors():
+    cpu = run([UndocumentedOpCodes.INS_SRE_ZP, 0x42], a=0xFF, memory=[(0x42, 0x03)])
+
+    AssertThat(cpu.Memory.data[0x42]).IsEqualTo(0x01)
+    AssertThat(cpu.a).IsEqualTo(0xFE)
+    AssertThat(cpu.p & (C | N)).IsEqualTo(C | N)
+
+
+def test_rra_rotates_right_then_adds_with_the_carry_it_shifted_out():
+    cpu = run([UndocumentedOpCodes.INS_RRA_ZP, 0x42], a=0x10, memory=[(0x42, 0x03)])
+
+    AssertThat(cpu.Memory.data[0x42]).IsEqualTo(0x01)
+    AssertThat(cpu.a).IsEqualTo(0x12)
+
+
+def test_anc_copies_negative_to_carry():
+    cpu = run([UndocumentedOpCodes.INS_ANC_IM_0B, 0x80], a=0xFF)
+
+    AssertThat(cpu.a).IsEqualTo(0x80)
+    AssertThat(cpu.p & (C | N)).IsEqualTo(C | N)
+
+
+def test_alr_ands_then_shifts_right():
+    cpu = run([UndocumentedOpCodes.INS_ALR_IM, 0x03], a=0xFF)
+
+    AssertThat(cpu.a).IsEqualTo(0x01)
+    AssertThat(cpu.p & C).IsEqualTo(C)
+
+
+def test_arr_ands_then_rotates_right_setting_carry_and_overflow_from_bits_6_and_5():
+    cpu = run([UndocumentedOpCodes.INS_ARR_IM, 0xC0], a=0xFF, p=C)
+
+    AssertThat(cpu.a).IsEqualTo(0xE0)
+    AssertThat(cpu.p & (C | V | N)).IsEqualTo(C | N)
+
+
+def test_sbx_subtracts_from_a_and_x():
+    cpu = run([UndocumentedOpCodes.INS_SBX_IM, 0x05], a=0xFF, x=0x0F)
+
+    AssertThat(cpu.x).IsEqualTo(0x0A)
+    AssertThat(cpu.a).IsEqualTo(0xFF)
+    AssertThat(cpu.p & C).IsEqualTo(C)
+
+
+def test_sbc_eb_is_sbc_immediate():
+    cpu = run([UndocumentedOpCodes.INS_SBC_EB, 0x01], a=0x10, p=C)
+
+    AssertThat(cpu.a).IsEqualTo(0x0F)
+
+
+@pytest.mark.parametrize(
+    "program, length",
+    [
+        ([UndocumentedOpCodes.INS_NOP_1A], 1),
+        ([UndocumentedOpCodes.INS_DOP_IM_80, 0xFF], 2),
+        ([UndocumentedOpCodes.INS_DOP_ZPX_14, 0x42], 2),
+        ([UndocumentedOpCodes.INS_TOP_ABSX_1C, 0x00, 0x03], 3),
+    ],
+)
+def test_nops_skip_their_operand(program, length):
+    cpu = run(program, a=0x12)
+
+    AssertThat(cpu.pc).IsEqualTo(0x0200 + length)
+    AssertThat(cpu.a).IsEqualTo(0x12)
+
+
+def test_jam_stops_the_cpu_where_run_until_trap_finds_it():
+    # given:
+    cpu = CPU(undocumented=Undocumented.IMPLEMENT)
+    cpu.Memory.data[0x0200:0x0202] = bytes([0xEA, UndocumentedOpCodes.INS_JAM_02])
+    cpu.pc = 0x0200
+
+    # when:
+    stop = cpu.run_until_trap(1000)
+
+    # then:
+    AssertThat(stop.reason).IsEqualTo(StopReason.TRAP)
+    AssertThat(cpu.pc).IsEqualTo(0x0201)
+
+
+def test_the_nop_policy_skips_undocumented_opcodes():
+    cpu = run([UndocumentedOpCodes.INS_DCP_ABS, 0x00, 0x03], undocumented=Undocumented.NOP, memory=[(0x0300, 0x11)])
+
+    AssertThat(cpu.pc).IsEqualTo(0x0203)
+    AssertThat(cpu.Memory.data[0x0300]).IsEqualTo(0x11)
+
+
+@pytest.mark.parametrize(
+    "opcode, mnemonic, mode",
+    [entry for entry in UNDOCUMENTED if entry[1] != "JAM"],
+    ids=lambda value: f"{value:02X}" if isinstance(value, int) else str(value),
+)
+def test_the_nop_policy_takes_the_cycles_and_length_of_each_opcode(opcode, mnemonic, mode):
+    # given:
+    cpu = CPU(undocumented=Undocumented.NOP)
+    cpu.Memory.data[0x0200:0x0203] = bytes([opcode, 0x10, 0x00])
+    cpu.Memory.data[0x0010:0x0012] = bytes([0x00, 0x03])
+    cpu.pc, cpu.a, cpu.x, cpu.y, cpu.sp, cpu.p = 0x0200, 0x12, 0x34, 0x56, 0xF0, C
+    memory = bytes(cpu.Memory.data)
+
+    # when:
+    cycles = cpu.execute(1)
+
+    # then:
+    length = 1 if mode is None else 2 if mode in ("IM", "ZP", "ZPX", "ZPY", "INDX", "INDY") else 3
+    AssertThat(cycles).IsEqualTo(expected_cycles(mnemonic, mode))
+    AssertThat(cpu.pc).IsEqualTo(0x0200 + length)
+    AssertThat((cpu.a, cpu.x, cpu.y, cpu.sp, cpu.p)).IsEqualTo((0x12, 0x34, 0x56, 0xF0, C))
+    AssertThat(bytes(cpu.Memory.data)).IsEqualTo(memory)
+
+
+def test_the_default_policy_raises():
+    with pytest.raises(NotImplementedError):
+        run([UndocumentedOpCodes.INS_LAX_ZP, 0x42], undocumented=Undocumented.TRAP)
+
+
+def test_reset_and_fork_keep_the_policy():
+    cpu = CPU(undocumented=Undocumented.NOP)
+    fork = cpu.fork()
+    cpu.reset()
+
+    AssertThat(cpu.undocumented).IsEqualTo(Undocumented.NOP)
+    AssertThat(fork.undocumented).IsEqualTo(Undocumented.NOP)
+    AssertThat(fork.instructions).IsEqualTo(CPU(undocumented=Undocumented.NOP).instructions)
+
+
+def test_fast_cpu_runs_undocumented_opcodes():
+    # given:
+    cpu = FastCPU(undocumented=Undocumented.IMPLEMENT)
+    cpu.Memory.data[0x0200:0x0203] = bytes([UndocumentedOpCodes.INS_LAX_ZP, 0x42, 0xEA])
+    cpu.Memory.data[0x42] = 0x33
+    cpu.pc = 0x0200
+
+    # when:
+    stop = cpu.run_instructions(2)
+
+    # then:
+    AssertThat(stop.cycles).IsEqualTo(5)
+    AssertThat(cpu.a).IsEqualTo(0x33)
+    AssertThat(cpu.x).IsEqualTo(0x33)
@@ -7,7 +7,7 @@ def test_cpu_repr(cpu):
     cpu.A = 1
     cpu.Y = 5
     cpu.X = 3
-    AssertThat(cpu.__repr__()).IsEqualTo("A: 1 X: 3 Y: 5\nPC: 65532 SP: 255\nPS: 255\n")
+    AssertThat(cpu.__repr__()).IsEqualTo("A: 1 X: 3 Y: 5\nPC: 65532 SP: 255\nPS: 0\n")
 
 
 def test_instruction_not_implemented(cpu):